@@ -0,0 +1,139 @@
+"""
+Benchmark: per-row apply feature code vs the vectorized ipl_features module.
+
+Runs every legacy helper (copied verbatim from the scripts/notebooks) and its
+vectorized replacement on the full IPL deliveries file, checks both produce
+the same values, and prints the timings.
+
+Usage:
+    python bench_features.py [--csv IPL.csv] [--repeat 3]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from ipl_features import (
+    bat_first, boundary_runs, partnership_key, phase_from_over, score_bucket, season_year_from,
+)
+from ipl_store import load_deliveries
+
+TEAM_NAME = "Mumbai Indians"
+
+
+# --- Legacy per-row implementations ---
+def get_phase(over):
+    if over < 6: return "Powerplay"
+    elif over >= 15: return "Death"
+    else: return "Middle"
+
+
+def legacy_phase_from_over(o):
+    if o <= 6:
+        return "Powerplay (1-6)"
+    elif o <= 15:
+        return "Middle (7-15)"
+    else:
+        return "Death (16-20)"
+
+
+def clean_season(s):
+    s = str(s)
+    if "/" in s:
+        return int(s.split("/")[0])
+    try:
+        return int(s)
+    except ValueError:
+        return 0
+
+
+def legacy_score_bucket(r):
+    if 30 <= r <= 39: return "30s"
+    elif 40 <= r <= 49: return "40s"
+    else: return "Other"
+
+
+def did_mi_bat_first(row):
+    if row["toss_winner"] == TEAM_NAME:
+        return row["toss_decision"] == "bat"
+    else:
+        return row["toss_decision"] == "field"
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_benchmarks(df, repeat=3):
+    matches = df[["match_id", "toss_winner", "toss_decision"]].drop_duplicates("match_id")
+    curr_runs = df.groupby(["match_id", "batter"], observed=True)["runs_batter"].cumsum()
+
+    cases = [
+        ("phase (report)",
+         lambda: df["over"].apply(get_phase),
+         lambda: phase_from_over(df["over"], "report")),
+        ("phase (prep)",
+         lambda: df["over"].apply(legacy_phase_from_over),
+         lambda: phase_from_over(df["over"], "prep")),
+        ("season_year",
+         lambda: df["season"].astype(str).apply(clean_season),
+         lambda: season_year_from(df["season"])),
+        ("score_bucket",
+         lambda: curr_runs.apply(legacy_score_bucket),
+         lambda: score_bucket(curr_runs)),
+        ("boundary_runs",
+         lambda: df.apply(lambda x: x["runs_batter"] if x["runs_batter"] in [4, 6] else 0, axis=1),
+         lambda: boundary_runs(df["runs_batter"])),
+        ("partners",
+         lambda: df.apply(lambda x: " & ".join(sorted([str(x["batter"]), str(x["non_striker"])])), axis=1),
+         lambda: partnership_key(df["batter"], df["non_striker"])),
+        ("bat_first",
+         lambda: matches.apply(did_mi_bat_first, axis=1),
+         lambda: bat_first(matches, TEAM_NAME)),
+    ]
+
+    rows = []
+    for name, legacy, vectorized in cases:
+        t_legacy, expected = _best_of(legacy, repeat)
+        t_vec, actual = _best_of(vectorized, repeat)
+        same = np.array_equal(expected.astype(str).to_numpy(), actual.astype(str).to_numpy())
+        rows.append({
+            "feature": name,
+            "rows": len(expected),
+            "apply_s": t_legacy,
+            "vectorized_s": t_vec,
+            "speedup": t_legacy / t_vec if t_vec > 0 else np.inf,
+            "identical": same,
+        })
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default="IPL.csv")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Loading {args.csv}...")
+    df = load_deliveries(
+        columns=[
+            "match_id", "season", "over", "batter", "non_striker", "runs_batter",
+            "toss_winner", "toss_decision",
+        ],
+        csv_path=args.csv,
+    )
+    print(f"Benchmarking on {len(df)} deliveries (best of {args.repeat})...\n")
+    results = run_benchmarks(df, args.repeat)
+    with pd.option_context("display.float_format", "{:.4f}".format, "display.width", 120):
+        print(results.to_string(index=False))
+    print(f"\nTotal: apply {results['apply_s'].sum():.2f}s vs vectorized {results['vectorized_s'].sum():.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+Benchmark: the data preparation and champion report pipeline at 1x / 10x / 100x.
+
+For each scale a synthetic IPL.csv is generated once (ipl_synth, reused while
+the generator version and seed match) and every stage runs in a fresh
+process, so each stage's peak RSS is its own: setup (loading its inputs) is
+done untimed, then only the stage itself is timed.
+
+Stages:
+    cache          parse IPL.csv into the columnar Parquet cache
+    load           read every column back from the cache
+    features       derive_features() on the full frame
+    star_schema    fact + dimension + summary tables (full rebuild)
+    warehouse      bulk-load the star schema into SQLite
+    cube           build the OLAP cube
+    match_totals   per-(match, team) bootstrap totals
+    bootstrap      champion-years intervals (10k resamples, one worker)
+    core, phase, strategy, heroes   each report analysis: compute + render
+
+Results go to bench_results/<commit>.json (the commit id gets a -dirty
+suffix when tracked files have local changes); --compare prints the ratio
+against an earlier run and exits 1 when any stage slowed down by more than
+--threshold (and by at least MIN_DELTA_S seconds).
+
+Usage:
+    python bench_pipeline.py [--scales 1,10,100] [--stages load,cube] [--repeat 3]
+    python bench_pipeline.py --scales 1 --compare a873e53 [--threshold 1.2]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ipl_synth import GENERATOR_VERSION, generate
+from mi_star_schema import _peak_rss_mb, _rss_mb
+
+TEAM = "Mumbai Indians"
+SCALES = [1, 10, 100]
+DATA_DIR = "bench_data"
+RESULTS_DIR = "bench_results"
+THRESHOLD = 1.2
+MIN_DELTA_S = 0.25  # Ignore sub-second noise on the tiny stages
+REPORT_ANALYSES = ["core", "phase", "strategy", "heroes"]
+
+
+# --- Stages: setup(paths) -> args (untimed), run(*args) -> rows processed (timed) ---
+def _setup_cache(paths):
+    shutil.rmtree(paths["cache_dir"], ignore_errors=True)
+    return (paths,)
+
+
+def _run_cache(paths):
+    from ipl_store import build_cache
+
+    return build_cache(paths["csv"], paths["cache_dir"])["rows"]
+
+
+def _run_load(paths):
+    from ipl_store import load_deliveries
+
+    return len(load_deliveries(csv_path=paths["csv"], cache_dir=paths["cache_dir"]))
+
+
+def _setup_features(paths):
+    from ipl_store import load_deliveries
+
+    return (load_deliveries(csv_path=paths["csv"], cache_dir=paths["cache_dir"]),)
+
+
+def _run_features(df):
+    from ipl_features import derive_features
+
+    return len(derive_features(df, team=TEAM))
+
+
+def _setup_star_schema(paths):
+    from ipl_matches import load_match_index
+    from ipl_store import load_deliveries
+    from mi_star_schema import clean_seasons
+
+    shutil.rmtree(paths["star_dir"], ignore_errors=True)
+    os.makedirs(paths["star_dir"])
+    df = clean_seasons(load_deliveries(csv_path=paths["csv"], cache_dir=paths["cache_dir"]))
+    return df, load_match_index(paths["csv"], paths["cache_dir"]), paths
+
+
+def _run_star_schema(df, match_index, paths):
+    from mi_star_schema import update_star_schema
+
+    star_dir = paths["star_dir"]
+    update_star_schema(df, TEAM, star_dir, os.path.join(star_dir, "state"), True, match_index)
+    return len(df)
+
+
+def _setup_warehouse(paths):
+    from mi_warehouse import DIMENSIONS, SUMMARIES
+
+    tables = {name: pd.read_csv(os.path.join(paths["star_dir"], name), low_memory=False)
+              for name in list(DIMENSIONS) + list(SUMMARIES)}
+    return tables, paths
+
+
+def _run_warehouse(tables, paths):
+    from mi_star_schema import FACT_FILE
+    from mi_warehouse import export_warehouse, query
+
+    db = os.path.join(paths["star_dir"], "MI_Warehouse.sqlite")
+    export_warehouse(tables, os.path.join(paths["star_dir"], FACT_FILE), db)
+    return int(query("SELECT COUNT(*) AS n FROM fact_deliveries", path=db)["n"].iloc[0])
+
+
+def _run_cube(paths):
+    from ipl_cube import build_cube
+
+    return len(build_cube(paths["csv"], paths["cache_dir"]).deliveries)
+
+
+def _run_match_totals(paths):
+    from ipl_bootstrap import build_and_save
+
+    return len(build_and_save(paths["csv"], paths["cache_dir"]).frame)
+
+
+def _setup_bootstrap(paths):
+    from ipl_bootstrap import load_match_totals
+    from ipl_teams import title_seasons
+
+    return load_match_totals(paths["csv"], paths["cache_dir"]), title_seasons(paths["csv"], paths["cache_dir"])[TEAM]
+
+
+def _run_bootstrap(totals, champion_years):
+    from ipl_bootstrap import RESAMPLES, bootstrap_periods
+
+    return len(bootstrap_periods(totals, TEAM, champion_years, resamples=RESAMPLES, workers=1))
+
+
+def _setup_report(paths):
+    from ipl_cube import load_cube
+    from ipl_teams import title_seasons
+
+    out_dir = os.path.join(paths["work_dir"], "reports")
+    os.makedirs(out_dir, exist_ok=True)
+    return load_cube(paths["csv"], paths["cache_dir"]), title_seasons(paths["csv"], paths["cache_dir"])[TEAM], out_dir
+
+
+def _report_stage(name):
+    def run(cube, champion_years, out_dir):
+        from mi_champion_analytics import ANALYSES, render_figure
+
+        _, compute, _, _ = ANALYSES[name]
+        frames = compute(cube, team=TEAM, champion_years=champion_years)
+        render_figure(name, frames, out_dir, ["png"])
+        return len(cube.deliveries)
+    return run
+
+
+def _no_setup(paths):
+    return (paths,)
+
+
+STAGES = {
+    "cache": (_setup_cache, _run_cache),
+    "load": (_no_setup, _run_load),
+    "features": (_setup_features, _run_features),
+    "star_schema": (_setup_star_schema, _run_star_schema),
+    "warehouse": (_setup_warehouse, _run_warehouse),
+    "cube": (_no_setup, _run_cube),
+    "match_totals": (_no_setup, _run_match_totals),
+    "bootstrap": (_setup_bootstrap, _run_bootstrap),
+    **{name: (_setup_report, _report_stage(name)) for name in REPORT_ANALYSES},
+}
+
+
+def run_stage(stage, paths):
+    """Worker (fresh process): untimed setup, then the timed stage. Returns one result row."""
+    os.environ["IPL_MEMO"] = "0"  # Memoized analyses must recompute
+    setup, run = STAGES[stage]
+    with contextlib.redirect_stdout(io.StringIO()):
+        args = setup(paths)
+        gc.collect()
+        setup_rss = _rss_mb()
+        start = time.perf_counter()
+        rows = run(*args)
+        seconds = time.perf_counter() - start
+    return {"seconds": seconds, "rows": rows, "setup_rss_mb": setup_rss, "peak_rss_mb": _peak_rss_mb()}
+
+
+# --- Data and results ---
+def scale_paths(scale, data_dir=DATA_DIR):
+    work_dir = os.path.join(data_dir, f"{scale}x")
+    return {
+        "csv": os.path.join(work_dir, "IPL.csv"),
+        "cache_dir": os.path.join(work_dir, ".ipl_cache"),
+        "star_dir": os.path.join(work_dir, "star"),
+        "work_dir": work_dir,
+    }
+
+
+def ensure_data(scale, seed=0, data_dir=DATA_DIR):
+    """Generates the scale's IPL.csv unless one from the same generator version and seed exists."""
+    paths = scale_paths(scale, data_dir)
+    meta_path = os.path.join(paths["work_dir"], "generator.json")
+    meta = {"generator_version": GENERATOR_VERSION, "seed": seed, "scale": scale}
+    if os.path.exists(meta_path) and os.path.exists(paths["csv"]):
+        with open(meta_path, encoding="utf-8") as f:
+            if json.load(f) == meta:
+                return paths
+    generate(paths["csv"], scale, seed)
+    shutil.rmtree(paths["cache_dir"], ignore_errors=True)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    return paths
+
+
+def commit_id():
+    """Short HEAD hash, with -dirty when tracked files are modified ('unknown' outside git)."""
+    repo = os.path.dirname(os.path.abspath(__file__))  # The code under test, whatever the working directory
+    try:
+        head = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=repo, capture_output=True, text=True,
+                              check=True)
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=repo,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return head.stdout.strip() + ("-dirty" if status.stdout.strip() else "")
+
+
+def save_results(results, commit, results_dir=RESULTS_DIR):
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, f"{commit}.json")
+    payload = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "cpus": os.cpu_count(),
+        "generator_version": GENERATOR_VERSION,
+        "results": results.to_dict(orient="records"),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def load_results(ref, results_dir=RESULTS_DIR):
+    """Results of an earlier run, by file path or commit id (prefix match)."""
+    path = ref if os.path.exists(ref) else None
+    if path is None and os.path.isdir(results_dir):
+        matches = sorted(f for f in os.listdir(results_dir) if f.startswith(ref) and f.endswith(".json"))
+        path = os.path.join(results_dir, matches[-1]) if matches else None
+    if path is None:
+        raise FileNotFoundError(f"No benchmark results for {ref} in {results_dir}.")
+    with open(path, encoding="utf-8") as f:
+        payload = json.load(f)
+    return payload["commit"], pd.DataFrame(payload["results"])
+
+
+def compare(current, baseline, threshold=THRESHOLD):
+    """Per (scale, stage) time and peak-memory ratios (current / baseline)."""
+    keys = ["scale", "stage"]
+    merged = current.merge(baseline, on=keys, suffixes=("", "_base"))
+    merged["time_ratio"] = merged["seconds"] / merged["seconds_base"]
+    merged["memory_ratio"] = merged["peak_rss_mb"] / merged["peak_rss_mb_base"]
+    merged["regression"] = (merged["time_ratio"] > threshold) & (merged["seconds"] - merged["seconds_base"] > MIN_DELTA_S)
+    return merged[keys + ["seconds_base", "seconds", "time_ratio", "peak_rss_mb_base", "peak_rss_mb",
+                          "memory_ratio", "regression"]]
+
+
+def run_suite(scales, stages, repeat=1, seed=0, data_dir=DATA_DIR):
+    """Best-of-`repeat` time and peak RSS for every (scale, stage); one process per run."""
+    rows = []
+    context = multiprocessing.get_context("spawn")  # Clean interpreter: no memory carried over
+    for scale in scales:
+        paths = ensure_data(scale, seed, data_dir)
+        print(f"\n--- {scale}x: {paths['csv']} ({os.path.getsize(paths['csv']) / 2**20:.0f} MB) ---")
+        for stage in stages:
+            runs = []
+            for _ in range(repeat):
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    runs.append(pool.submit(run_stage, stage, paths).result())
+            best = min(runs, key=lambda r: r["seconds"])
+            best["peak_rss_mb"] = max(r["peak_rss_mb"] for r in runs)
+            rows.append({"scale": scale, "stage": stage, "repeat": repeat, **best})
+            print(f"  {stage:<14} {best['seconds']:9.3f}s  peak {best['peak_rss_mb']:7.0f} MB  "
+                  f"({best['rows']:,} rows)")
+    return pd.DataFrame(rows)
+
+
+def parse_list(value, choices, flag, cast=str):
+    items = [cast(v.strip()) for v in value.split(",") if v.strip()]
+    unknown = [v for v in items if choices is not None and v not in choices]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"{flag}: unknown {', '.join(map(str, unknown))}")
+    return items
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=lambda v: parse_list(v, None, "--scales", int), default=SCALES,
+                        help="comma-separated volume multiples (default: 1,10,100)")
+    parser.add_argument("--stages", type=lambda v: parse_list(v, list(STAGES), "--stages"), default=list(STAGES),
+                        help=f"comma-separated subset of: {','.join(STAGES)}")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per stage (best time, worst peak memory)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--results-dir", default=RESULTS_DIR)
+    parser.add_argument("--compare", default=None, help="commit id or results file to compare against")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="time ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    # Stages read what earlier ones wrote (cache, star schema): keep them in pipeline order
+    stages = [s for s in STAGES if s in args.stages]
+    # Read the baseline first: a rerun on the same commit overwrites its results file
+    baseline = load_results(args.compare, args.results_dir) if args.compare else None
+    results = run_suite(args.scales, stages, args.repeat, args.seed, args.data_dir)
+    commit = commit_id()
+    path = save_results(results, commit, args.results_dir)
+    print(f"\n✓ Saved {path}")
+
+    with pd.option_context("display.float_format", "{:.3f}".format, "display.width", 160):
+        print("\n⏱ Seconds")
+        print(results.pivot(index="stage", columns="scale", values="seconds").loc[stages].to_string())
+        print("\n💾 Peak RSS (MB)")
+        print(results.pivot(index="stage", columns="scale", values="peak_rss_mb").loc[stages].round(0).to_string())
+
+        if baseline is not None:
+            base_commit, baseline = baseline
+            diff = compare(results, baseline, args.threshold)
+            print(f"\n📊 {commit} vs {base_commit}")
+            print(diff.to_string(index=False))
+            slower = diff[diff["regression"]]
+            if len(slower):
+                print(f"⚠️ {len(slower)} stage(s) more than {args.threshold:.2f}x slower than {base_commit}.")
+                return 1
+            print(f"✓ No stage more than {args.threshold:.2f}x slower than {base_commit}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Load test for the mi_service query service.
+
+Opens --clients concurrent keep-alive connections and sends --requests GET
+requests in total, drawn at random from a mix of every query endpoint with
+varied teams, title seasons, season filters and thresholds (so the run sees
+cold queries, coalesced duplicates and cache hits). Reports throughput,
+latency percentiles per endpoint, error counts and the service's own
+counters from /health.
+
+With --spawn the service is started on a free port for the run (and stopped
+afterwards), so the numbers include its cold-start cost in the first
+requests only.
+
+Usage:
+    python bench_service.py [--url http://127.0.0.1:8765] [--clients 32] [--requests 2000]
+    python bench_service.py --spawn [--csv IPL.csv] [--workers 4] [--ci]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from mi_service import QUERIES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+async def _get(reader, writer, host, path):
+    """One keep-alive GET; returns (status, body bytes)."""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        header = await reader.readline()
+        if header in (b"\r\n", b""):
+            break
+        name, _, value = header.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def fetch_json(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        status, body = await _get(reader, writer, host, path)
+    finally:
+        writer.close()
+    return status, json.loads(body)
+
+
+def request_mix(teams, titles, seasons, ci=False, seed=0, variants=200):
+    """Pool of request paths over every query endpoint (drawn from at random by the clients)."""
+    rng = random.Random(seed)
+    paths = []
+    for _ in range(variants):
+        team = rng.choice(teams)
+        name = rng.choice(list(QUERIES))
+        accepted = QUERIES[name][1]
+        params = {"team": team}
+        if "titles" in accepted and rng.random() < 0.3:
+            params["titles"] = ",".join(map(str, sorted(rng.sample(seasons, 3))))
+        elif "titles" in accepted and not titles.get(team):
+            params["titles"] = ",".join(map(str, seasons[-2:]))
+        if "ci" in accepted and ci:
+            params.update(ci=1, resamples=2000)
+        if "seasons" in accepted and rng.random() < 0.5:
+            start = rng.randrange(len(seasons))
+            params["seasons"] = ",".join(map(str, seasons[start:start + rng.randint(1, 5)]))
+        if "min_balls" in accepted:
+            params["min_balls"] = rng.choice([60, 120, 300])
+        if "min_matches" in accepted:
+            params["min_matches"] = rng.choice([1, 3, 5])
+        if "top" in accepted:
+            params["top"] = rng.choice([10, 20])
+        paths.append(f"/{name}?{urlencode(params)}")
+    return paths
+
+
+async def client(host, port, paths, counter, total, results, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while counter[0] < total:
+            counter[0] += 1
+            path = rng.choice(paths)
+            start = time.perf_counter()
+            status, body = await _get(reader, writer, host, path)
+            results.append((urlsplit(path).path.strip("/"), status, (time.perf_counter() - start) * 1000, len(body)))
+    finally:
+        writer.close()
+
+
+async def load_test(host, port, clients, total, ci=False, seed=0):
+    _, teams = await fetch_json(host, port, "/teams")
+    titles = {t["team"]: t["titles"] for t in teams["teams"]}
+    seasons = sorted({y for years in titles.values() for y in years}) or list(range(2008, 2025))
+    paths = request_mix(sorted(titles), titles, seasons, ci, seed)
+
+    counter, results = [0], []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, paths, counter, total, results, random.Random(seed + i)) for i in range(clients)
+    ))
+    seconds = time.perf_counter() - start
+    _, health = await fetch_json(host, port, "/health")
+    return pd.DataFrame(results, columns=["endpoint", "status", "ms", "bytes"]), seconds, health
+
+
+def latency_table(results):
+    """Requests, errors and latency percentiles (ms) per endpoint, plus an overall row."""
+    def stats(frame):
+        ms = frame["ms"].to_numpy()
+        return pd.Series({
+            "requests": len(frame), "errors": int((frame["status"] >= 400).sum()),
+            "p50": np.percentile(ms, 50), "p95": np.percentile(ms, 95), "p99": np.percentile(ms, 99), "max": ms.max(),
+        })
+    table = results.groupby("endpoint").apply(stats, include_groups=False)
+    table.loc["all"] = stats(results)
+    return table
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_service(csv_path, workers, timeout=600):
+    """Starts mi_service.py on a free port and waits for /health; returns (process, port)."""
+    port = _free_port()
+    cmd = [sys.executable, os.path.join(HERE, "mi_service.py"), "--csv", csv_path, "--port", str(port)]
+    if workers:
+        cmd += ["--workers", str(workers)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"mi_service.py exited with code {proc.returncode}")
+        try:
+            asyncio.run(fetch_json("127.0.0.1", port, "/health"))
+            return proc, port
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise TimeoutError(f"mi_service.py did not come up within {timeout}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent connections")
+    parser.add_argument("--requests", type=int, default=2000, help="total requests")
+    parser.add_argument("--ci", action="store_true", help="include bootstrap intervals (CPU-heavy queries)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spawn", action="store_true", help="start mi_service.py for the run")
+    parser.add_argument("--csv", default="IPL.csv", help="dataset for --spawn")
+    parser.add_argument("--workers", type=int, default=None, help="service workers for --spawn")
+    args = parser.parse_args(argv)
+
+    proc = None
+    if args.spawn:
+        if not os.path.exists(args.csv):
+            print(f"❌ Error: {args.csv} not found.")
+            return 1
+        print(f"Starting mi_service.py on {args.csv}...")
+        proc, port = spawn_service(args.csv, args.workers)
+        host = "127.0.0.1"
+    else:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    try:
+        print(f"Load test: {args.requests} requests from {args.clients} clients -> http://{host}:{port}/")
+        results, seconds, health = asyncio.run(load_test(host, port, args.clients, args.requests, args.ci, args.seed))
+    except OSError as e:
+        print(f"❌ Error: could not reach the service at {host}:{port} ({e}). Start it with `python mi_service.py`.")
+        return 1
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    print(f"\n✓ {len(results)} requests in {seconds:.2f}s: {len(results) / seconds:,.0f} req/s")
+    print("\n⏱ Latency (ms)")
+    with pd.option_context("display.float_format", "{:.2f}".format, "display.width", 160):
+        print(latency_table(results).to_string())
+    print("\n🗄 Service counters")
+    for key in ["queries", "cache_hits", "coalesced", "errors", "workers"]:
+        print(f"  {key:<12} {health.get(key)}")
+    errors = int((results["status"] >= 400).sum())
+    if errors:
+        print(f"⚠️ {errors} request(s) failed.")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -53,34 +53,23 @@ notebook = {
    "outputs": [],
    "source": [
     "# --- Data Loading & Prep ---\n",
+    "from ipl_cube import load_cube\n",
+    "from ipl_memo import memoize\n",
+    "from ipl_teams import home_ground, title_seasons\n",
+    "\n",
     "try:\n",
-    "    df = pd.read_csv(\"IPL.csv\", low_memory=False)\n",
-    "    print(f\"Dataset loaded: {df.shape[0]} rows, {df.shape[1]} columns\")\n",
+    "    # Pre-aggregated cube of runs/balls/wickets/... by season, phase, innings, venue and player.\n",
+    "    # Built once from IPL.csv (rebuilt only when the file changes); every metric below is a rollup.\n",
+    "    cube = load_cube()\n",
+    "    print(f\"Cube loaded: {len(cube.deliveries)} delivery cells, {len(cube.matches)} match cells\")\n",
     "except FileNotFoundError:\n",
     "    print(\"❌ Error: IPL.csv not found. Please ensure the data file is in the directory.\")\n",
     "\n",
-    "# Helper: Clean Season Year\n",
-    "def clean_season(s):\n",
-    "    s = str(s)\n",
-    "    if \"/\" in s:\n",
-    "        return int(s.split(\"/\")[0])\n",
-    "    try:\n",
-    "        return int(s)\n",
-    "    except ValueError:\n",
-    "        return 0\n",
-    "\n",
-    "df[\"season_year\"] = df[\"season\"].apply(clean_season)\n",
-    "\n",
-    "# Define Champion Years\n",
-    "CHAMPION_YEARS = [2013, 2015, 2017, 2019, 2020]\n",
-    "df[\"is_champion_year\"] = df[\"season_year\"].isin(CHAMPION_YEARS)\n",
-    "df[\"period\"] = df[\"is_champion_year\"].map({True: \"🏆 Champion Years\", False: \"Other Years\"})\n",
-    "\n",
-    "# Pre-calculate some columns\n",
-    "df[\"is_wicket\"] = df[\"wicket_kind\"].notna().astype(int)\n",
-    "df[\"is_dot\"] = (df[\"runs_total\"] == 0).astype(int)\n",
-    "df[\"is_four\"] = (df[\"runs_batter\"] == 4).astype(int)\n",
-    "df[\"is_six\"] = (df[\"runs_batter\"] == 6).astype(int)\n",
+    "# Team parameters: title seasons come from the data (MI: 2013, 2015, 2017, 2019, 2020)\n",
+    "TEAM = \"Mumbai Indians\"\n",
+    "CHAMPION_YEARS = title_seasons().get(TEAM, [])\n",
+    "HOME_GROUND = home_ground(cube, TEAM)  # ipl_teams.HOME_GROUNDS (\"Wankhede\" for MI), else the most-played venue\n",
+    "PERIOD_LABELS = (\"🏆 Champion Years\", \"Other Years\")\n",
     "\n",
     "print(\"Data Preparation Complete.\")"
    ]
@@ -99,25 +88,23 @@ notebook = {
    "metadata": {},
    "outputs": [],
    "source": [
-    "# --- Batting Overall ---\n",
-    "mi_bat = df[df[\"batting_team\"] == \"Mumbai Indians\"].copy()\n",
-    "bat_metrics = mi_bat.groupby(\"period\").agg(\n",
-    "    runs=(\"runs_batter\", \"sum\"),\n",
-    "    wickets=(\"is_wicket\", \"sum\"),\n",
-    "    balls=(\"valid_ball\", \"sum\")\n",
-    ").reset_index()\n",
-    "bat_metrics[\"avg\"] = bat_metrics[\"runs\"] / bat_metrics[\"wickets\"]\n",
-    "bat_metrics[\"sr\"] = (bat_metrics[\"runs\"] / bat_metrics[\"balls\"]) * 100\n",
-    "\n",
-    "# --- Bowling Overall ---\n",
-    "mi_bowling = df[df[\"bowling_team\"] == \"Mumbai Indians\"].copy()\n",
-    "bowl_metrics = mi_bowling.groupby(\"period\").agg(\n",
-    "    runs_conceded=(\"runs_total\", \"sum\"),\n",
-    "    wickets=(\"bowler_wicket\", \"sum\"),\n",
-    "    balls=(\"valid_ball\", \"sum\")\n",
-    ").reset_index()\n",
-    "bowl_metrics[\"avg\"] = bowl_metrics[\"runs_conceded\"] / bowl_metrics[\"wickets\"]\n",
-    "bowl_metrics[\"econ\"] = (bowl_metrics[\"runs_conceded\"] / bowl_metrics[\"balls\"]) * 6\n",
+    "@memoize\n",
+    "def core_metrics(cube, team=TEAM, champion_years=CHAMPION_YEARS, period_labels=PERIOD_LABELS):\n",
+    "    \"\"\"Batting and bowling metrics per period (cached on cube version + parameters).\"\"\"\n",
+    "    # --- Batting Overall: avg = runs / wickets, sr = runs / balls * 100 ---\n",
+    "    bat_metrics = cube.rollup(\n",
+    "        [\"period\"], where={\"batting_team\": team},\n",
+    "        champion_years=champion_years, period_labels=period_labels,\n",
+    "    ).rename(columns={\"runs_batter\": \"runs\", \"batting_avg\": \"avg\", \"strike_rate\": \"sr\"})\n",
+    "\n",
+    "    # --- Bowling Overall: avg = runs conceded / wickets, econ = runs / balls * 6 ---\n",
+    "    bowl_metrics = cube.rollup(\n",
+    "        [\"period\"], where={\"bowling_team\": team},\n",
+    "        champion_years=champion_years, period_labels=period_labels,\n",
+    "    ).rename(columns={\"runs_total\": \"runs_conceded\", \"bowling_avg\": \"avg\", \"economy\": \"econ\"})\n",
+    "    return bat_metrics, bowl_metrics\n",
+    "\n",
+    "bat_metrics, bowl_metrics = core_metrics(cube)\n",
     "\n",
     "# --- Visualization ---\n",
     "fig, ax = plt.subplots(1, 4, figsize=(20, 5))\n",
@@ -156,27 +143,25 @@ notebook = {
    "metadata": {},
    "outputs": [],
    "source": [
-    "def get_phase(over):\n",
-    "    if over < 6: return \"Powerplay\"\n",
-    "    elif over >= 15: return \"Death\"\n",
-    "    else: return \"Middle\"\n",
-    "\n",
-    "mi_bat[\"phase\"] = mi_bat[\"over\"].apply(get_phase)\n",
-    "mi_bowling[\"phase\"] = mi_bowling[\"over\"].apply(get_phase)\n",
-    "\n",
-    "# --- Batting: Powerplay Runs per Over ---\n",
-    "pp_bat = mi_bat[mi_bat[\"phase\"] == \"Powerplay\"].groupby(\"period\").agg(\n",
-    "    runs=(\"runs_total\", \"sum\"),\n",
-    "    overs=(\"valid_ball\", lambda x: x.count()/6)\n",
-    ").reset_index()\n",
-    "pp_bat[\"rpo\"] = pp_bat[\"runs\"] / pp_bat[\"overs\"]\n",
-    "\n",
-    "# --- Bowling: Death Overs Economy ---\n",
-    "death_bowl = mi_bowling[mi_bowling[\"phase\"] == \"Death\"].groupby(\"period\").agg(\n",
-    "    runs=(\"runs_total\", \"sum\"),\n",
-    "    overs=(\"valid_ball\", lambda x: x.count()/6)\n",
-    ").reset_index()\n",
-    "death_bowl[\"econ\"] = death_bowl[\"runs\"] / death_bowl[\"overs\"]\n",
+    "@memoize\n",
+    "def phase_metrics(cube, team=TEAM, champion_years=CHAMPION_YEARS, period_labels=PERIOD_LABELS):\n",
+    "    \"\"\"Powerplay batting and death bowling per period.\"\"\"\n",
+    "    # Runs per over are counted on all deliveries (extras included)\n",
+    "    # --- Batting: Powerplay Runs per Over ---\n",
+    "    pp_bat = cube.rollup(\n",
+    "        [\"period\"], where={\"batting_team\": team, \"phase\": \"Powerplay\"},\n",
+    "        champion_years=champion_years, period_labels=period_labels,\n",
+    "    )\n",
+    "\n",
+    "    # --- Bowling: Death Overs Economy ---\n",
+    "    death_bowl = cube.rollup(\n",
+    "        [\"period\"], where={\"bowling_team\": team, \"phase\": \"Death\"},\n",
+    "        champion_years=champion_years, period_labels=period_labels,\n",
+    "    )\n",
+    "    death_bowl[\"econ\"] = death_bowl[\"rpo\"]\n",
+    "    return pp_bat, death_bowl\n",
+    "\n",
+    "pp_bat, death_bowl = phase_metrics(cube)\n",
     "\n",
     "# --- Visualize ---\n",
     "fig, ax = plt.subplots(1, 2, figsize=(16, 6))\n",
@@ -206,33 +191,21 @@ notebook = {
    "metadata": {},
    "outputs": [],
    "source": [
-    "# Match Level Data\n",
-    "match_data = df[[\"match_id\", \"season_year\", \"toss_winner\", \"toss_decision\", \"match_won_by\"]].drop_duplicates()\n",
-    "match_data[\"is_champion_year\"] = match_data[\"season_year\"].isin(CHAMPION_YEARS)\n",
-    "match_data[\"period\"] = match_data[\"is_champion_year\"].map({True: \"🏆 Champion Years\", False: \"Other Years\"})\n",
-    "\n",
-    "# Add MI Win Flag\n",
-    "match_data[\"mi_win\"] = (match_data[\"match_won_by\"] == \"Mumbai Indians\").astype(int)\n",
-    "\n",
-    "# Determine if MI Bat First or Second\n",
-    "# Note: We need to merge with inning data to be 100% sure, but using toss decision is a good proxy if correct.\n",
-    "# Better approach: Check if MI batted in inning 1 or 2 from original DF.\n",
-    "\n",
-    "mi_innings = df[(df[\"batting_team\"] == \"Mumbai Indians\")].groupby([\"match_id\"])[\"innings\"].min().reset_index()\n",
-    "match_data = pd.merge(match_data, mi_innings, on=\"match_id\", how=\"left\")\n",
-    "\n",
-    "# inning 1 = Defending (Setting Target), inning 2 = Chasing\n",
-    "match_data[\"strategy\"] = match_data[\"innings\"].map({1: \"Defending\", 2: \"Chasing\"})\n",
-    "\n",
-    "# Filter only MI matches (where strategy is known)\n",
-    "mi_matches_strat = match_data.dropna(subset=[\"strategy\"])\n",
-    "\n",
-    "strat_stats = mi_matches_strat.groupby([\"period\", \"strategy\"]).agg(\n",
-    "    played=(\"match_id\", \"count\"),\n",
-    "    won=(\"mi_win\", \"sum\")\n",
-    ").reset_index()\n",
-    "\n",
-    "strat_stats[\"win_pct\"] = (strat_stats[\"won\"] / strat_stats[\"played\"]) * 100\n",
+    "@memoize\n",
+    "def strategy_metrics(cube, team=TEAM, champion_years=CHAMPION_YEARS, period_labels=PERIOD_LABELS):\n",
+    "    \"\"\"Win % chasing vs defending per period.\"\"\"\n",
+    "    # Match cube: one cell per (season, venue, team, opponent, batting order, toss)\n",
+    "    # batting_order 1 = batted first (Defending, Setting Target), 2 = Chasing.\n",
+    "    # Only matches where MI batted have a known strategy.\n",
+    "    strat_stats = cube.rollup(\n",
+    "        [\"period\", \"batting_order\"], table=\"matches\",\n",
+    "        where={\"team\": team, \"batting_order\": [1, 2]},\n",
+    "        champion_years=champion_years, period_labels=period_labels,\n",
+    "    )\n",
+    "    strat_stats[\"strategy\"] = strat_stats[\"batting_order\"].map({1: \"Defending\", 2: \"Chasing\"})\n",
+    "    return strat_stats\n",
+    "\n",
+    "strat_stats = strategy_metrics(cube)\n",
     "\n",
     "# Visualize\n",
     "plt.figure(figsize=(10, 6))\n",
@@ -258,25 +231,21 @@ notebook = {
    "metadata": {},
    "outputs": [],
    "source": [
-    "match_cols = [\"match_id\", \"season_year\", \"venue\", \"match_won_by\"]\n",
-    "wankhede = df[\n",
-    "    (df[\"venue\"].str.contains(\"Wankhede\", case=False, na=False)) & \n",
-    "    ((df[\"batting_team\"] == \"Mumbai Indians\") | (df[\"bowling_team\"] == \"Mumbai Indians\"))\n",
-    "][match_cols].drop_duplicates()\n",
-    "\n",
-    "wankhede[\"is_champion_year\"] = wankhede[\"season_year\"].isin(CHAMPION_YEARS)\n",
-    "wankhede[\"period\"] = wankhede[\"is_champion_year\"].map({True: \"🏆 Champion Years\", False: \"Other Years\"})\n",
-    "wankhede[\"mi_win\"] = (wankhede[\"match_won_by\"] == \"Mumbai Indians\").astype(int)\n",
-    "\n",
-    "home_stats = wankhede.groupby(\"period\").agg(\n",
-    "    played=(\"match_id\", \"count\"),\n",
-    "    won=(\"mi_win\", \"sum\")\n",
-    ").reset_index()\n",
-    "home_stats[\"win_pct\"] = (home_stats[\"won\"] / home_stats[\"played\"]) * 100\n",
+    "@memoize\n",
+    "def home_metrics(cube, team=TEAM, home=HOME_GROUND, champion_years=CHAMPION_YEARS, period_labels=PERIOD_LABELS):\n",
+    "    \"\"\"Win % at the home ground per period.\"\"\"\n",
+    "    home_stats = cube.rollup(\n",
+    "        [\"period\"], table=\"matches\",\n",
+    "        where={\"team\": team, \"venue\": lambda v: v.str.contains(home, case=False, regex=False, na=False)},\n",
+    "        champion_years=champion_years, period_labels=period_labels,\n",
+    "    )\n",
+    "    return home_stats\n",
+    "\n",
+    "home_stats = home_metrics(cube)\n",
     "\n",
     "plt.figure(figsize=(8, 6))\n",
     "ax = sns.barplot(data=home_stats, x=\"period\", y=\"win_pct\", palette=MI_PALETTE)\n",
-    "ax.set_title(\"Win % at Wankhede Stadium\")\n",
+    "ax.set_title(f\"Win % at {HOME_GROUND}\")\n",
     "ax.bar_label(ax.containers[0], fmt=\"%.1f%%\")\n",
     "plt.show()"
    ]
@@ -295,11 +264,21 @@ notebook = {
    "metadata": {},
    "outputs": [],
    "source": [
-    "champ_bat = mi_bat[mi_bat[\"is_champion_year\"] == True]\n",
-    "champ_bowl = mi_bowling[mi_bowling[\"is_champion_year\"] == True]\n",
-    "\n",
-    "top_batters = champ_bat.groupby(\"batter\")[\"runs_batter\"].sum().nlargest(5).reset_index()\n",
-    "top_bowlers = champ_bowl.groupby(\"bowler\")[\"bowler_wicket\"].sum().nlargest(5).reset_index()\n",
+    "@memoize\n",
+    "def hero_metrics(cube, team=TEAM, champion_years=CHAMPION_YEARS):\n",
+    "    \"\"\"Top run scorers and wicket takers across the title seasons.\"\"\"\n",
+    "    top_batters = (\n",
+    "        cube.rollup([\"batter\"], where={\"batting_team\": team, \"season_year\": champion_years})\n",
+    "        .nlargest(5, \"runs_batter\")[[\"batter\", \"runs_batter\"]]\n",
+    "    )\n",
+    "    top_bowlers = (\n",
+    "        cube.rollup([\"bowler\"], where={\"bowling_team\": team, \"season_year\": champion_years})\n",
+    "        .rename(columns={\"bowler_wickets\": \"bowler_wicket\"})\n",
+    "        .nlargest(5, \"bowler_wicket\")[[\"bowler\", \"bowler_wicket\"]]\n",
+    "    )\n",
+    "    return top_batters, top_bowlers\n",
+    "\n",
+    "top_batters, top_bowlers = hero_metrics(cube)\n",
     "\n",
     "fig, ax = plt.subplots(1, 2, figsize=(18, 7))\n",
     "\n",
@@ -0,0 +1,242 @@
+"""
+Match-level bootstrap for the "Champion Years" vs "Other Years" comparisons.
+
+Every metric in the champion report is a ratio of two additive totals
+(runs / wickets, runs / balls, wins / matches, ...). The totals are
+materialized once per (match, team) in a small table, stored under
+.ipl_cache/bootstrap and rebuilt only when the dataset version changes.
+A resample is then just a row of match indices: each block of resamples is
+one NumPy gather + sum over a (matches x measures) array, with no pandas
+groupby inside the loop. Champion and other seasons are resampled
+independently (matches are the resampling unit, so within-match correlation
+is preserved), and blocks are spread over a process pool.
+
+Results are percentile confidence intervals for each period and for the
+difference (champion - other), plus a two-sided bootstrap p-value for the
+difference being zero.
+
+Usage:
+    from ipl_bootstrap import bootstrap_periods, load_match_totals
+
+    totals = load_match_totals()
+    ci = bootstrap_periods(totals, "Mumbai Indians", [2013, 2015, 2017, 2019, 2020])
+    ci[["metric", "champion", "champion_lo", "champion_hi", "p_value"]]
+"""
+import json
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ipl_cube import PERIOD_LABELS, SOURCE_COLS
+from ipl_features import derive_features
+from ipl_matches import load_match_index
+from ipl_store import CACHE_DIR, CSV_PATH, ensure_cache, load_deliveries
+from ipl_trace import traced
+
+RESAMPLES = 10_000
+BLOCK_SIZE = 1_000
+ALPHA = 0.05
+TOTALS_FORMAT = 1  # bump when the stored table changes shape
+
+# Per-(match, team) additive totals: name -> (side, phase or None, source column)
+TOTALS = {
+    "bat_runs": ("batting", None, "runs_batter"),
+    "bat_wickets": ("batting", None, "is_wicket"),
+    "bat_balls": ("batting", None, "valid_ball"),
+    "bowl_runs": ("bowling", None, "runs_total"),
+    "bowl_wickets": ("bowling", None, "bowler_wicket"),
+    "bowl_balls": ("bowling", None, "valid_ball"),
+    "pp_runs": ("batting", "Powerplay", "runs_total"),
+    "pp_deliveries": ("batting", "Powerplay", "deliveries"),
+    "death_runs": ("bowling", "Death", "runs_total"),
+    "death_deliveries": ("bowling", "Death", "deliveries"),
+}
+RESULT_TOTALS = ["defend_matches", "defend_wins", "chase_matches", "chase_wins"]
+
+# Metric -> (numerator, denominator, scale); same definitions as ipl_cube.DERIVED
+METRICS = {
+    "batting_avg": ("bat_runs", "bat_wickets", 1.0),
+    "strike_rate": ("bat_runs", "bat_balls", 100.0),
+    "bowling_avg": ("bowl_runs", "bowl_wickets", 1.0),
+    "economy": ("bowl_runs", "bowl_balls", 6.0),
+    "powerplay_rpo": ("pp_runs", "pp_deliveries", 6.0),
+    "death_economy": ("death_runs", "death_deliveries", 6.0),
+    "defending_win_pct": ("defend_wins", "defend_matches", 100.0),
+    "chasing_win_pct": ("chase_wins", "chase_matches", 100.0),
+}
+
+
+@traced(category="aggregate")
+def build_match_totals(df, matches):
+    """One row per (match_id, team) with the TOTALS and RESULT_TOTALS measures."""
+    df = derive_features(df)
+    df["deliveries"] = np.int8(1)
+    keys = {"batting": "batting_team", "bowling": "bowling_team"}
+    parts = []
+    for name, (side, phase, col) in TOTALS.items():
+        sub = df if phase is None else df[df["phase"] == phase]
+        part = sub.groupby(["match_id", keys[side]], observed=True)[col].sum()
+        parts.append(part.rename(name).rename_axis(["match_id", "team"]))
+    totals = pd.concat(parts, axis=1).fillna(0)
+
+    # Results from the match index: the side batting first defends, the other chases
+    m = matches.reset_index(drop=True)
+    sides = pd.concat([
+        pd.DataFrame({"match_id": m["match_id"], "team": m["batting_first"], "order": 1}),
+        pd.DataFrame({"match_id": m["match_id"], "team": m["batting_second"], "order": np.where(m["innings"] >= 2, 2, 0)}),
+    ], ignore_index=True)
+    won = (sides["team"].to_numpy() == np.r_[m["match_won_by"].to_numpy(), m["match_won_by"].to_numpy()])
+    sides["defend_matches"] = (sides["order"] == 1).astype(np.int64)
+    sides["defend_wins"] = sides["defend_matches"] * won
+    sides["chase_matches"] = (sides["order"] == 2).astype(np.int64)
+    sides["chase_wins"] = sides["chase_matches"] * won
+    sides["season_year"] = np.r_[m["season_year"].to_numpy(), m["season_year"].to_numpy()]
+    sides["team"] = sides["team"].astype(str)
+
+    totals.index = totals.index.set_levels(totals.index.levels[1].astype(str), level=1)
+    result = sides.drop(columns="order").merge(totals.reset_index(), on=["match_id", "team"], how="left")
+    measures = list(TOTALS) + RESULT_TOTALS
+    result[measures] = result[measures].fillna(0).astype(np.int64)
+    return result[["match_id", "team", "season_year"] + measures].sort_values(["match_id", "team"], ignore_index=True)
+
+
+class MatchTotals:
+    """Per-(match, team) totals with the dataset version they were built from."""
+
+    def __init__(self, frame, version=None):
+        self.frame = frame
+        self.version = version  # Memoization fingerprint (see ipl_memo)
+
+    def arrays(self, team, champion_years):
+        """(champion, other) totals of `team` as float arrays of shape (matches, measures)."""
+        f = self.frame[self.frame["team"] == team]
+        measures = list(TOTALS) + RESULT_TOTALS
+        is_champ = f["season_year"].isin(list(champion_years)).to_numpy()
+        values = f[measures].to_numpy(np.float64)
+        return values[is_champ], values[~is_champ]
+
+
+def _ratios(sums):
+    """METRICS from summed totals; sums has measures on the last axis."""
+    measures = list(TOTALS) + RESULT_TOTALS
+    out = np.empty(sums.shape[:-1] + (len(METRICS),))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for k, (num, den, scale) in enumerate(METRICS.values()):
+            d = sums[..., measures.index(den)]
+            out[..., k] = np.where(d > 0, sums[..., measures.index(num)] / d * scale, np.nan)
+    return out
+
+
+def _resample_block(values, size, seed):
+    """Ratios for `size` resamples of the rows of `values` (size x metrics)."""
+    if len(values) == 0:
+        return np.full((size, len(METRICS)), np.nan)
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(values), size=(size, len(values)))
+    return _ratios(values[idx].sum(axis=1))
+
+
+def _block(champ, other, size, seed):
+    champ_seed, other_seed = seed.spawn(2)
+    return _resample_block(champ, size, champ_seed), _resample_block(other, size, other_seed)
+
+
+def bootstrap(champ, other, resamples=RESAMPLES, block_size=BLOCK_SIZE, workers=None, seed=0):
+    """(champion, other) bootstrap ratio draws, each of shape (resamples, metrics)."""
+    sizes = [min(block_size, resamples - start) for start in range(0, resamples, block_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))  # Same draws whatever the worker count
+    workers = min(workers or os.cpu_count() or 1, len(sizes))
+    if workers <= 1:
+        blocks = [_block(champ, other, size, s) for size, s in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            blocks = list(pool.map(_block, [champ] * len(sizes), [other] * len(sizes), sizes, seeds))
+    return np.concatenate([b[0] for b in blocks]), np.concatenate([b[1] for b in blocks])
+
+
+def _interval(draws, alpha):
+    lo, hi = np.nanpercentile(draws, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0)
+    return lo, hi
+
+
+@traced(category="aggregate")
+def bootstrap_periods(totals, team, champion_years, resamples=RESAMPLES, alpha=ALPHA, workers=None, seed=0):
+    """
+    Champion vs other seasons for every METRICS entry, one row per metric.
+
+    Columns: champion / other point estimates and their (1 - alpha) percentile
+    intervals, diff = champion - other with its interval, p_value (two-sided,
+    share of resampled differences on the far side of zero) and the number of
+    matches in each period.
+    """
+    champ, other = totals.arrays(team, champion_years)
+    est_champ, est_other = _ratios(champ.sum(axis=0)), _ratios(other.sum(axis=0))
+    draws_champ, draws_other = bootstrap(champ, other, resamples, workers=workers, seed=seed)
+    diff = draws_champ - draws_other
+
+    valid = ~np.isnan(diff)
+    n = valid.sum(axis=0)
+    below = ((diff <= 0) & valid).sum(axis=0)
+    above = ((diff >= 0) & valid).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p_value = np.minimum(1.0, 2 * (np.minimum(below, above) + 1) / (n + 1))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # All-NaN metric, e.g. a team without titles
+        champ_lo, champ_hi = _interval(draws_champ, alpha)
+        other_lo, other_hi = _interval(draws_other, alpha)
+        diff_lo, diff_hi = _interval(diff, alpha)
+    result = pd.DataFrame({
+        "metric": list(METRICS),
+        "champion": est_champ, "champion_lo": champ_lo, "champion_hi": champ_hi,
+        "other": est_other, "other_lo": other_lo, "other_hi": other_hi,
+        "diff": est_champ - est_other, "diff_lo": diff_lo, "diff_hi": diff_hi,
+        "p_value": np.where(n > 0, p_value, np.nan),
+    })
+    result["champion_matches"] = len(champ)
+    result["other_matches"] = len(other)
+    result["resamples"] = resamples
+    return result
+
+
+def period_interval(ci, metric, period, period_labels=PERIOD_LABELS):
+    """(estimate, lo, hi) of one metric for a period label, from bootstrap_periods()."""
+    row = ci.set_index("metric").loc[metric]
+    prefix = "champion" if period == period_labels[0] else "other"
+    return row[prefix], row[f"{prefix}_lo"], row[f"{prefix}_hi"]
+
+
+def _totals_paths(cache_dir):
+    totals_dir = os.path.join(cache_dir, "bootstrap")
+    return totals_dir, os.path.join(totals_dir, "match_totals.parquet"), os.path.join(totals_dir, "manifest.json")
+
+
+def build_and_save(csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """Builds the per-match totals from the columnar cache and stores them next to it."""
+    version = ensure_cache(csv_path, cache_dir)["sha256"]
+    df = load_deliveries(columns=SOURCE_COLS, csv_path=csv_path, cache_dir=cache_dir)
+    frame = build_match_totals(df, load_match_index(csv_path, cache_dir).frame)
+
+    totals_dir, data_path, manifest_path = _totals_paths(cache_dir)
+    os.makedirs(totals_dir, exist_ok=True)
+    frame.to_parquet(data_path, index=False)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"sha256": version, "format": TOTALS_FORMAT, "rows": len(frame)}, f)
+    print(f"✓ Match totals: {len(frame)} (match, team) rows")
+    return MatchTotals(frame, version)
+
+
+@traced(category="load", rows=lambda totals: len(totals.frame))
+def load_match_totals(csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """Loads the per-match totals, rebuilding them if the dataset changed."""
+    version = ensure_cache(csv_path, cache_dir)["sha256"]
+    _, data_path, manifest_path = _totals_paths(cache_dir)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("sha256") == version and manifest.get("format") == TOTALS_FORMAT:
+            return MatchTotals(pd.read_parquet(data_path), version)
+    return build_and_save(csv_path, cache_dir)
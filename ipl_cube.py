@@ -0,0 +1,195 @@
+"""
+Pre-aggregated OLAP cube of additive IPL measures.
+
+Two materialized tables, rebuilt only when the dataset version changes:
+
+- deliveries: sums of runs, balls, wickets, dots, boundaries, ... keyed on
+  (season_year, phase, innings, venue, batter, bowler, batting_team, bowling_team)
+- matches:    matches played / won keyed on
+  (season_year, venue, team, opponent, batting_order, toss_won, toss_decision)
+
+Reports ask the cube for rollups instead of scanning raw deliveries. Derived
+metrics (average, strike rate, economy, win %) are always computed from the
+summed numerators and denominators of the rollup, never averaged.
+
+Usage:
+    from ipl_cube import load_cube
+
+    cube = load_cube()
+    cube.rollup(["period"], where={"bowling_team": "Mumbai Indians", "phase": "Death"},
+                champion_years=[2013, 2015, 2017, 2019, 2020])[["period", "economy"]]
+    cube.rollup(["period"], table="matches", champion_years=[2013, 2015, 2017, 2019, 2020],
+                where={"team": "Mumbai Indians", "venue": lambda v: v.str.contains("Wankhede")})
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from ipl_features import derive_features
+from ipl_matches import load_match_index
+from ipl_store import CACHE_DIR, CSV_PATH, ensure_cache, load_deliveries
+from ipl_trace import traced
+
+CUBE_DIMS = ["season_year", "phase", "innings", "venue", "batter", "bowler", "batting_team", "bowling_team"]
+CUBE_MEASURES = {
+    "deliveries": ("match_id", "size"),
+    "balls": ("valid_ball", "sum"),
+    "balls_faced": ("balls_faced", "sum"),
+    "runs_batter": ("runs_batter", "sum"),
+    "runs_extras": ("runs_extras", "sum"),
+    "runs_total": ("runs_total", "sum"),
+    "wickets": ("is_wicket", "sum"),
+    "bowler_wickets": ("bowler_wicket", "sum"),
+    "dots": ("is_dot", "sum"),
+    "fours": ("is_four", "sum"),
+    "sixes": ("is_six", "sum"),
+    "boundary_runs": ("boundary_runs", "sum"),
+}
+MATCH_DIMS = ["season_year", "venue", "team", "opponent", "batting_order", "toss_won", "toss_decision"]
+MATCH_MEASURES = {"matches": ("match_id", "size"), "wins": ("won", "sum")}
+
+SOURCE_COLS = [
+    "match_id", "season_year", "innings", "over", "venue", "batter", "bowler",
+    "batting_team", "bowling_team", "valid_ball", "balls_faced", "runs_batter",
+    "runs_extras", "runs_total", "wicket_kind", "bowler_wicket",
+]
+PERIOD_LABELS = ("Champion Years", "Other Years")
+CUBE_FORMAT = 1  # bump when the stored tables change shape
+
+
+def _safe_div(num, den, scale=1.0):
+    den = den.astype(float)
+    return num / den.where(den != 0) * scale
+
+
+# Derived metrics: name -> (required measures, function of the summed frame)
+DERIVED = {
+    "batting_avg": (["runs_batter", "wickets"], lambda t: _safe_div(t["runs_batter"], t["wickets"])),
+    "strike_rate": (["runs_batter", "balls"], lambda t: _safe_div(t["runs_batter"], t["balls"], 100)),
+    "bowling_avg": (["runs_total", "bowler_wickets"], lambda t: _safe_div(t["runs_total"], t["bowler_wickets"])),
+    "economy": (["runs_total", "balls"], lambda t: _safe_div(t["runs_total"], t["balls"], 6)),
+    # Runs per over counted on all deliveries (extras included), as in the phase report
+    "rpo": (["runs_total", "deliveries"], lambda t: _safe_div(t["runs_total"], t["deliveries"], 6)),
+    "dot_pct": (["dots", "balls"], lambda t: _safe_div(t["dots"], t["balls"], 100)),
+    "boundary_pct": (["boundary_runs", "runs_batter"], lambda t: _safe_div(t["boundary_runs"], t["runs_batter"], 100)),
+    "win_pct": (["wins", "matches"], lambda t: _safe_div(t["wins"], t["matches"], 100)),
+}
+
+
+@traced(category="aggregate")
+def build_delivery_cube(df):
+    """Aggregates deliveries to the cube grain."""
+    df = derive_features(df)
+    return df.groupby(CUBE_DIMS, observed=True, dropna=False).agg(**CUBE_MEASURES).reset_index()
+
+
+@traced(category="aggregate")
+def build_match_cube(matches):
+    """Two rows per match from the match index (one per side), rolled up to the match-cube grain."""
+    m = matches.reset_index(drop=True)
+    first = pd.DataFrame({"team": m["batting_first"], "opponent": m["batting_second"], "batting_order": 1})
+    # batting_order: 1 = set target, 2 = chased, 0 = never batted (no second innings)
+    second = pd.DataFrame({
+        "team": m["batting_second"], "opponent": m["batting_first"],
+        "batting_order": np.where(m["innings"] >= 2, 2, 0),
+    })
+    attrs = m[["match_id", "season_year", "venue", "toss_winner", "toss_decision", "match_won_by"]]
+    sides = pd.concat([pd.concat([attrs, first], axis=1), pd.concat([attrs, second], axis=1)], ignore_index=True)
+    sides["batting_order"] = sides["batting_order"].astype("int8")
+    sides["won"] = (sides["match_won_by"] == sides["team"]).astype("int8")
+    sides["toss_won"] = sides["toss_winner"] == sides["team"]
+    return sides.groupby(MATCH_DIMS, dropna=False).agg(**MATCH_MEASURES).reset_index()
+
+
+class OLAPCube:
+    """Materialized delivery and match cubes with a rollup query API."""
+
+    def __init__(self, deliveries, matches, version=None):
+        self.deliveries = deliveries
+        self.matches = matches
+        # Dataset hash the cube was built from (used as its memoization fingerprint)
+        self.version = version
+
+    def _table(self, table):
+        return self.deliveries if table == "deliveries" else self.matches
+
+    @staticmethod
+    def _mask(frame, where):
+        mask = np.ones(len(frame), dtype=bool)
+        for col, value in (where or {}).items():
+            if callable(value):
+                cond = value(frame[col])
+            elif isinstance(value, (list, tuple, set, range)):
+                cond = frame[col].isin(list(value))
+            else:
+                cond = frame[col] == value
+            mask &= np.asarray(cond.fillna(False) if hasattr(cond, "fillna") else cond, dtype=bool)
+        return mask
+
+    @traced(category="aggregate")
+    def rollup(self, by, where=None, table="deliveries", champion_years=None, period_labels=PERIOD_LABELS):
+        """
+        Sums the cube's measures grouped by `by` and adds derived metrics.
+
+        by:             cube dimensions; "period" is available when
+                        `champion_years` is given (champion vs other seasons).
+        where:          {dimension: value | list | callable(Series) -> mask}
+        table:          "deliveries" or "matches"
+        """
+        frame = self._table(table)
+        sub = frame[self._mask(frame, where)]
+        if champion_years is not None:
+            is_champ = sub["season_year"].isin(champion_years).to_numpy()
+            sub = sub.assign(period=np.where(is_champ, period_labels[0], period_labels[1]))
+        measures = list(CUBE_MEASURES if table == "deliveries" else MATCH_MEASURES)
+        if by:
+            result = sub.groupby(list(by), observed=True)[measures].sum().reset_index()
+            # Plain values so plots show only the groups present, in result order
+            for col in by:
+                if isinstance(result[col].dtype, pd.CategoricalDtype):
+                    result[col] = result[col].astype(object)
+        else:
+            result = sub[measures].sum().to_frame().T
+        for name, (needs, fn) in DERIVED.items():
+            if all(m in result.columns for m in needs):
+                result[name] = fn(result)
+        return result
+
+
+def _cube_paths(cache_dir):
+    cube_dir = os.path.join(cache_dir, "cube")
+    return cube_dir, os.path.join(cube_dir, "deliveries.parquet"), os.path.join(cube_dir, "matches.parquet")
+
+
+def build_cube(csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """Builds both cube tables from the columnar cache and stores them next to it."""
+    print("Building OLAP cube...")
+    df = load_deliveries(columns=SOURCE_COLS, csv_path=csv_path, cache_dir=cache_dir)
+    version = ensure_cache(csv_path, cache_dir)["sha256"]
+    matches = load_match_index(csv_path, cache_dir).frame
+    cube = OLAPCube(build_delivery_cube(df), build_match_cube(matches), version)
+
+    cube_dir, deliveries_path, matches_path = _cube_paths(cache_dir)
+    os.makedirs(cube_dir, exist_ok=True)
+    cube.deliveries.to_parquet(deliveries_path, index=False)
+    cube.matches.to_parquet(matches_path, index=False)
+    with open(os.path.join(cube_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"sha256": version, "format": CUBE_FORMAT, "rows": len(cube.deliveries)}, f)
+    print(f"✓ Cube: {len(df)} deliveries -> {len(cube.deliveries)} cells, {len(cube.matches)} match cells")
+    return cube
+
+
+@traced(category="load", rows=lambda cube: len(cube.deliveries))
+def load_cube(csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """Loads the materialized cube, rebuilding it if the dataset changed."""
+    version = ensure_cache(csv_path, cache_dir)["sha256"]
+    cube_dir, deliveries_path, matches_path = _cube_paths(cache_dir)
+    manifest_path = os.path.join(cube_dir, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("sha256") == version and manifest.get("format") == CUBE_FORMAT:
+            return OLAPCube(pd.read_parquet(deliveries_path), pd.read_parquet(matches_path), version)
+    return build_cube(csv_path, cache_dir)
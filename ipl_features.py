@@ -0,0 +1,182 @@
+"""
+Vectorized feature derivation for ball-by-ball deliveries.
+
+One place for the derived columns the reports used to build with per-row
+`apply` calls: phase, season_year, wicket/dot/boundary flags, boundary runs,
+partnership keys, batting-first flags and score buckets. Everything here is
+NumPy / categorical arithmetic, so the cost is independent of Python call
+overhead per row.
+
+sequence_features() adds the running, order-dependent columns (batter score
+and ball index, partnerships) after sorting the deliveries once.
+
+Usage:
+    from ipl_features import derive_features, sequence_features
+
+    df = derive_features(df)                        # report phases (0-indexed overs)
+    fact = derive_features(fact, phase_scheme="prep")  # data_preparation labels
+    seq = sequence_features(fact)                   # sorted by match, innings, over, ball
+"""
+import numpy as np
+import pandas as pd
+
+from ipl_trace import traced
+
+# --- Phase Schemes ---
+# "report": mi_champion_analytics.get_phase  (over < 6 Powerplay, over >= 15 Death)
+# "prep":   data_preparation.phase_from_over (over <= 6 Powerplay, over <= 15 Middle)
+PHASE_SCHEMES = {
+    "report": {"labels": ["Powerplay", "Middle", "Death"], "edges": [6, 15], "right": False},
+    "prep": {"labels": ["Powerplay (1-6)", "Middle (7-15)", "Death (16-20)"], "edges": [6, 15], "right": True},
+}
+SCORE_BUCKETS = ["30s", "40s", "Other"]
+SEQUENCE_ORDER = ["match_id", "innings", "over", "ball"]
+
+
+def phase_from_over(over, scheme="report"):
+    """Maps over numbers to an ordered phase Categorical."""
+    spec = PHASE_SCHEMES[scheme]
+    # right=False: bin i holds edges[i-1] <= over < edges[i]; right=True: edges[i-1] < over <= edges[i]
+    side = "left" if spec["right"] else "right"
+    codes = np.searchsorted(spec["edges"], np.asarray(over), side=side)
+    phase = pd.Categorical.from_codes(codes, categories=spec["labels"], ordered=True)
+    return pd.Series(phase, index=getattr(over, "index", None), name="phase")
+
+
+def season_year_from(season):
+    """Vectorized clean_season: '2007/08' -> 2007, '2013' -> 2013, junk -> 0."""
+    if isinstance(season.dtype, pd.CategoricalDtype):
+        # Parse each distinct season once, then broadcast through the codes
+        years = season_year_from(pd.Series(season.cat.categories.astype(str)))
+        codes = season.cat.codes.to_numpy()
+        values = np.where(codes >= 0, years.to_numpy()[codes], 0)
+        return pd.Series(values.astype("int16"), index=season.index, name="season_year")
+    first = season.astype(str).str.split("/").str[0]
+    return pd.to_numeric(first, errors="coerce").fillna(0).astype("int16").rename("season_year")
+
+
+def boundary_runs(runs_batter):
+    """Runs off the bat that came from a four or a six, else 0."""
+    runs = runs_batter.to_numpy()
+    return pd.Series(np.where((runs == 4) | (runs == 6), runs, 0), index=runs_batter.index)
+
+
+def _name_ranks(values, names):
+    """Position of each categorical value in the sorted `names` index."""
+    ranks = np.searchsorted(names, values.cat.categories.astype(str))
+    codes = values.cat.codes.to_numpy()
+    return np.where(codes >= 0, ranks[codes], np.searchsorted(names, "nan"))
+
+
+def partnership_key(batter, non_striker):
+    """
+    Order-independent 'A & B' pair label (A-B == B-A) as a Categorical.
+
+    Names are ranked through one sorted category index, so the per-row work is
+    integer min/max; labels are only built once per distinct pair.
+    """
+    a = batter.astype("category")
+    b = non_striker.astype("category")
+    # str(NaN) == "nan" in the legacy lambda, so missing names sort as "nan" too
+    names = np.unique(np.concatenate([a.cat.categories.astype(str), b.cat.categories.astype(str), ["nan"]]))
+    ca = _name_ranks(a, names)
+    cb = _name_ranks(b, names)
+    pair = np.minimum(ca, cb).astype(np.int64) * len(names) + np.maximum(ca, cb)
+    uniq, codes = np.unique(pair, return_inverse=True)
+    labels = [f"{names[p // len(names)]} & {names[p % len(names)]}" for p in uniq]
+    return pd.Series(pd.Categorical.from_codes(codes, categories=labels), index=batter.index, name="partners")
+
+
+def bat_first(matches, team="Mumbai Indians"):
+    """Toss-based 'did team bat first' flag for match-level rows (did_mi_bat_first)."""
+    won_toss = (matches["toss_winner"] == team).to_numpy()
+    decision = matches["toss_decision"].astype(str).to_numpy()
+    flag = np.where(won_toss, decision == "bat", decision == "field")
+    return pd.Series(flag, index=matches.index, name="bat_first")
+
+
+def score_bucket(runs):
+    """Buckets a batter's running score into '30s', '40s' or 'Other'."""
+    r = runs.to_numpy()
+    codes = np.select([(r >= 30) & (r <= 39), (r >= 40) & (r <= 49)], [0, 1], default=2)
+    return pd.Series(pd.Categorical.from_codes(codes, categories=SCORE_BUCKETS), index=runs.index, name="score_range")
+
+
+@traced(category="derive")
+def derive_features(df, team=None, phase_scheme="report"):
+    """
+    Adds the standard derived columns to a deliveries frame (in place) and returns it.
+
+    Columns are only added when their inputs are present: phase, season_year,
+    is_wicket, is_dot, is_four, is_six, is_boundary, boundary_runs, partners,
+    and bat_first (when `team` is given and toss columns exist).
+    """
+    cols = df.columns
+    if "over" in cols:
+        df["phase"] = phase_from_over(df["over"], phase_scheme)
+    if "season" in cols and "season_year" not in cols:
+        df["season_year"] = season_year_from(df["season"])
+    if "wicket_kind" in cols:
+        df["is_wicket"] = df["wicket_kind"].notna().to_numpy().astype(np.int8)
+    if "runs_total" in cols:
+        df["is_dot"] = (df["runs_total"].to_numpy() == 0).astype(np.int8)
+    if "runs_batter" in cols:
+        runs = df["runs_batter"].to_numpy()
+        df["is_four"] = (runs == 4).astype(np.int8)
+        df["is_six"] = (runs == 6).astype(np.int8)
+        df["is_boundary"] = (df["is_four"] | df["is_six"]).astype(np.int8)
+        df["boundary_runs"] = boundary_runs(df["runs_batter"])
+    if "batter" in cols and "non_striker" in cols:
+        df["partners"] = partnership_key(df["batter"], df["non_striker"])
+    if team is not None and "toss_winner" in cols and "toss_decision" in cols:
+        df["bat_first"] = bat_first(df, team)
+    return df
+
+
+def _segment_cumsum(values, starts, segment):
+    """Running sum of `values` that restarts at every index in `starts`."""
+    total = np.cumsum(values)
+    offset = total[starts] - values[starts]
+    return total - offset[segment]
+
+
+@traced(category="derive")
+def sequence_features(df):
+    """
+    Sorts deliveries once by (match_id, innings, over, ball) and adds the
+    per-innings running columns in one vectorized pass. Returns a new frame.
+
+    batter_runs_cum    batter's score after this ball (the old curr_runs)
+    batter_ball_no     1-based index of the delivery in the batter's innings
+    partnership_id     global id; a new partnership starts after each wicket
+    partnership_runs   running runs (incl. extras) within the partnership
+    partnership_balls  running legal balls within the partnership
+    score_range        score bucket of batter_runs_cum ('30s', '40s', 'Other')
+    """
+    df = df.sort_values(SEQUENCE_ORDER, kind="stable").reset_index(drop=True)
+    n = len(df)
+    match = df["match_id"].to_numpy()
+    innings = df["innings"].to_numpy()
+    new_innings = np.ones(n, dtype=bool)
+    new_innings[1:] = (match[1:] != match[:-1]) | (innings[1:] != innings[:-1])
+    innings_id = np.cumsum(new_innings) - 1
+
+    # Batter running score / ball index: group key = (innings, batter) as one integer
+    codes = df["batter"].astype("category").cat.codes.to_numpy().astype(np.int64) + 1
+    batter_key = innings_id * (codes.max(initial=0) + 1) + codes
+    by_batter = pd.Series(df["runs_batter"].fillna(0).to_numpy(np.int64)).groupby(batter_key, sort=False)
+    df["batter_runs_cum"] = by_batter.cumsum().to_numpy()
+    df["batter_ball_no"] = by_batter.cumcount().to_numpy() + 1
+
+    # Partnerships: a new stand starts each innings and on the ball after a wicket
+    wicket = (df["is_wicket"] > 0) if "is_wicket" in df.columns else df["wicket_kind"].notna()
+    new_stand = new_innings.copy()
+    new_stand[1:] |= wicket.to_numpy()[:-1]
+    stand = np.cumsum(new_stand) - 1
+    starts = np.flatnonzero(new_stand)
+    df["partnership_id"] = stand
+    df["partnership_runs"] = _segment_cumsum(df["runs_total"].fillna(0).to_numpy(np.int64), starts, stand)
+    df["partnership_balls"] = _segment_cumsum(df["valid_ball"].fillna(0).to_numpy(np.int64), starts, stand)
+
+    df["score_range"] = score_bucket(df["batter_runs_cum"])
+    return df
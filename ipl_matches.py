@@ -0,0 +1,156 @@
+"""
+Persistent match index over the sorted deliveries table.
+
+One row per match_id with the match-level facts the reports kept rebuilding
+with drop_duplicates / groupby-min / merge: season, venue, the two teams in
+batting order, innings played, toss, winner, stage and an MI-involved flag.
+Each row also holds [row_start, row_end) offsets into the deliveries frame
+returned by ipl_store.load_deliveries() (unfiltered), which the cache keeps
+sorted by (season_year, match_id), so a match's deliveries are a single
+O(1) positional slice instead of a boolean scan of the whole frame.
+
+The index is built once per dataset version and stored under
+.ipl_cache/match_index.
+
+Usage:
+    from ipl_matches import load_match_index
+    from ipl_store import load_deliveries
+
+    matches = load_match_index()
+    df = load_deliveries()
+    one = matches.deliveries(df, 335982)                 # O(1) slice
+    mi = matches.take(df, matches.match_ids("Mumbai Indians"))
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from ipl_store import CACHE_DIR, CSV_PATH, ensure_cache, load_deliveries
+from ipl_trace import traced
+
+TEAM = "Mumbai Indians"
+INDEX_COLS = [
+    "match_id", "season", "season_year", "date", "venue", "city",
+    "toss_winner", "toss_decision", "match_won_by", "win_outcome", "result_type", "stage",
+]
+SOURCE_COLS = INDEX_COLS + ["innings", "batting_team", "bowling_team"]
+INDEX_FORMAT = 1  # bump when the stored table changes shape
+
+
+@traced(category="aggregate")
+def build_match_index(df, team=TEAM):
+    """
+    Derives the match index from deliveries sorted so each match is contiguous.
+
+    batting_first / batting_second are the innings-1 batting and bowling sides;
+    innings is the highest innings number played (3+ means a super over).
+    """
+    ids = df["match_id"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if len(ids) else np.array([], dtype=np.int64)
+    if len(starts) != len(np.unique(ids)):
+        raise ValueError("Deliveries must be grouped by match_id (use the unfiltered cache order).")
+    ends = np.r_[starts[1:], len(ids)].astype(np.int64)
+
+    cols = [c for c in INDEX_COLS if c in df.columns]
+    index = df.iloc[starts][cols].reset_index(drop=True)
+    for col in cols:
+        if isinstance(index[col].dtype, pd.CategoricalDtype):
+            # Plain strings: the index is small and compared across teams / tables
+            index[col] = index[col].astype(object)
+    index["batting_first"] = df["batting_team"].iloc[starts].astype(object).to_numpy()
+    index["batting_second"] = df["bowling_team"].iloc[starts].astype(object).to_numpy()
+    index["innings"] = np.maximum.reduceat(df["innings"].to_numpy(), starts) if len(starts) else []
+    index["row_start"] = starts.astype(np.int64)
+    index["row_end"] = ends
+    index["mi_involved"] = (index["batting_first"] == team) | (index["batting_second"] == team)
+    return index
+
+
+class MatchIndex:
+    """Match-level table keyed by match_id with row ranges into the deliveries frame."""
+
+    def __init__(self, frame, rows, version=None):
+        self.frame = frame.set_index("match_id", drop=False).rename_axis(None)
+        self.rows = rows  # Length of the deliveries frame the offsets refer to
+        self.version = version
+
+    def __len__(self):
+        return len(self.frame)
+
+    def _check(self, df):
+        if len(df) != self.rows:
+            raise ValueError(
+                f"Match index offsets refer to the full {self.rows}-row deliveries table, got {len(df)} rows."
+            )
+
+    def span(self, match_id):
+        """[row_start, row_end) of one match."""
+        row = self.frame.loc[match_id]
+        return int(row["row_start"]), int(row["row_end"])
+
+    def deliveries(self, df, match_id):
+        """One match's deliveries as a positional slice of the full table."""
+        self._check(df)
+        start, end = self.span(match_id)
+        return df.iloc[start:end]
+
+    def take(self, df, match_ids):
+        """Deliveries of several matches, in table order."""
+        self._check(df)
+        spans = self.frame.loc[list(match_ids), ["row_start", "row_end"]].sort_values("row_start")
+        if spans.empty:
+            return df.iloc[0:0]
+        positions = np.concatenate([np.arange(s, e) for s, e in spans.to_numpy()])
+        return df.iloc[positions]
+
+    def lookup(self, match_ids, column):
+        """Match attribute aligned to `match_ids` (e.g. toss_decision for a matches table)."""
+        return self.frame[column].reindex(pd.Index(match_ids)).to_numpy()
+
+    def involving(self, team):
+        """Rows of matches `team` played in."""
+        f = self.frame
+        return f[(f["batting_first"] == team) | (f["batting_second"] == team)]
+
+    def match_ids(self, team=None, exclude=()):
+        """Sorted match_ids, optionally only `team`'s and without `exclude`."""
+        f = self.frame if team is None else self.involving(team)
+        ids = f["match_id"]
+        if len(exclude):
+            ids = ids[~ids.isin(list(exclude))]
+        return sorted(ids.tolist())
+
+
+def _index_paths(cache_dir):
+    index_dir = os.path.join(cache_dir, "match_index")
+    return index_dir, os.path.join(index_dir, "matches.parquet"), os.path.join(index_dir, "manifest.json")
+
+
+def build_and_save(csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """Builds the match index from the columnar cache and stores it next to it."""
+    manifest = ensure_cache(csv_path, cache_dir)
+    df = load_deliveries(columns=[c for c in SOURCE_COLS if c in manifest["columns"]], csv_path=csv_path, cache_dir=cache_dir)
+    frame = build_match_index(df)
+
+    index_dir, data_path, manifest_path = _index_paths(cache_dir)
+    os.makedirs(index_dir, exist_ok=True)
+    frame.to_parquet(data_path, index=False)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"sha256": manifest["sha256"], "format": INDEX_FORMAT, "rows": len(df), "matches": len(frame)}, f)
+    print(f"✓ Match index: {len(frame)} matches over {len(df)} deliveries")
+    return MatchIndex(frame, len(df), manifest["sha256"])
+
+
+@traced(category="load", rows=len)
+def load_match_index(csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """Loads the match index, rebuilding it if the dataset changed."""
+    version = ensure_cache(csv_path, cache_dir)["sha256"]
+    _, data_path, manifest_path = _index_paths(cache_dir)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("sha256") == version and manifest.get("format") == INDEX_FORMAT:
+            return MatchIndex(pd.read_parquet(data_path), manifest["rows"], version)
+    return build_and_save(csv_path, cache_dir)
@@ -0,0 +1,209 @@
+"""
+Batter x bowler matchup index over the whole history.
+
+Head-to-head questions used to filter the full deliveries frame again for
+every pair. The index instead holds SciPy CSR matrices (rows = batters,
+columns = bowlers) of runs off the bat, balls faced, dismissals credited to
+the bowler and dot balls, one per (phase, season) slice. A query sums the
+slices it needs (cached per slice selection) and reads rows, columns or
+sub-blocks of the result, so no query touches raw deliveries.
+
+- pair():  one batter (or group of batters) against one bowler (or group)
+- top_k(): a player's best / worst opponents by any measure or derived stat
+- bulk():  every pair between a set of batters and an opposition attack (XI)
+
+Derived stats are computed from the summed measures: strike_rate,
+average (runs per dismissal), balls_per_dismissal and dot_pct.
+
+The matrices are stored under .ipl_cache/matchups (one stacked CSR per
+measure) and rebuilt only when the dataset version changes.
+
+Usage:
+    from ipl_matchups import load_matchups
+
+    mx = load_matchups()
+    mx.pair("RG Sharma", "SP Narine", phase="Death")
+    mx.top_k("JJ Bumrah", role="bowler", by="dismissals", k=5, seasons=range(2019, 2024))
+    mx.bulk(["RG Sharma", "SA Yadav"], opposition_bowlers)
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from ipl_features import PHASE_SCHEMES, phase_from_over
+from ipl_store import CACHE_DIR, CSV_PATH, ensure_cache, load_deliveries
+from ipl_trace import traced
+
+MEASURES = ["runs", "balls", "dismissals", "dots"]
+PHASES = PHASE_SCHEMES["report"]["labels"]
+SOURCE_COLS = ["batter", "bowler", "over", "season_year", "runs_batter", "balls_faced", "runs_total", "bowler_wicket"]
+
+
+def _derive(frame):
+    """Adds strike_rate, average, balls_per_dismissal and dot_pct to a frame of summed measures."""
+    balls = frame["balls"].where(frame["balls"] > 0)
+    outs = frame["dismissals"].where(frame["dismissals"] > 0)
+    frame["strike_rate"] = frame["runs"] / balls * 100
+    frame["average"] = frame["runs"] / outs
+    frame["balls_per_dismissal"] = frame["balls"] / outs
+    frame["dot_pct"] = frame["dots"] / balls * 100
+    return frame
+
+
+class MatchupIndex:
+    """Sparse batter x bowler matrices per (phase, season) slice."""
+
+    def __init__(self, batters, bowlers, seasons, slices, version=None):
+        self.batters = list(batters)
+        self.bowlers = list(bowlers)
+        self.seasons = [int(s) for s in seasons]
+        self.slices = slices  # measure -> list of CSR matrices, slice = phase * len(seasons) + season
+        self.version = version
+        self._batter_pos = {name: i for i, name in enumerate(self.batters)}
+        self._bowler_pos = {name: i for i, name in enumerate(self.bowlers)}
+        self._cache = {}
+
+    def _slice_ids(self, phase, seasons):
+        phases = range(len(PHASES)) if phase is None else [PHASES.index(p) for p in np.atleast_1d(phase)]
+        if seasons is None:
+            season_ids = range(len(self.seasons))
+        else:
+            wanted = {int(s) for s in ([seasons] if np.isscalar(seasons) else seasons)}
+            season_ids = [i for i, s in enumerate(self.seasons) if s in wanted]
+        return tuple(p * len(self.seasons) + s for p in phases for s in season_ids)
+
+    def matrices(self, phase=None, seasons=None):
+        """{measure: CSR batter x bowler} summed over the selected phase(s) and season(s)."""
+        key = self._slice_ids(phase, seasons)
+        if key not in self._cache:
+            shape = (len(self.batters), len(self.bowlers))
+            self._cache[key] = {
+                m: sum((self.slices[m][i] for i in key), sparse.csr_matrix(shape, dtype=np.int64)).tocsr()
+                for m in MEASURES
+            }
+        return self._cache[key]
+
+    def _positions(self, names, lookup, role):
+        names = [names] if isinstance(names, str) else list(names)
+        missing = [n for n in names if n not in lookup]
+        if missing:
+            raise KeyError(f"unknown {role}(s): {', '.join(missing)}")
+        return [lookup[n] for n in names]
+
+    def pair(self, batter, bowler, phase=None, seasons=None):
+        """Head-to-head totals and derived stats; either side may be a name or a list (summed)."""
+        rows = self._positions(batter, self._batter_pos, "batter")
+        cols = self._positions(bowler, self._bowler_pos, "bowler")
+        mats = self.matrices(phase, seasons)
+        totals = {m: int(mats[m][rows][:, cols].sum()) for m in MEASURES}
+        return _derive(pd.DataFrame([totals])).iloc[0]
+
+    def top_k(self, player, role="batter", by="runs", k=5, phase=None, seasons=None, min_balls=6, ascending=False):
+        """A player's k opponents ranked by a measure or derived stat (at least `min_balls` faced)."""
+        mats = self.matrices(phase, seasons)
+        if role == "batter":
+            pos, opponents, opponent_role = self._positions(player, self._batter_pos, "batter")[0], self.bowlers, "bowler"
+            rows = {m: mats[m].getrow(pos) for m in MEASURES}
+        else:
+            pos, opponents, opponent_role = self._positions(player, self._bowler_pos, "bowler")[0], self.batters, "batter"
+            rows = {m: mats[m].getcol(pos).T.tocsr() for m in MEASURES}
+        # Opponents actually faced: stored entries of the balls row
+        faced = rows["balls"].indices
+        frame = pd.DataFrame({m: np.asarray(rows[m][:, faced].todense()).ravel() for m in MEASURES})
+        frame.insert(0, opponent_role, np.asarray(opponents, dtype=object)[faced])
+        frame = _derive(frame[frame["balls"] >= min_balls].copy())
+        return frame.sort_values(by, ascending=ascending, na_position="last").head(k).reset_index(drop=True)
+
+    def bulk(self, batters, bowlers, phase=None, seasons=None, min_balls=0):
+        """Every (batter, bowler) pair between two squads as a long frame; unknown names are skipped."""
+        batters = [b for b in batters if b in self._batter_pos]
+        bowlers = [b for b in bowlers if b in self._bowler_pos]
+        rows = [self._batter_pos[b] for b in batters]
+        cols = [self._bowler_pos[b] for b in bowlers]
+        mats = self.matrices(phase, seasons)
+        blocks = {m: mats[m][rows][:, cols].toarray() for m in MEASURES}
+        frame = pd.DataFrame({
+            "batter": np.repeat(batters, len(bowlers)),
+            "bowler": np.tile(bowlers, len(batters)),
+            **{m: blocks[m].ravel() for m in MEASURES},
+        })
+        return _derive(frame[frame["balls"] >= min_balls].reset_index(drop=True))
+
+
+@traced(category="aggregate", rows=None)
+def build_matchups(df, version=None):
+    """Aggregates deliveries into the per-slice sparse matrices (duplicates summed by SciPy)."""
+    batter = df["batter"].astype("category")
+    bowler = df["bowler"].astype("category")
+    seasons = np.sort(df["season_year"].unique())
+    phase = np.asarray(phase_from_over(df["over"]).cat.codes, dtype=np.int64)
+    season = np.searchsorted(seasons, df["season_year"].to_numpy())
+    slice_id = phase * len(seasons) + season
+
+    n_bat, n_bowl = len(batter.cat.categories), len(bowler.cat.categories)
+    n_slices = len(PHASES) * len(seasons)
+    rows = batter.cat.codes.to_numpy().astype(np.int64)
+    bowler_codes = bowler.cat.codes.to_numpy().astype(np.int64)
+    cols = slice_id * n_bowl + bowler_codes
+    valid = (rows >= 0) & (bowler_codes >= 0)  # Drop rows without a batter / bowler name
+
+    runs_total = df["runs_total"].fillna(0).to_numpy()
+    balls = df["balls_faced"].fillna(0).to_numpy(np.int64)
+    values = {
+        "runs": df["runs_batter"].fillna(0).to_numpy(np.int64),
+        "balls": balls,
+        "dismissals": df["bowler_wicket"].fillna(0).to_numpy(np.int64),
+        "dots": ((runs_total == 0) & (balls > 0)).astype(np.int64),
+    }
+    slices = {}
+    for m in MEASURES:
+        stacked = sparse.csr_matrix(
+            (values[m][valid], (rows[valid], cols[valid])), shape=(n_bat, n_slices * n_bowl), dtype=np.int64)
+        stacked.eliminate_zeros()
+        slices[m] = _split(stacked, n_slices, n_bowl)
+    return MatchupIndex(batter.cat.categories.astype(str), bowler.cat.categories.astype(str), seasons, slices, version)
+
+
+def _split(stacked, n_slices, n_bowl):
+    stacked = stacked.tocsc()
+    return [stacked[:, s * n_bowl:(s + 1) * n_bowl].tocsr() for s in range(n_slices)]
+
+
+def _matchup_dir(cache_dir):
+    return os.path.join(cache_dir, "matchups")
+
+
+def build_and_save(csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """Builds the index from the columnar cache and stores one stacked CSR per measure."""
+    version = ensure_cache(csv_path, cache_dir)["sha256"]
+    df = load_deliveries(columns=SOURCE_COLS, csv_path=csv_path, cache_dir=cache_dir)
+    index = build_matchups(df, version)
+
+    out_dir = _matchup_dir(cache_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    for m in MEASURES:
+        sparse.save_npz(os.path.join(out_dir, f"{m}.npz"), sparse.hstack(index.slices[m], format="csr"))
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"sha256": version, "batters": index.batters, "bowlers": index.bowlers, "seasons": index.seasons}, f)
+    pairs = index.matrices()["balls"].nnz
+    print(f"✓ Matchups: {len(index.batters)} batters x {len(index.bowlers)} bowlers, {pairs} pairs")
+    return index
+
+
+@traced(category="load", rows=None)
+def load_matchups(csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """Loads the matchup index, rebuilding it if the dataset changed."""
+    version = ensure_cache(csv_path, cache_dir)["sha256"]
+    out_dir = _matchup_dir(cache_dir)
+    manifest_path = os.path.join(out_dir, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("sha256") == version:
+            n_bowl, n_slices = len(manifest["bowlers"]), len(PHASES) * len(manifest["seasons"])
+            slices = {m: _split(sparse.load_npz(os.path.join(out_dir, f"{m}.npz")), n_slices, n_bowl) for m in MEASURES}
+            return MatchupIndex(manifest["batters"], manifest["bowlers"], manifest["seasons"], slices, version)
+    return build_and_save(csv_path, cache_dir)
@@ -0,0 +1,208 @@
+"""
+Disk-backed memoization for analysis functions.
+
+A decorated function's result is pickled under .ipl_cache/memo, keyed on a
+hash of the function's source, its parameters (team, champion years,
+thresholds, ...) and a fingerprint of every data argument. DataFrames are
+fingerprinted by content; objects carrying a `version` (e.g. the OLAP cube,
+which stores the dataset hash) use that plus the source of the modules
+that compute from them (their class's module, or its `code_modules`), so
+editing cube.rollup or bootstrap_periods invalidates results too. Helpers
+in other modules are listed with `deps=`; arguments that do not change the
+result (worker counts, ...) are left out of the key with `ignore=`. An
+unchanged dataset, code and parameters give a disk hit; anything else
+recomputes.
+
+The store is bounded: least recently used entries are evicted once it holds
+more than MAX_ENTRIES results or MAX_BYTES on disk. Hits and misses are
+counted per function.
+
+Usage:
+    from ipl_memo import memoize, memo_stats
+
+    @memoize
+    def batter_summary(mi_batting, min_runs=300):
+        ...
+
+    batter_summary(mi_batting, min_runs=300)   # miss: computed and stored
+    batter_summary(mi_batting, min_runs=300)   # hit: loaded from disk
+    print(memo_stats())
+
+    @memoize(deps=["ipl_bootstrap"], ignore=["workers"])
+    def intervals(totals, team, workers=None):
+        ...
+
+Set IPL_MEMO=0 to bypass the cache.
+"""
+import functools
+import hashlib
+import importlib
+import inspect
+import os
+import pickle
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from ipl_store import CACHE_DIR
+
+MEMO_DIR = os.path.join(CACHE_DIR, "memo")
+MAX_ENTRIES = 256
+MAX_BYTES = 256 * 1024 * 1024
+
+_stats = {}
+
+
+def fingerprint(obj):
+    """Stable content hash for function arguments (data and parameters)."""
+    digest = hashlib.sha256()
+    _update(digest, obj)
+    return digest.hexdigest()
+
+
+def _update(digest, obj):
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        digest.update(b"frame")
+        digest.update(repr(obj.dtypes if isinstance(obj, pd.DataFrame) else obj.dtype).encode())
+        digest.update(repr(list(obj.columns) if isinstance(obj, pd.DataFrame) else obj.name).encode())
+        digest.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        digest.update(f"array{obj.dtype}{obj.shape}".encode())
+        digest.update(np.ascontiguousarray(obj).tobytes())
+    elif getattr(obj, "version", None) is not None:
+        digest.update(f"{type(obj).__name__}:{obj.version}".encode())
+        for module in getattr(obj, "code_modules", (type(obj).__module__,)):
+            digest.update(_module_hash(module).encode())
+    elif isinstance(obj, dict):
+        digest.update(b"dict")
+        for key in sorted(obj, key=repr):
+            _update(digest, key)
+            _update(digest, obj[key])
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        digest.update(type(obj).__name__.encode())
+        for item in sorted(obj, key=repr) if isinstance(obj, (set, frozenset)) else obj:
+            _update(digest, item)
+    elif callable(obj):
+        digest.update(_source_hash(obj).encode())
+    else:
+        digest.update(repr(obj).encode())
+    digest.update(b"|")
+
+
+def _source_hash(func):
+    """Hash of the function body, so editing an analysis invalidates its results."""
+    try:
+        source = inspect.getsource(func).encode()
+    except (OSError, TypeError):
+        code = func.__code__
+        source = code.co_code + repr(code.co_consts).encode() + repr(code.co_names).encode()
+    return hashlib.sha256(source).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _module_hash(name):
+    """Hash of a module's source (empty for modules without a source file, e.g. a notebook's __main__)."""
+    try:
+        source = inspect.getsource(importlib.import_module(name)).encode()
+    except (ImportError, OSError, TypeError):
+        source = b""
+    return hashlib.sha256(source).hexdigest()
+
+
+def _entries(memo_dir):
+    if not os.path.isdir(memo_dir):
+        return []
+    entries = []
+    for name in os.listdir(memo_dir):
+        if name.endswith(".pkl"):
+            path = os.path.join(memo_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+    return entries
+
+
+def _evict(memo_dir, max_entries, max_bytes):
+    """Drops least recently used results until the store fits both bounds."""
+    entries = sorted(_entries(memo_dir))
+    total = sum(size for _, size, _ in entries)
+    evicted = 0
+    while entries and (len(entries) > max_entries or total > max_bytes):
+        _, size, path = entries.pop(0)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        evicted += 1
+    return evicted
+
+
+def memoize(func=None, *, deps=(), ignore=(), memo_dir=MEMO_DIR, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+    """
+    Decorator: caches a function's return value on disk (see module docstring).
+
+    deps:   modules (or names) whose source is part of the key, for helpers the function calls
+    ignore: argument names left out of the key (they must not change the result)
+    """
+    if func is None:
+        return functools.partial(memoize, deps=deps, ignore=ignore, memo_dir=memo_dir,
+                                 max_entries=max_entries, max_bytes=max_bytes)
+
+    name = func.__qualname__
+    code_hash = _source_hash(func) + "".join(
+        _module_hash(dep if isinstance(dep, str) else dep.__name__) for dep in deps
+    )
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        counts = _stats.setdefault(name, Counter())
+        if os.environ.get("IPL_MEMO", "1") == "0":
+            counts["bypassed"] += 1
+            return func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = {k: v for k, v in bound.arguments.items() if k not in ignore}
+        key = fingerprint((name, code_hash, arguments))
+        path = os.path.join(memo_dir, f"{key}.pkl")
+
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    result = pickle.load(f)
+                os.utime(path)  # Mark as recently used
+                counts["hits"] += 1
+                return result
+            except (OSError, EOFError, pickle.UnpicklingError):
+                pass  # Corrupt or concurrently evicted entry: recompute
+
+        counts["misses"] += 1
+        result = func(*args, **kwargs)
+        os.makedirs(memo_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        counts["evictions"] += _evict(memo_dir, max_entries, max_bytes)
+        return result
+
+    return wrapper
+
+
+def memo_stats():
+    """Per-function hit/miss/eviction counters for this process, as a DataFrame."""
+    rows = [{"function": name, **{k: counts.get(k, 0) for k in ["hits", "misses", "evictions", "bypassed"]}}
+            for name, counts in _stats.items()]
+    return pd.DataFrame(rows, columns=["function", "hits", "misses", "evictions", "bypassed"])
+
+
+def clear_memo(memo_dir=MEMO_DIR):
+    """Deletes every stored result and resets the counters."""
+    for _, _, path in _entries(memo_dir):
+        os.remove(path)
+    _stats.clear()
@@ -0,0 +1,100 @@
+"""
+Memory-mapped store for the tables written by data_preparation.ipynb.
+
+Every analysis notebook used to re-parse MI_Fact_Deliveries.csv and
+MI_Dim_Matches.csv. load_prepared() instead converts each CSV once into an
+Arrow IPC file under .ipl_cache/prepared (refreshed when the CSV's mtime or
+size changes) and memory-maps it instead of parsing the text. Numeric
+columns without nulls are returned as zero-copy, read-only views of the
+mapped file, so concurrent notebook processes share those page-cached
+bytes; string and nullable columns are still converted into each process's
+own memory. Pass copy=True for a fully private, writable frame (in-place
+edits such as df.loc[i, "runs_batter"] = ... need it).
+
+Usage:
+    from ipl_prepared import load_prepared
+
+    df_fact = load_prepared("MI_Fact_Deliveries.csv")
+    df_edit = load_prepared("MI_Fact_Deliveries.csv", copy=True)
+"""
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:
+    pa = None
+
+from ipl_store import CACHE_DIR
+from ipl_trace import traced
+
+PREPARED_DIR = os.path.join(CACHE_DIR, "prepared")
+PREPARED_TABLES = ["MI_Fact_Deliveries.csv", "MI_Dim_Matches.csv"]
+
+
+def _paths(csv_path, store_dir):
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(store_dir, f"{stem}.arrow"), os.path.join(store_dir, f"{stem}.json")
+
+
+def _source_stamp(csv_path):
+    stat = os.stat(csv_path)  # FileNotFoundError propagates like pd.read_csv
+    return {"source": os.path.abspath(csv_path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+@traced(category="export", rows=None)
+def export_prepared(csv_path, store_dir=PREPARED_DIR):
+    """Parses one prepared CSV and writes it as an Arrow IPC file (atomically)."""
+    stamp = _source_stamp(csv_path)
+    df = pd.read_csv(csv_path, low_memory=False)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    arrow_path, meta_path = _paths(csv_path, store_dir)
+    os.makedirs(store_dir, exist_ok=True)
+    tmp_path = f"{arrow_path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, arrow_path)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({**stamp, "rows": table.num_rows}, f)
+    return arrow_path
+
+
+def is_fresh(csv_path, store_dir=PREPARED_DIR):
+    arrow_path, meta_path = _paths(csv_path, store_dir)
+    if not (os.path.exists(arrow_path) and os.path.exists(meta_path)):
+        return False
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    stamp = _source_stamp(csv_path)
+    return meta["mtime_ns"] == stamp["mtime_ns"] and meta["size"] == stamp["size"]
+
+
+@traced(category="load")
+def load_prepared(csv_path, store_dir=PREPARED_DIR, copy=False):
+    """Loads a prepared table through the memory-mapped store (plain CSV read without pyarrow)."""
+    if pa is None:
+        return pd.read_csv(csv_path, low_memory=False)
+    if not is_fresh(csv_path, store_dir):
+        export_prepared(csv_path, store_dir)
+    arrow_path, _ = _paths(csv_path, store_dir)
+    with pa.memory_map(arrow_path, "r") as source:
+        table = ipc.open_file(source).read_all()
+    if copy:
+        return table.to_pandas()
+    # One block per column: numeric columns without nulls stay views of the mapped pages
+    # (read-only, shared between processes); only the rest is converted into private memory
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def refresh_prepared(names=PREPARED_TABLES, store_dir=PREPARED_DIR):
+    """Re-exports every stale prepared table; returns the names that were rebuilt."""
+    rebuilt = []
+    for name in names:
+        if os.path.exists(name) and not is_fresh(name, store_dir):
+            export_prepared(name, store_dir)
+            rebuilt.append(name)
+    return rebuilt
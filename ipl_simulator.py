@@ -0,0 +1,473 @@
+"""
+Monte Carlo match and season simulator built on ball-outcome distributions.
+
+The champion report describes past title seasons; this module answers
+forward questions such as "which squad mix gives us the best title odds?".
+
+Ball model: every legal delivery ends in one of OUTCOMES (dot, 1, 2, 3, 4,
+6, wicket; wides / no-balls are "extra" and do not use up a ball, their
+runs drawn from the phase's observed 1 / 2 / 5 / ... run split). Outcome
+counts are materialized per (player, season, phase) for batters and bowlers
+and stored under .ipl_cache/simulator, rebuilt only when the dataset
+version changes. For a fit window of seasons each player's distribution is
+shrunk towards the league's for that phase (PRIOR_BALLS pseudo-deliveries),
+and a batter x bowler ball combines the two with the odds-ratio (log5) rule
+p ~ p_batter * p_bowler / p_league.
+
+Simulation: each team fields a batting order and a 20-over bowling plan
+(at most 4 overs per bowler, none in consecutive overs, specialists in
+their strongest phase). For every ordered pair of teams the outcome
+distribution of (batting slot, over) is precomputed, so one ball of
+thousands of simulated innings is a single gather + uniform draw over
+NumPy arrays; the Python loop runs over balls, never over simulations.
+A season simulates all its league fixtures for a block of simulations at
+once, ranks the table (points, then net runs), and plays the playoffs
+(Qualifier 1, Eliminator, Qualifier 2, Final); blocks run on a process pool.
+
+Squads default to each team's most-used players of the simulated season
+and can be overridden from a JSON file ({team: {"batters": [...],
+"bowlers": [...]}}) to compare squad mixes.
+
+Usage:
+    from ipl_simulator import load_outcome_model, season_odds
+
+    model = load_outcome_model()
+    odds = season_odds(model, 2024, sims=20_000)
+    odds[["team", "title_pct", "final_pct", "playoff_pct"]]
+
+    python ipl_simulator.py [--season 2024] [--sims 20000] [--workers 4] [--squads squads.json]
+    python ipl_simulator.py --match "Mumbai Indians" "Chennai Super Kings" [--sims 50000]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ipl_features import PHASE_SCHEMES, phase_from_over
+from ipl_matches import load_match_index
+from ipl_store import CACHE_DIR, CSV_PATH, ensure_cache, load_deliveries
+from ipl_trace import traced
+
+OUTCOMES = ["dot", "1", "2", "3", "4", "6", "wicket", "extra"]
+OUTCOME_RUNS = np.array([0, 1, 2, 3, 4, 6, 0, 0])  # extras: drawn from EXTRA_RUNS per phase
+WICKET, EXTRA = OUTCOMES.index("wicket"), OUTCOMES.index("extra")
+RUN_OUTCOME = np.array([0, 1, 2, 3, 4, 4, 5])  # runs 0..6 off a legal ball (5s counted as 4s)
+EXTRA_RUNS = 8  # runs 0..7 off a wide / no-ball (more is clipped to 7)
+PHASES = PHASE_SCHEMES["report"]["labels"]
+PHASE_OF_OVER = np.asarray(phase_from_over(np.arange(20)).cat.codes, dtype=np.int64)
+# Overs filled first when building a bowling plan: death, then powerplay, then middle
+PLAN_ORDER = sorted(range(20), key=lambda o: ((PHASE_OF_OVER[o] + 1) % len(PHASES), o))
+
+MODEL_FORMAT = 2  # bump when the stored arrays change shape
+PRIOR_BALLS = 60.0
+FIT_SEASONS = 3
+SQUAD_BATTERS = 11
+SQUAD_BOWLERS = 6
+SIMS = 10_000
+BLOCK_SIMS = 500
+SOURCE_COLS = ["season_year", "over", "batter", "bowler", "valid_ball", "runs_total", "wicket_kind"]
+SQUAD_COLS = ["season_year", "batting_team", "bowling_team", "batter", "bowler", "bat_pos", "balls_faced", "valid_ball"]
+
+
+# --- Outcome Model ---
+class OutcomeModel:
+    """Per-(player, season, phase) outcome counts with shrunk, phase-conditioned distributions."""
+
+    def __init__(self, batters, bowlers, seasons, bat_counts, bowl_counts, extra_runs, version=None):
+        self.batters = list(batters)
+        self.bowlers = list(bowlers)
+        self.seasons = [int(s) for s in seasons]
+        self.bat_counts = bat_counts    # [batter, season, phase, outcome]
+        self.bowl_counts = bowl_counts  # [bowler, season, phase, outcome]
+        self.extra_runs = extra_runs    # [season, phase, runs] wides / no-balls by runs conceded
+        self.version = version
+        self._batter_pos = {name: i for i, name in enumerate(self.batters)}
+        self._bowler_pos = {name: i for i, name in enumerate(self.bowlers)}
+
+    def _season_mask(self, seasons):
+        if seasons is None:
+            return np.ones(len(self.seasons), dtype=bool)
+        return np.isin(self.seasons, list(seasons))
+
+    def league(self, seasons=None):
+        """[phase, outcome] league-wide probabilities over the seasons."""
+        counts = self.bat_counts[:, self._season_mask(seasons)].sum(axis=(0, 1)).astype(float)
+        return counts / counts.sum(axis=1, keepdims=True)
+
+    def extra_runs_dist(self, seasons=None):
+        """[phase, runs] probabilities of the runs a wide / no-ball concedes."""
+        counts = self.extra_runs[self._season_mask(seasons)].sum(axis=0).astype(float)
+        counts[counts.sum(axis=1) == 0, 1] = 1  # a phase without extras: one run
+        return counts / counts.sum(axis=1, keepdims=True)
+
+    def distributions(self, names, role="batter", seasons=None, prior=PRIOR_BALLS):
+        """
+        [player, phase, outcome] probabilities, shrunk towards the league by
+        `prior` pseudo-deliveries. Unknown names (or None) get the league's.
+        """
+        counts, lookup = (self.bat_counts, self._batter_pos) if role == "batter" else (self.bowl_counts, self._bowler_pos)
+        mask = self._season_mask(seasons)
+        league = self.league(seasons)
+        rows = np.array([lookup.get(n, -1) if n is not None else -1 for n in names], dtype=np.int64)
+        own = np.where(rows[:, None, None] >= 0, counts[np.maximum(rows, 0)][:, mask].sum(axis=1), 0).astype(float)
+        return (own + prior * league) / (own.sum(axis=2, keepdims=True) + prior)
+
+    def phase_balls(self, bowlers, seasons=None):
+        """[bowler, phase] legal balls bowled in the window (for the bowling plan)."""
+        rows = np.array([self._bowler_pos.get(n, -1) if n is not None else -1 for n in bowlers], dtype=np.int64)
+        counts = self.bowl_counts[np.maximum(rows, 0)][:, self._season_mask(seasons)].sum(axis=1)
+        balls = counts.sum(axis=2) - counts[:, :, EXTRA]
+        return np.where(rows[:, None] >= 0, balls, 0)
+
+
+@traced(category="aggregate", rows=None)
+def fit_outcome_model(df, version=None):
+    """Counts every delivery's outcome per (batter / bowler, season, phase)."""
+    valid = df["valid_ball"].fillna(0).to_numpy() > 0
+    runs = df["runs_total"].fillna(0).to_numpy().astype(np.int64)
+    wicket = df["wicket_kind"].notna().to_numpy()
+    outcome = np.where(~valid, EXTRA, np.where(wicket, WICKET, RUN_OUTCOME[np.clip(runs, 0, 6)]))
+
+    seasons = np.sort(df["season_year"].unique())
+    season = np.searchsorted(seasons, df["season_year"].to_numpy())
+    phase = np.asarray(phase_from_over(df["over"]).cat.codes, dtype=np.int64)
+    cell = (season * len(PHASES) + phase) * len(OUTCOMES) + outcome
+    n_cells = len(seasons) * len(PHASES) * len(OUTCOMES)
+
+    def player_counts(names):
+        names = names.astype("category")
+        codes = names.cat.codes.to_numpy().astype(np.int64)
+        keep = codes >= 0
+        flat = np.bincount(codes[keep] * n_cells + cell[keep], minlength=len(names.cat.categories) * n_cells)
+        shape = (len(names.cat.categories), len(seasons), len(PHASES), len(OUTCOMES))
+        return names.cat.categories.astype(str), flat.reshape(shape).astype(np.int32)
+
+    batters, bat_counts = player_counts(df["batter"])
+    bowlers, bowl_counts = player_counts(df["bowler"])
+    extra_cell = (season * len(PHASES) + phase) * EXTRA_RUNS + np.clip(runs, 0, EXTRA_RUNS - 1)
+    extra_runs = np.bincount(
+        extra_cell[~valid], minlength=len(seasons) * len(PHASES) * EXTRA_RUNS
+    ).reshape(len(seasons), len(PHASES), EXTRA_RUNS)
+    return OutcomeModel(batters, bowlers, seasons, bat_counts, bowl_counts, extra_runs, version)
+
+
+def _model_paths(cache_dir):
+    model_dir = os.path.join(cache_dir, "simulator")
+    return model_dir, os.path.join(model_dir, "counts.npz"), os.path.join(model_dir, "manifest.json")
+
+
+def build_and_save(csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """Fits the outcome counts from the columnar cache and stores them next to it."""
+    version = ensure_cache(csv_path, cache_dir)["sha256"]
+    df = load_deliveries(columns=SOURCE_COLS, csv_path=csv_path, cache_dir=cache_dir)
+    model = fit_outcome_model(df, version)
+
+    model_dir, data_path, manifest_path = _model_paths(cache_dir)
+    os.makedirs(model_dir, exist_ok=True)
+    np.savez_compressed(data_path, bat=model.bat_counts, bowl=model.bowl_counts, extra_runs=model.extra_runs)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"sha256": version, "format": MODEL_FORMAT, "batters": model.batters, "bowlers": model.bowlers, "seasons": model.seasons}, f)
+    print(f"✓ Outcome model: {len(model.batters)} batters, {len(model.bowlers)} bowlers, {len(model.seasons)} seasons")
+    return model
+
+
+@traced(category="load", rows=None)
+def load_outcome_model(csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """Loads the outcome counts, refitting them if the dataset changed."""
+    version = ensure_cache(csv_path, cache_dir)["sha256"]
+    _, data_path, manifest_path = _model_paths(cache_dir)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("sha256") == version and manifest.get("format") == MODEL_FORMAT:
+            with np.load(data_path) as data:
+                return OutcomeModel(manifest["batters"], manifest["bowlers"], manifest["seasons"],
+                                    data["bat"], data["bowl"], data["extra_runs"], version)
+    return build_and_save(csv_path, cache_dir)
+
+
+# --- Squads ---
+def season_squads(season, csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """{team: {"batters": batting order, "bowlers": attack}} from the players each team used most in `season`."""
+    df = load_deliveries(columns=SQUAD_COLS, filters=[("season_year", "==", int(season))],
+                         csv_path=csv_path, cache_dir=cache_dir)
+    if df.empty:
+        raise ValueError(f"No deliveries for season {season}; pass squads for a hypothetical season.")
+    batting = (
+        df.groupby(["batting_team", "batter"], observed=True)
+        .agg(balls=("balls_faced", "sum"), bat_pos=("bat_pos", "median")).reset_index()
+    )
+    bowling = df.groupby(["bowling_team", "bowler"], observed=True)["valid_ball"].sum().reset_index()
+    squads = {}
+    for team, group in batting.groupby("batting_team", observed=True):
+        top = group.nlargest(SQUAD_BATTERS, "balls").sort_values(["bat_pos", "balls"], ascending=[True, False])
+        attack = bowling[bowling["bowling_team"] == team].nlargest(SQUAD_BOWLERS, "valid_ball")
+        squads[str(team)] = {"batters": top["batter"].astype(str).tolist(), "bowlers": attack["bowler"].astype(str).tolist()}
+    return squads
+
+
+def season_fixtures(season, teams, csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """League-stage (home, away) team indices of a season; a double round robin when it is not in the data."""
+    matches = load_match_index(csv_path, cache_dir).frame
+    league = matches[(matches["season_year"] == int(season)) & matches["stage"].isna()] \
+        if "stage" in matches.columns else matches[matches["season_year"] == int(season)]
+    pos = {team: i for i, team in enumerate(teams)}
+    pairs = [(pos.get(a), pos.get(b)) for a, b in zip(league["batting_first"], league["batting_second"])]
+    pairs = [p for p in pairs if None not in p]
+    if not pairs:
+        pairs = [(i, j) for i in range(len(teams)) for j in range(len(teams)) if i != j]
+    return np.array(pairs, dtype=np.int64)
+
+
+def bowling_plan(phase_balls):
+    """Over -> bowler slot: at most 4 overs each, no consecutive overs, specialists in their phase."""
+    n = len(phase_balls)
+    # Preference by share of balls in the phase; slot order breaks ties
+    share = phase_balls / np.maximum(phase_balls.sum(axis=1, keepdims=True), 1)
+    plan = np.full(20, -1, dtype=np.int64)
+    quota = np.full(n, 4)
+    for over in PLAN_ORDER:
+        neighbours = {plan[o] for o in (over - 1, over + 1) if 0 <= o < 20}
+        candidates = [b for b in range(n) if quota[b] > 0 and b not in neighbours] or \
+            [b for b in range(n) if quota[b] > 0]
+        pick = max(candidates, key=lambda b: (share[b, PHASE_OF_OVER[over]], phase_balls[b].sum(), -b))
+        plan[over] = pick
+        quota[pick] -= 1
+    return plan
+
+
+def _squad_arrays(model, squads, teams, seasons, prior):
+    """[team, slot, phase, outcome] batting and [team, over, outcome] bowling distributions."""
+    bat, bowl = [], []
+    for team in teams:
+        batters = list(squads[team]["batters"])[:SQUAD_BATTERS]
+        batters += [None] * (SQUAD_BATTERS - len(batters))  # league-average fill-ins
+        bowlers = list(squads[team]["bowlers"])
+        bowlers += [None] * max(0, 5 - len(bowlers))        # 20 overs need five bowlers
+        plan = bowling_plan(model.phase_balls(bowlers, seasons))
+        bat.append(model.distributions(batters, "batter", seasons, prior))
+        bowl.append(model.distributions(bowlers, "bowler", seasons, prior)[plan, PHASE_OF_OVER])
+    return np.stack(bat), np.stack(bowl)
+
+
+@traced(category="derive", rows=None)
+def matchup_tables(model, squads, teams, seasons=None, prior=PRIOR_BALLS):
+    """
+    Cumulative outcome probabilities [batting team, bowling team, batting slot,
+    over, outcome] for every ordered pair of teams, and cumulative probabilities
+    of the runs a wide / no-ball concedes per [over, runs].
+    """
+    bat, bowl = _squad_arrays(model, squads, teams, seasons, prior)
+    league = model.league(seasons)[PHASE_OF_OVER]                  # [over, outcome]
+    p = bat[:, None, :, PHASE_OF_OVER, :] * bowl[None, :, None] / league
+    p /= p.sum(axis=-1, keepdims=True)
+    cum = np.cumsum(p, axis=-1)
+    cum[..., -1] = 1.0
+    extras = np.cumsum(model.extra_runs_dist(seasons)[PHASE_OF_OVER], axis=-1)
+    extras[..., -1] = 1.0
+    return cum.astype(np.float32), extras
+
+
+# --- Simulation (vectorized over simulations) ---
+def simulate_innings(rng, cum, extras, bat, bowl, target=None):
+    """
+    Plays one innings for every entry of `bat` / `bowl` (team indices) at once.
+    Returns (runs, legal balls, wickets); a chase stops once it passes `target`.
+    """
+    k = len(bat)
+    score = np.zeros(k, dtype=np.int64)
+    balls = np.zeros(k, dtype=np.int64)
+    wickets = np.zeros(k, dtype=np.int64)
+    striker = np.zeros(k, dtype=np.int64)
+    non_striker = np.ones(k, dtype=np.int64)
+    live = np.arange(k)
+    while live.size:
+        over = balls[live] // 6
+        probs = cum[bat[live], bowl[live], striker[live], over]
+        outcome = (rng.random(live.size)[:, None] > probs).sum(axis=1)
+        legal = outcome != EXTRA
+        scored = OUTCOME_RUNS[outcome]
+        wides = np.flatnonzero(~legal)
+        scored[wides] = (rng.random(wides.size)[:, None] > extras[over[wides]]).sum(axis=1)
+        score[live] += scored
+        balls[live] += legal
+
+        out = live[outcome == WICKET]
+        wickets[out] += 1
+        striker[out] = np.minimum(wickets[out] + 1, SQUAD_BATTERS - 1)  # next batter in
+        # Ends change on odd runs and at the end of an over (both: they cancel out)
+        odd = legal & (scored % 2 == 1)
+        swap = live[odd ^ (legal & (balls[live] % 6 == 0))]
+        striker[swap], non_striker[swap] = non_striker[swap], striker[swap].copy()
+
+        done = (balls[live] >= 120) | (wickets[live] >= 10)
+        if target is not None:
+            done |= score[live] > target[live]
+        live = live[~done]
+    return score, balls, wickets
+
+
+def simulate_matches(rng, cum, extras, home, away):
+    """Winner index and net runs for the side batting first, for arrays of fixtures (toss is a coin flip)."""
+    toss = rng.random(len(home)) < 0.5
+    first, second = np.where(toss, home, away), np.where(toss, away, home)
+    first_runs, _, _ = simulate_innings(rng, cum, extras, first, second)
+    second_runs, _, _ = simulate_innings(rng, cum, extras, second, first, target=first_runs)
+    tie = first_runs == second_runs
+    first_wins = (first_runs > second_runs) | (tie & (rng.random(len(home)) < 0.5))  # super over as a coin flip
+    return np.where(first_wins, first, second), first, second, first_runs - second_runs
+
+
+def _season_block(cum, extras, fixtures, n_teams, sims, seed):
+    """Simulates `sims` seasons; returns per-team title / final / playoff counts and total points."""
+    rng = np.random.default_rng(seed)
+    sim = np.repeat(np.arange(sims), len(fixtures))
+    home = np.tile(fixtures[:, 0], sims)
+    away = np.tile(fixtures[:, 1], sims)
+    winner, first, second, net = simulate_matches(rng, cum, extras, home, away)
+
+    points = np.zeros((sims, n_teams))
+    net_runs = np.zeros((sims, n_teams))
+    np.add.at(points, (sim, winner), 2)
+    np.add.at(net_runs, (sim, first), net)
+    np.add.at(net_runs, (sim, second), -net)
+    # Points, then net runs, then a random draw
+    ranking = np.argsort(-(points * 1e6 + net_runs + rng.random(points.shape)), axis=1)
+    top = ranking[:, :4]
+
+    def playoff(a, b):
+        won = simulate_matches(rng, cum, extras, a, b)[0]
+        return won, np.where(won == a, b, a)
+
+    q1_winner, q1_loser = playoff(top[:, 0], top[:, 1])
+    eliminator_winner, _ = playoff(top[:, 2], top[:, 3])
+    q2_winner, _ = playoff(q1_loser, eliminator_winner)
+    champion, runner_up = playoff(q1_winner, q2_winner)
+
+    count = lambda teams: np.bincount(teams.ravel(), minlength=n_teams)
+    return {
+        "titles": count(champion), "finals": count(champion) + count(runner_up),
+        "playoffs": count(top), "points": points.sum(axis=0),
+    }
+
+
+@traced(category="aggregate", rows=None)
+def simulate_season(cum, extras, fixtures, teams, sims=SIMS, workers=None, seed=0, block_sims=BLOCK_SIMS):
+    """Title / final / playoff probabilities per team over `sims` seasons (blocks spread over a process pool)."""
+    blocks = [min(block_sims, sims - start) for start in range(0, sims, block_sims)]
+    args = [(cum, extras, fixtures, len(teams), size, [seed, i]) for i, size in enumerate(blocks)]
+    if workers == 1 or len(blocks) == 1:
+        results = [_season_block(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_season_block, *zip(*args)))
+    totals = {key: sum(r[key] for r in results) for key in results[0]}
+    odds = pd.DataFrame({
+        "team": teams,
+        "title_pct": totals["titles"] * 100 / sims,
+        "final_pct": totals["finals"] * 100 / sims,
+        "playoff_pct": totals["playoffs"] * 100 / sims,
+        "mean_points": totals["points"] / sims,
+    })
+    return odds.sort_values(["title_pct", "playoff_pct"], ascending=False).reset_index(drop=True)
+
+
+def fit_window(model, season, fit_seasons=FIT_SEASONS):
+    """
+    The `fit_seasons` seasons before `season` (the latest ones for a future
+    season), so back-tested odds never see the results they predict. Only the
+    first season in the data, with nothing before it, is fitted on itself.
+    """
+    earlier = [s for s in model.seasons if s < int(season)]
+    return earlier[-fit_seasons:] if earlier else [int(season)]
+
+
+def season_odds(model, season, squads=None, sims=SIMS, workers=None, seed=0, fit_seasons=FIT_SEASONS,
+                csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """
+    Title odds for `season`: squads from that season's data (overridden per
+    team by `squads`), its league fixtures, and a model fitted on the
+    preceding `fit_seasons` seasons.
+    """
+    squads = {**(season_squads(season, csv_path, cache_dir) if int(season) in model.seasons else {}), **(squads or {})}
+    teams = sorted(squads)
+    fixtures = season_fixtures(season, teams, csv_path, cache_dir)
+    cum, extras = matchup_tables(model, squads, teams, fit_window(model, season, fit_seasons))
+    return simulate_season(cum, extras, fixtures, teams, sims, workers, seed)
+
+
+def match_odds(model, team_a, team_b, squads, seasons=None, sims=SIMS, seed=0):
+    """Win probability and score distribution for one fixture (toss is a coin flip)."""
+    teams = [team_a, team_b]
+    cum, extras = matchup_tables(model, squads, teams, seasons)
+    rng = np.random.default_rng(seed)
+    home, away = np.zeros(sims, dtype=np.int64), np.ones(sims, dtype=np.int64)
+    toss = rng.random(sims) < 0.5
+    first, second = np.where(toss, home, away), np.where(toss, away, home)
+    first_runs, _, _ = simulate_innings(rng, cum, extras, first, second)
+    second_runs, _, _ = simulate_innings(rng, cum, extras, second, first, target=first_runs)
+    tie = first_runs == second_runs
+    winner = np.where((first_runs > second_runs) | (tie & (rng.random(sims) < 0.5)), first, second)
+    return pd.DataFrame({
+        "team": teams,
+        "win_pct": [np.mean(winner == t) * 100 for t in (0, 1)],
+        "first_innings_mean": [first_runs[first == t].mean() for t in (0, 1)],
+        "first_innings_p10": [np.percentile(first_runs[first == t], 10) for t in (0, 1)],
+        "first_innings_p90": [np.percentile(first_runs[first == t], 90) for t in (0, 1)],
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--season", type=int, default=None, help="season_year to simulate (default: latest)")
+    parser.add_argument("--sims", type=int, default=SIMS)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--fit-seasons", type=int, default=FIT_SEASONS, help="seasons before --season the distributions are fitted on")
+    parser.add_argument("--squads", default=None, help='JSON {team: {"batters": [...], "bowlers": [...]}} overrides')
+    parser.add_argument("--match", nargs=2, metavar=("TEAM_A", "TEAM_B"), help="simulate one fixture instead")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.csv):
+        print(f"❌ Error: {args.csv} not found.")
+        return 1
+    start = time.perf_counter()
+    model = load_outcome_model(csv_path=args.csv)
+    season = args.season or model.seasons[-1]
+    overrides = {}
+    if args.squads:
+        with open(args.squads, encoding="utf-8") as f:
+            overrides = json.load(f)
+    squads = season_squads(season, csv_path=args.csv) if season in model.seasons else {}
+    for team, squad in overrides.items():
+        squads[team] = {**squads.get(team, {"batters": [], "bowlers": []}), **squad}
+    print(f"Model ready in {time.perf_counter() - start:.2f}s (fit window {fit_window(model, season, args.fit_seasons)})")
+
+    t = time.perf_counter()
+    if args.match:
+        missing = [team for team in args.match if team not in squads]
+        if missing:
+            print(f"❌ Error: no squad for {', '.join(missing)} in {season}; add it with --squads.")
+            return 1
+        result = match_odds(model, *args.match, squads, fit_window(model, season, args.fit_seasons), args.sims, args.seed)
+        title = f"🏏 {args.match[0]} vs {args.match[1]} ({args.sims:,} simulations)"
+    else:
+        result = season_odds(model, season, squads, args.sims, args.workers, args.seed, args.fit_seasons, args.csv)
+        title = f"🏆 Season {season} title odds ({args.sims:,} simulated seasons)"
+    seconds = time.perf_counter() - t
+
+    print(f"\n{title}")
+    with pd.option_context("display.float_format", "{:.1f}".format, "display.width", 160):
+        print(result.to_string(index=False))
+    print(f"\n⏱ Simulated in {seconds:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
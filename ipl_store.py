@@ -0,0 +1,226 @@
+"""
+Columnar cache for the IPL ball-by-ball dataset.
+
+IPL.csv is parsed once and written to a Parquet dataset (partitioned by
+season_year, row groups sorted by match_id) with an explicit, compact schema:
+team/player/venue strings become dictionary-encoded categoricals and small
+integers are stored as int8/int16. The cache is keyed on the CSV's mtime and
+SHA-256 hash, so it is rebuilt only when the data actually changes.
+
+Usage:
+    from ipl_store import load_deliveries
+
+    df = load_deliveries(
+        columns=["match_id", "season_year", "batter", "runs_batter"],
+        filters=[("batting_team", "==", "Mumbai Indians")],
+    )
+"""
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from ipl_features import season_year_from
+from ipl_trace import traced
+
+CSV_PATH = "IPL.csv"
+CACHE_DIR = ".ipl_cache"
+SCHEMA_VERSION = 1
+ROW_GROUP_SIZE = 64_000
+
+# --- Explicit Schema ---
+# Low-cardinality strings: teams, players, venues and match metadata
+CATEGORY_COLS = [
+    "match_type", "event_name", "batting_team", "bowling_team", "batter",
+    "bowler", "non_striker", "extra_type", "wicket_kind", "player_out",
+    "fielders", "review_batter", "team_reviewed", "review_decision",
+    "umpire", "player_of_match", "match_won_by", "win_outcome",
+    "toss_winner", "toss_decision", "venue", "city", "season", "gender",
+    "team_type", "superover_winner", "result_type", "method", "stage",
+    "new_batter", "batting_partners", "next_batter", "date",
+]
+INT8_COLS = [
+    "innings", "over", "ball", "bat_pos", "runs_batter", "balls_faced",
+    "valid_ball", "runs_extras", "runs_total", "runs_bowler",
+    "non_striker_pos", "day", "month", "balls_per_over", "overs",
+    "team_wicket", "bowler_wicket",
+]
+INT16_COLS = [
+    "runs_target", "year", "event_match_no", "match_number", "team_runs",
+    "team_balls", "batter_runs", "batter_balls", "season_year",
+]
+
+
+def apply_schema(df):
+    """Casts the raw CSV frame to the compact cache schema (in place)."""
+    df["season_year"] = season_year_from(df["season"])
+    for col in CATEGORY_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype(str).where(df[col].notna()).astype("category")
+    for col_list, dtype in [(INT8_COLS, "int8"), (INT16_COLS, "int16")]:
+        for col in col_list:
+            if col not in df.columns:
+                continue
+            values = pd.to_numeric(df[col], errors="coerce")
+            # Nullable ints for columns with gaps (e.g. runs_target in innings 1)
+            df[col] = values.astype(dtype if values.notna().all() else dtype.capitalize())
+    return df
+
+
+def _file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_manifest(cache_dir):
+    path = os.path.join(cache_dir, "manifest.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_manifest(cache_dir, manifest):
+    with open(os.path.join(cache_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+
+@traced(category="load", rows=lambda m: m["rows"])
+def build_cache(csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """Parses the CSV once and writes the partitioned Parquet dataset."""
+    if pa is None:
+        raise ImportError("pyarrow is required to build the columnar cache.")
+
+    print(f"Building columnar cache from {csv_path}...")
+    stat = os.stat(csv_path)
+    df = pd.read_csv(csv_path, low_memory=False)
+    df = apply_schema(df)
+    # Stable sort keeps ball order within a match and gives tight match_id row-group stats
+    df = df.sort_values(["season_year", "match_id"], kind="stable").reset_index(drop=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    tmp_dir = os.path.join(cache_dir, "deliveries.tmp")
+    data_dir = os.path.join(cache_dir, "deliveries")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(cache_dir, exist_ok=True)
+    ds.write_dataset(
+        table,
+        tmp_dir,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([("season_year", pa.int16())]), flavor="hive"),
+        max_rows_per_group=ROW_GROUP_SIZE,
+        min_rows_per_group=ROW_GROUP_SIZE // 4,
+    )
+    shutil.rmtree(data_dir, ignore_errors=True)
+    os.replace(tmp_dir, data_dir)
+
+    manifest = {
+        "schema_version": SCHEMA_VERSION,
+        "source": os.path.abspath(csv_path),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": _file_sha256(csv_path),
+        "rows": len(df),
+        "columns": list(df.columns),
+    }
+    _write_manifest(cache_dir, manifest)
+    print(f"✓ Cached {len(df)} rows to {data_dir}")
+    return manifest
+
+
+def ensure_cache(csv_path=CSV_PATH, cache_dir=CACHE_DIR, force=False):
+    """
+    Returns the cache manifest, rebuilding the cache if the CSV changed.
+
+    A matching mtime and size is trusted as-is; otherwise the file is hashed so
+    that a touched-but-identical CSV does not trigger a rebuild.
+    """
+    manifest = _read_manifest(cache_dir)
+    if not os.path.exists(csv_path):
+        if manifest is None:
+            raise FileNotFoundError(f"{csv_path} not found and no cache at {cache_dir}.")
+        print(f"⚠️ {csv_path} not found, using cached dataset.")
+        return manifest
+
+    if force or manifest is None or manifest.get("schema_version") != SCHEMA_VERSION:
+        return build_cache(csv_path, cache_dir)
+
+    stat = os.stat(csv_path)
+    if stat.st_mtime_ns == manifest["mtime_ns"] and stat.st_size == manifest["size"]:
+        return manifest
+    if stat.st_size == manifest["size"] and _file_sha256(csv_path) == manifest["sha256"]:
+        manifest["mtime_ns"] = stat.st_mtime_ns
+        _write_manifest(cache_dir, manifest)
+        return manifest
+    return build_cache(csv_path, cache_dir)
+
+
+def dataset_version(csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """Content hash of the dataset currently served by the cache."""
+    return ensure_cache(csv_path, cache_dir)["sha256"]
+
+
+def _filter_pandas(df, filters):
+    """Applies pyarrow-style DNF filters to a DataFrame (no-pyarrow fallback)."""
+    ops = {
+        "==": lambda s, v: s == v, "!=": lambda s, v: s != v,
+        "<": lambda s, v: s < v, "<=": lambda s, v: s <= v,
+        ">": lambda s, v: s > v, ">=": lambda s, v: s >= v,
+        "in": lambda s, v: s.isin(v), "not in": lambda s, v: ~s.isin(v),
+    }
+    clauses = filters if isinstance(filters[0], list) else [filters]
+    mask = np.zeros(len(df), dtype=bool)
+    for clause in clauses:
+        clause_mask = np.ones(len(df), dtype=bool)
+        for col, op, value in clause:
+            clause_mask &= ops[op](df[col], value).to_numpy()
+        mask |= clause_mask
+    return df[mask].reset_index(drop=True)
+
+
+@traced(category="load")
+def load_deliveries(columns=None, filters=None, csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """
+    Loads ball-by-ball deliveries from the columnar cache.
+
+    columns: list of columns to read (None reads all, including season_year).
+    filters: pyarrow DNF filters, e.g. [("bowling_team", "==", "Mumbai Indians")]
+             or [[("batting_team", "==", t)], [("bowling_team", "==", t)]] for OR.
+             Filters on season_year prune whole partitions; match_id filters
+             skip row groups via Parquet statistics.
+    """
+    if pa is None:
+        # Fallback: plain CSV parse, projected and filtered in pandas
+        # Filter columns are read too and projected away again after filtering
+        usecols = None
+        if columns is not None:
+            clauses = (filters if isinstance(filters[0], list) else [filters]) if filters else []
+            usecols = set(columns) | {col for clause in clauses for col, _, _ in clause}
+            usecols = (usecols - {"season_year"}) | {"season"}
+        df = pd.read_csv(csv_path, usecols=lambda c: usecols is None or c in usecols, low_memory=False)
+        df["season_year"] = season_year_from(df["season"])
+        if filters:
+            df = _filter_pandas(df, filters)
+        return df if columns is None else df[columns]
+
+    ensure_cache(csv_path, cache_dir)
+    dataset = ds.dataset(os.path.join(cache_dir, "deliveries"), format="parquet", partitioning="hive")
+    expression = pq.filters_to_expression(filters) if filters else None
+    table = dataset.to_table(columns=columns, filter=expression)
+    df = table.unify_dictionaries().to_pandas()
+    if "season_year" in df.columns:
+        df["season_year"] = df["season_year"].astype("int16")
+    return df
@@ -0,0 +1,398 @@
+"""
+Synthetic IPL.csv generator for scale testing.
+
+Writes ball-by-ball deliveries with the IPL.csv schema at a multiple of the
+real volume (1x is the real league: 17 seasons, ~1,100 matches, ~270k
+deliveries). Scaling multiplies the league-stage matches of every season, so
+each team (Mumbai Indians included) and every per-team analysis grows with
+the data. Each season keeps its real teams, home venues and title winner
+(the Final is always won by the actual champion), so title_seasons() and the
+champion reports behave as on the real file.
+
+Innings are simulated ball by ball, vectorized over a block of matches:
+phase-dependent run and wicket probabilities, wides / no-balls (re-bowled,
+not counted as legal balls), byes / leg-byes, strike rotation on odd runs and
+at the end of each over, a new batter per wicket, five bowlers rotating so
+nobody bowls consecutive overs or more than four, innings ending at 10
+wickets, 20 overs or a successful chase. Running totals (team_runs,
+batter_runs, ...) are derived from the simulated balls. Blocks are appended
+to the CSV one at a time, so memory stays bounded at any scale.
+
+Usage:
+    from ipl_synth import generate
+
+    generate("bench_data/10x/IPL.csv", scale=10)
+
+    python ipl_synth.py --scale 100 --out bench_data/100x/IPL.csv [--seed 0]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+GENERATOR_VERSION = 1
+BLOCK_MATCHES = 500
+FIRST_MATCH_ID = 335982
+
+COLUMNS = [
+    "match_id", "date", "match_type", "event_name", "innings", "batting_team", "bowling_team", "over", "ball",
+    "ball_no", "batter", "bat_pos", "runs_batter", "balls_faced", "bowler", "valid_ball", "runs_extras",
+    "runs_total", "runs_bowler", "runs_not_boundary", "extra_type", "non_striker", "non_striker_pos",
+    "wicket_kind", "player_out", "fielders", "runs_target", "review_batter", "team_reviewed", "review_decision",
+    "umpire", "umpires_call", "player_of_match", "match_won_by", "win_outcome", "toss_winner", "toss_decision",
+    "venue", "city", "day", "month", "year", "season", "gender", "team_type", "superover_winner", "result_type",
+    "method", "balls_per_over", "overs", "event_match_no", "stage", "match_number", "team_runs", "team_balls",
+    "team_wicket", "new_batter", "batter_runs", "batter_balls", "bowler_wicket", "batting_partners",
+    "next_batter", "striker_out",
+]
+
+# --- League structure (real seasons) ---
+MI, CSK, KKR, RR = "Mumbai Indians", "Chennai Super Kings", "Kolkata Knight Riders", "Rajasthan Royals"
+RCB, DD, KXIP, DC = "Royal Challengers Bangalore", "Delhi Daredevils", "Kings XI Punjab", "Deccan Chargers"
+SRH, GT, LSG = "Sunrisers Hyderabad", "Gujarat Titans", "Lucknow Super Giants"
+BASE8 = [MI, CSK, KKR, RCB, RR, DD, KXIP, DC]
+# season label -> (year, league matches incl. playoffs at 1x, teams, champion)
+SEASONS = {
+    "2007/08": (2008, 58, BASE8, RR),
+    "2009": (2009, 57, BASE8, DC),
+    "2009/10": (2010, 60, BASE8, CSK),
+    "2011": (2011, 73, BASE8 + ["Kochi Tuskers Kerala", "Pune Warriors"], CSK),
+    "2012": (2012, 74, BASE8 + ["Pune Warriors"], KKR),
+    "2013": (2013, 76, [MI, CSK, KKR, RCB, RR, DD, KXIP, SRH, "Pune Warriors"], MI),
+    "2014": (2014, 60, [MI, CSK, KKR, RCB, RR, DD, KXIP, SRH], KKR),
+    "2015": (2015, 59, [MI, CSK, KKR, RCB, RR, DD, KXIP, SRH], MI),
+    "2016": (2016, 60, [MI, KKR, RCB, DD, KXIP, SRH, "Gujarat Lions", "Rising Pune Supergiants"], SRH),
+    "2017": (2017, 59, [MI, KKR, RCB, DD, KXIP, SRH, "Gujarat Lions", "Rising Pune Supergiant"], MI),
+    "2018": (2018, 60, [MI, CSK, KKR, RCB, RR, DD, KXIP, SRH], CSK),
+    "2019": (2019, 60, [MI, CSK, KKR, RCB, RR, "Delhi Capitals", KXIP, SRH], MI),
+    "2020/21": (2020, 60, [MI, CSK, KKR, RCB, RR, "Delhi Capitals", KXIP, SRH], MI),
+    "2021": (2021, 60, [MI, CSK, KKR, RCB, RR, "Delhi Capitals", "Punjab Kings", SRH], CSK),
+    "2022": (2022, 74, [MI, CSK, KKR, RCB, RR, "Delhi Capitals", "Punjab Kings", SRH, GT, LSG], GT),
+    "2023": (2023, 74, [MI, CSK, KKR, RCB, RR, "Delhi Capitals", "Punjab Kings", SRH, GT, LSG], CSK),
+    "2024": (2024, 71, [MI, CSK, KKR, "Royal Challengers Bengaluru", RR, "Delhi Capitals", "Punjab Kings", SRH, GT,
+                        LSG], KKR),
+}
+PLAYOFFS = {2008: ["Semi Final", "Semi Final", "Final"], 2009: ["Semi Final", "Semi Final", "Final"],
+            2010: ["Semi Final", "Semi Final", "3rd Place Play-Off", "Final"]}
+PLAYOFF_STAGES = ["Qualifier 1", "Elimination Final", "Qualifier 2", "Final"]
+
+HOME = {
+    MI: ("Wankhede Stadium, Mumbai", "Mumbai"),
+    CSK: ("MA Chidambaram Stadium, Chepauk, Chennai", "Chennai"),
+    KKR: ("Eden Gardens, Kolkata", "Kolkata"),
+    RCB: ("M Chinnaswamy Stadium, Bengaluru", "Bangalore"),
+    "Royal Challengers Bengaluru": ("M Chinnaswamy Stadium, Bengaluru", "Bangalore"),
+    RR: ("Sawai Mansingh Stadium, Jaipur", "Jaipur"),
+    DD: ("Arun Jaitley Stadium, Delhi", "Delhi"),
+    "Delhi Capitals": ("Arun Jaitley Stadium, Delhi", "Delhi"),
+    KXIP: ("Punjab Cricket Association IS Bindra Stadium, Mohali", "Chandigarh"),
+    "Punjab Kings": ("Punjab Cricket Association IS Bindra Stadium, Mohali", "Chandigarh"),
+    DC: ("Rajiv Gandhi International Stadium, Uppal, Hyderabad", "Hyderabad"),
+    SRH: ("Rajiv Gandhi International Stadium, Uppal, Hyderabad", "Hyderabad"),
+    "Kochi Tuskers Kerala": ("Nehru Stadium", "Kochi"),
+    "Pune Warriors": ("Subrata Roy Sahara Stadium", "Pune"),
+    "Gujarat Lions": ("Saurashtra Cricket Association Stadium", "Rajkot"),
+    "Rising Pune Supergiants": ("Maharashtra Cricket Association Stadium, Pune", "Pune"),
+    "Rising Pune Supergiant": ("Maharashtra Cricket Association Stadium, Pune", "Pune"),
+    GT: ("Narendra Modi Stadium, Ahmedabad", "Ahmedabad"),
+    LSG: ("Bharat Ratna Shri Atal Bihari Vajpayee Ekana Cricket Stadium, Lucknow", "Lucknow"),
+}
+# Well-known names kept in every Mumbai Indians squad (the notebooks look them up)
+MI_BATTERS = ["RG Sharma", "Q de Kock", "SK Yadav", "Ishan Kishan", "KA Pollard", "HH Pandya", "AT Rayudu", "KH Pandya"]
+MI_BOWLERS = ["JJ Bumrah", "SL Malinga", "TA Boult", "RD Chahar", "Harbhajan Singh", "MJ McClenaghan", "PP Chawla"]
+SURNAMES = [
+    "Sharma", "Singh", "Kumar", "Patel", "Yadav", "Khan", "Iyer", "Rahane", "Pandey", "Gill", "Jadeja", "Chahal",
+    "Nair", "Rao", "Mishra", "Ahmed", "Thakur", "Saha", "Tiwary", "Dube", "Shankar", "Agarwal", "Karthik",
+    "Samson", "Rana", "Tewatia", "Bishnoi", "Arshdeep", "Natarajan", "Siraj", "Warner", "Smith", "Morris",
+    "Russell", "Narine", "Gayle", "Bravo", "Rabada", "Nortje", "Ferguson", "Williamson", "Maxwell", "Stokes",
+    "Buttler", "Archer", "Rashid", "Nabi", "Hetmyer", "Pooran", "Hasaranga",
+]
+SQUAD_BATTERS, SQUAD_BOWLERS = 8, 7
+XI_BATTERS, XI_BOWLERS = 6, 5
+
+# --- Ball model ---
+# Extras: none, wide, no-ball, leg-bye, bye
+EXTRA_TYPES = np.array([None, "wides", "noballs", "legbyes", "byes"], dtype=object)
+EXTRA_CUM = np.cumsum([0.946, 0.032, 0.004, 0.014, 0.004])
+# Runs off the bat per phase (Powerplay 0-5, Middle 6-14, Death 15-19)
+RUN_VALUES = np.array([0, 1, 2, 3, 4, 6])
+RUN_CUM = np.cumsum([
+    [0.47, 0.27, 0.06, 0.005, 0.15, 0.045],
+    [0.35, 0.41, 0.08, 0.005, 0.10, 0.055],
+    [0.30, 0.35, 0.09, 0.005, 0.15, 0.105],
+], axis=1)
+WICKET_P = np.array([0.045, 0.05, 0.085])
+WICKET_KINDS = np.array(["caught", "bowled", "lbw", "run out", "stumped", "caught and bowled"], dtype=object)
+WICKET_CUM = np.cumsum([0.62, 0.16, 0.09, 0.08, 0.03, 0.02])
+FIELDED = {"caught", "run out", "stumped"}
+BYE_RUNS = np.array([1, 1, 1, 2, 4])
+
+
+def _squads(rng, season_index, teams, pools):
+    """{team: (batters, bowlers)} for one season; each pool turns over two names a season."""
+    squads = {}
+    for team in teams:
+        if team not in pools:
+            names = [n for n in pools["_names"] if n not in pools["_used"]]
+            pick = rng.choice(len(names), 40, replace=False)
+            chosen = [names[i] for i in pick]
+            pools["_used"].update(chosen)
+            pools[team] = (chosen[:24], chosen[24:])
+        batters, bowlers = pools[team]
+        bat = list(np.roll(batters, -2 * season_index)[:SQUAD_BATTERS])
+        bowl = list(np.roll(bowlers, -season_index)[:SQUAD_BOWLERS])
+        if team == MI:
+            bat, bowl = MI_BATTERS, MI_BOWLERS
+        squads[team] = (bat, bowl)
+    return squads
+
+
+def _name_pool(rng):
+    initials = [a + b for a in "ABCDJKMNPRST" for b in "ABCDHKMRS"]
+    names = {f"{rng.choice(initials)} {s}" for s in SURNAMES for _ in range(40)}
+    names -= set(MI_BATTERS + MI_BOWLERS)
+    return sorted(names)
+
+
+def simulate_innings(rng, n, target=None):
+    """
+    Simulates n innings in lock-step; returns (per-ball arrays, totals, wickets).
+
+    Arrays are in step order: `pos` is the innings (0..n-1), `striker` /
+    `non_striker` are batting positions 0-10 and `over` picks the bowler.
+    """
+    runs = np.zeros(n, np.int64)
+    wickets = np.zeros(n, np.int64)
+    legal = np.zeros(n, np.int64)
+    ball = np.zeros(n, np.int64)
+    striker = np.zeros(n, np.int64)
+    non_striker = np.ones(n, np.int64)
+    next_in = np.full(n, 2, np.int64)
+    active = np.ones(n, bool)
+    steps = []
+    while active.any():
+        idx = np.flatnonzero(active)
+        k = len(idx)
+        over = legal[idx] // 6
+        phase = np.searchsorted([6, 15], over, side="right")
+        extra = np.searchsorted(EXTRA_CUM, rng.random(k) * EXTRA_CUM[-1], side="right")
+        runs_batter = RUN_VALUES[(rng.random(k)[:, None] > RUN_CUM[phase]).sum(axis=1)]
+        runs_batter[(extra == 1) | (extra >= 3)] = 0
+        runs_extras = np.zeros(k, np.int64)
+        runs_extras[extra == 1] = np.where(rng.random((extra == 1).sum()) < 0.02, 5, 1)
+        runs_extras[extra == 2] = 1
+        byes = extra >= 3
+        runs_extras[byes] = BYE_RUNS[rng.integers(0, len(BYE_RUNS), byes.sum())]
+        wicket = (extra == 0) & (rng.random(k) < WICKET_P[phase])
+        runs_batter[wicket] = 0
+        kind = np.where(wicket, np.searchsorted(WICKET_CUM, rng.random(k) * WICKET_CUM[-1], side="right"), -1)
+        valid = (extra != 1) & (extra != 2)
+        ball_in_over = ball[idx] + 1
+
+        s, ns = striker[idx], non_striker[idx]
+        steps.append({
+            "pos": idx, "over": over, "ball": ball_in_over, "striker": s, "non_striker": ns,
+            "runs_batter": runs_batter, "runs_extras": runs_extras, "extra": extra, "wicket_kind": kind,
+            "next_in": np.where(wicket & (next_in[idx] <= 10), next_in[idx], -1),
+        })
+
+        runs[idx] += runs_batter + runs_extras
+        wickets[idx] += wicket
+        # Runs taken by running decide who faces next (boundaries and the wide itself don't count)
+        ran = np.where(extra == 1, runs_extras - 1, np.where(byes, runs_extras, runs_batter))
+        s = np.where(wicket, next_in[idx], s)
+        next_in[idx] += wicket
+        swap = ran % 2 == 1
+        s, ns = np.where(swap, ns, s), np.where(swap, s, ns)
+        legal[idx] += valid
+        over_done = valid & (legal[idx] % 6 == 0)
+        s, ns = np.where(over_done, ns, s), np.where(over_done, s, ns)
+        striker[idx], non_striker[idx] = s, ns
+        ball[idx] = np.where(over_done, 0, ball_in_over)
+
+        done = (wickets[idx] >= 10) | (legal[idx] >= 120)
+        if target is not None:
+            done |= runs[idx] >= target[idx]
+        active[idx] = ~done
+    arrays = {key: np.concatenate([s[key] for s in steps]) for key in steps[0]}
+    arrays["step"] = np.concatenate([np.full(len(s["pos"]), i) for i, s in enumerate(steps)])
+    return arrays, runs, wickets
+
+
+def _schedule(rng, season, scale, match_id):
+    """Match-level attributes for one season (league stage x scale, then the playoffs)."""
+    year, matches, teams, champion = SEASONS[season]
+    stages = PLAYOFFS.get(year, PLAYOFF_STAGES)
+    league = (matches - len(stages)) * scale
+    rows = []
+    for i in range(league + len(stages)):
+        stage = None if i < league else stages[i - league]
+        if stage == "Final":
+            other = rng.choice([t for t in teams if t != champion])
+            home, away = champion, other
+        else:
+            a, b = rng.choice(len(teams), 2, replace=False)
+            home, away = teams[a], teams[b]
+        venue, city = HOME[home] if stage is None else HOME[teams[rng.integers(len(teams))]]
+        date = pd.Timestamp(year, 3, 25) + pd.Timedelta(days=int(i * 60 / (league + len(stages))))
+        rows.append({
+            "match_id": match_id + i, "season": season, "year": year, "stage": stage, "champion": champion,
+            "home": home, "away": away, "venue": venue, "city": city, "date": date,
+            "event_match_no": i + 1, "field_p": 0.35 if year < 2015 else 0.7,
+        })
+    return rows
+
+
+def _xi(rng, team, squads):
+    batters, bowlers = squads[team]
+    bat = [batters[i] for i in sorted(rng.choice(len(batters), XI_BATTERS, replace=False))]
+    bowl = [bowlers[i] for i in sorted(rng.choice(len(bowlers), XI_BOWLERS, replace=False))]
+    return bat + bowl
+
+
+def _block_frame(rng, block, squads):
+    """Simulates a block of matches and returns their deliveries in IPL.csv layout."""
+    n = len(block)
+    first, first_runs, first_wkts = simulate_innings(rng, n)
+    second, second_runs, second_wkts = simulate_innings(rng, n, target=first_runs + 1)
+    first_won = first_runs > second_runs
+    tie = first_runs == second_runs
+
+    bat_first, bat_second, toss_winner, toss_decision = [], [], [], []
+    for i, m in enumerate(block):
+        if m["stage"] == "Final":
+            # The champion is whichever side the simulation made the winner (super over win on a tie)
+            champ_first = first_won[i] or (tie[i] and rng.random() < 0.5)
+            order = (m["home"], m["away"]) if champ_first else (m["away"], m["home"])
+            toss = order[rng.integers(2)]
+            decision = "bat" if toss == order[0] else "field"
+        else:
+            toss = (m["home"], m["away"])[rng.integers(2)]
+            decision = "field" if rng.random() < m["field_p"] else "bat"
+            other = m["away"] if toss == m["home"] else m["home"]
+            order = (toss, other) if decision == "bat" else (other, toss)
+        bat_first.append(order[0])
+        bat_second.append(order[1])
+        toss_winner.append(toss)
+        toss_decision.append(decision)
+    xi = {side: np.array([_xi(rng, t, squads) for t in teams], dtype=object)
+          for side, teams in [("first", bat_first), ("second", bat_second)]}
+    bowl_perm = {side: np.argsort(rng.random((n, 5)), axis=1) + XI_BATTERS for side in ["first", "second"]}
+
+    parts = []
+    for innings, arrays, bat_side, bowl_side in [(1, first, "first", "second"), (2, second, "second", "first")]:
+        pos = arrays["pos"]
+        bat_xi, bowl_xi = xi[bat_side][pos], xi[bowl_side][pos]
+        rows = np.arange(len(pos))
+        bowler_slot = bowl_perm[bowl_side][pos, arrays["over"] % 5]
+        extra = arrays["extra"]
+        kind = arrays["wicket_kind"]
+        wicket = kind >= 0
+        kind_name = np.where(wicket, WICKET_KINDS[np.maximum(kind, 0)], None)
+        fielded = wicket & np.isin(kind_name, list(FIELDED))
+        fielder = bowl_xi[rows, rng.integers(0, 11, len(pos))]
+        incoming = np.where(arrays["next_in"] >= 0, bat_xi[rows, np.maximum(arrays["next_in"], 0)], None)
+        runs_total = arrays["runs_batter"] + arrays["runs_extras"]
+        parts.append(pd.DataFrame({
+            "pos": pos, "innings": innings, "step": arrays["step"],
+            "batting_team": np.asarray(bat_first if bat_side == "first" else bat_second, dtype=object)[pos],
+            "bowling_team": np.asarray(bat_second if bat_side == "first" else bat_first, dtype=object)[pos],
+            "over": arrays["over"], "ball": arrays["ball"],
+            "batter": bat_xi[rows, arrays["striker"]], "bat_pos": arrays["striker"] + 1,
+            "runs_batter": arrays["runs_batter"], "balls_faced": (extra != 1).astype(np.int64),
+            "bowler": bowl_xi[rows, bowler_slot], "valid_ball": ((extra != 1) & (extra != 2)).astype(np.int64),
+            "runs_extras": arrays["runs_extras"], "runs_total": runs_total,
+            "runs_bowler": np.where(extra >= 3, arrays["runs_batter"], runs_total),
+            "extra_type": EXTRA_TYPES[extra],
+            "non_striker": bat_xi[rows, arrays["non_striker"]], "non_striker_pos": arrays["non_striker"] + 1,
+            "wicket_kind": kind_name, "player_out": np.where(wicket, bat_xi[rows, arrays["striker"]], None),
+            "fielders": np.where(fielded, fielder, None),
+            "runs_target": (first_runs[pos] + 1) if innings == 2 else np.nan,
+            "new_batter": incoming, "next_batter": incoming,
+            "bowler_wicket": (wicket & (kind_name != "run out")).astype(np.int64),
+            "striker_out": wicket, "wicket": wicket.astype(np.int64),
+        }))
+    df = pd.concat(parts, ignore_index=True)
+    df = df.sort_values(["pos", "innings", "step"], kind="stable", ignore_index=True)
+
+    innings_key = [df["pos"], df["innings"]]
+    df["team_runs"] = df.groupby(innings_key)["runs_total"].cumsum()
+    df["team_balls"] = df.groupby(innings_key)["valid_ball"].cumsum()
+    df["team_wicket"] = df.groupby(innings_key)["wicket"].cumsum()
+    df["batter_runs"] = df.groupby(innings_key + [df["batter"]])["runs_batter"].cumsum()
+    df["batter_balls"] = df.groupby(innings_key + [df["batter"]])["balls_faced"].cumsum()
+    df["ball_no"] = df["over"] + df["ball"] / 10
+
+    # Match-level columns
+    winner = np.where(first_won, bat_first, bat_second).astype(object)
+    super_over = np.where(rng.random(n) < 0.5, bat_first, bat_second).astype(object)
+    for i, m in enumerate(block):
+        if tie[i] and m["stage"] == "Final":
+            super_over[i] = m["champion"]
+    winner = np.where(tie, super_over, winner)
+    margin = np.where(first_won, [f"{r} runs" for r in first_runs - second_runs],
+                      [f"{10 - w} wickets" for w in second_wkts])
+    best = df[df["batting_team"].to_numpy() == winner[df["pos"]]].groupby("pos")["batter_runs"].idxmax()
+    player_of_match = np.full(n, None, dtype=object)
+    player_of_match[best.index.to_numpy()] = df.loc[best.to_numpy(), "batter"].to_numpy()
+
+    meta = pd.DataFrame(block)
+    dates = pd.to_datetime(meta["date"])
+    match = pd.DataFrame({
+        "match_id": meta["match_id"], "date": dates.dt.strftime("%Y-%m-%d"), "match_type": "T20",
+        "event_name": "Indian Premier League", "umpires_call": False, "player_of_match": player_of_match,
+        "match_won_by": winner, "win_outcome": np.where(tie, None, margin),
+        "toss_winner": toss_winner, "toss_decision": toss_decision, "venue": meta["venue"], "city": meta["city"],
+        "day": dates.dt.day, "month": dates.dt.month, "year": meta["year"], "season": meta["season"],
+        "gender": "male", "team_type": "club", "superover_winner": np.where(tie, super_over, None),
+        "result_type": np.where(tie, "tie", None), "balls_per_over": 6, "overs": 20,
+        "event_match_no": meta["event_match_no"], "stage": meta["stage"], "match_number": meta["event_match_no"],
+    })
+    df = df.join(match, on="pos")
+    df["runs_not_boundary"] = False
+    for col in ["review_batter", "team_reviewed", "review_decision", "umpire", "method", "batting_partners"]:
+        df[col] = None
+    return df[COLUMNS]
+
+
+def generate(out_path, scale=1, seed=0, block_matches=BLOCK_MATCHES):
+    """Writes a synthetic IPL.csv at `scale` x the real volume; returns (matches, deliveries)."""
+    start = time.perf_counter()
+    root = np.random.SeedSequence([seed, GENERATOR_VERSION])
+    names_rng, *season_seeds = root.spawn(1 + len(SEASONS))
+    pools = {"_names": _name_pool(np.random.default_rng(names_rng)), "_used": set()}
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp_path = f"{out_path}.tmp"
+    matches = rows = 0
+    header = True
+    for i, (season, season_seed) in enumerate(zip(SEASONS, season_seeds)):
+        rng = np.random.default_rng(season_seed)
+        squads = _squads(rng, i, SEASONS[season][2], pools)
+        schedule = _schedule(rng, season, scale, FIRST_MATCH_ID + matches)
+        for b in range(0, len(schedule), block_matches):
+            df = _block_frame(rng, schedule[b:b + block_matches], squads)
+            df.to_csv(tmp_path, mode="w" if header else "a", header=header, index=False)
+            header = False
+            rows += len(df)
+        matches += len(schedule)
+    os.replace(tmp_path, out_path)
+    print(f"✓ Saved: {out_path} ({scale}x: {matches} matches, {rows} deliveries, "
+          f"{os.path.getsize(out_path) / 2**20:.0f} MB, {time.perf_counter() - start:.1f}s)")
+    return matches, rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic IPL.csv at a multiple of the real volume.")
+    parser.add_argument("--scale", type=int, default=1, help="league-stage matches per season x N (1, 10, 100)")
+    parser.add_argument("--out", default=None, help="output CSV (default: bench_data/<scale>x/IPL.csv)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    generate(args.out or os.path.join("bench_data", f"{args.scale}x", "IPL.csv"), args.scale, args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
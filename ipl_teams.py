@@ -0,0 +1,80 @@
+"""
+Team-level parameters for the franchise reports: title seasons and home ground.
+
+Title seasons are read from the match index (winner of each season's Final,
+one per raw season label) and fall back to KNOWN_TITLES when the dataset has
+no stage information.
+Seasons use the season_year convention of ipl_features.season_year_from, so
+the 2008 season ("2007/08") is 2007 and the 2010 season ("2009/10") is 2009.
+The home ground is the franchise's venue in HOME_GROUNDS (Wankhede for MI),
+or the venue it played most matches at for teams not listed there.
+
+Usage:
+    from ipl_teams import title_seasons
+
+    CHAMPION_YEARS = title_seasons().get("Chennai Super Kings", [])
+"""
+import re
+
+from ipl_matches import load_match_index
+from ipl_store import CACHE_DIR, CSV_PATH
+
+KNOWN_TITLES = {
+    "Rajasthan Royals": [2007],
+    "Deccan Chargers": [2009],
+    "Chennai Super Kings": [2009, 2011, 2018, 2021, 2023],
+    "Kolkata Knight Riders": [2012, 2014, 2024],
+    "Mumbai Indians": [2013, 2015, 2017, 2019, 2020],
+    "Sunrisers Hyderabad": [2016],
+    "Gujarat Titans": [2022],
+    "Royal Challengers Bengaluru": [2025],
+}
+# Home venue per franchise, matched as a case-insensitive substring of the venue name
+# (so renamed spellings still match); other teams use their most-played venue
+HOME_GROUNDS = {
+    "Mumbai Indians": "Wankhede",
+    "Chennai Super Kings": "Chidambaram",
+    "Kolkata Knight Riders": "Eden Gardens",
+    "Royal Challengers Bangalore": "Chinnaswamy",
+    "Royal Challengers Bengaluru": "Chinnaswamy",
+    "Rajasthan Royals": "Sawai Mansingh",
+}
+
+
+def title_seasons(csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """{team: sorted title-winning season_years}, from each season's Final."""
+    matches = load_match_index(csv_path, cache_dir).frame
+    finals = matches[matches["stage"] == "Final"] if "stage" in matches.columns else matches.iloc[0:0]
+    if finals.empty:
+        return {team: list(years) for team, years in KNOWN_TITLES.items()}
+
+    # Last Final of a season wins it (guards against replayed finals). Group on the raw
+    # season label: "2009" and "2009/10" share season_year 2009 but each had its own Final.
+    winners = (
+        finals.sort_values("match_id").groupby("season", observed=True)
+        .agg(season_year=("season_year", "first"), team=("match_won_by", "last"))
+        .dropna(subset=["team"])
+    )
+    titles = {}
+    for season, team in zip(winners["season_year"], winners["team"]):
+        years = titles.setdefault(str(team), [])
+        if int(season) not in years:
+            years.append(int(season))
+    return {team: sorted(years) for team, years in titles.items()}
+
+
+def home_ground(cube, team):
+    """Home venue from HOME_GROUNDS, else the venue the team played most at (None for an unknown team)."""
+    if team in HOME_GROUNDS:
+        return HOME_GROUNDS[team]
+    venues = cube.rollup(["venue"], table="matches", where={"team": team})
+    if venues.empty:
+        return None
+    venue = str(venues.loc[venues["matches"].idxmax(), "venue"])
+    # "Wankhede Stadium, Mumbai" -> "Wankhede Stadium", so renamed spellings still match
+    return venue.split(",")[0].strip()
+
+
+def team_slug(team):
+    """File-system friendly team name: 'Mumbai Indians' -> 'mumbai_indians'."""
+    return re.sub(r"[^a-z0-9]+", "_", team.lower()).strip("_")
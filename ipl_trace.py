@@ -0,0 +1,273 @@
+"""
+Stage-level tracing for the prep and analysis pipeline.
+
+Loads, feature derivation, aggregations, exports and plots are wrapped in
+spans (the `span` context manager or the `traced` decorator). Each span
+records wall time, CPU time (whole process, so threaded Arrow reads can
+exceed wall time), peak Python-heap allocation inside the span (tracemalloc,
+which sees NumPy/pandas buffers), resident memory at exit and, where known,
+the number of rows produced. Spans nest, so a slow cell or report breaks
+down into its loads, groupbys and renders.
+
+Tracing is off by default and costs one flag check per span. Turn it on
+with IPL_TRACE=1 (or a path prefix) in the environment, the --trace flag of
+the scripts, or enable() in a notebook. Worker processes inherit the
+setting and append their spans to a per-process part file; when the process
+that enabled tracing exits (or on write_trace()), the parts are merged into
+
+    <prefix>.json        one record per span (name, category, timings, rows, ...)
+    <prefix>.trace.json  Chrome trace-event file (chrome://tracing or ui.perfetto.dev)
+
+and the slowest stages are printed. Set IPL_TRACE_MEMORY=0 to skip
+tracemalloc (it slows allocation-heavy code down noticeably).
+
+Usage:
+    from ipl_trace import span, traced
+
+    @traced(category="aggregate")
+    def season_summary(state): ...
+
+    with span("render:heroes", "plot") as s:
+        fig = plot_heroes(...)
+        s.rows = len(top_batters)
+
+    IPL_TRACE=traces/run1 python mi_champion_analytics.py
+    python mi_champion_analytics.py --trace traces/run1
+"""
+import atexit
+import functools
+import json
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PREFIX = "ipl_trace"
+CATEGORIES = ["load", "derive", "aggregate", "export", "plot", "cell", "stage"]
+MB = 2**20
+
+_state = {"pid": None, "file": None, "registered": False}
+_local = threading.local()
+
+
+def _prefix():
+    value = os.environ.get("IPL_TRACE", "")
+    if value in ("", "0"):
+        return None
+    return DEFAULT_PREFIX if value == "1" else value
+
+
+def is_enabled():
+    return _prefix() is not None
+
+
+def _memory_enabled():
+    return os.environ.get("IPL_TRACE_MEMORY", "1") != "0"
+
+
+def enable(prefix=DEFAULT_PREFIX):
+    """Turns tracing on for this process and every worker it starts; writes the trace at exit."""
+    os.environ["IPL_TRACE"] = prefix
+    os.environ["IPL_TRACE_ROOT"] = str(os.getpid())
+    shutil.rmtree(f"{prefix}.parts", ignore_errors=True)
+    if not _state["registered"]:
+        atexit.register(write_trace)
+        _state["registered"] = True
+    return prefix
+
+
+def _rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MB
+    except (OSError, ValueError, AttributeError):
+        return float("nan")
+
+
+def _part_file():
+    """This process's part file (reopened after a fork)."""
+    if _state["pid"] != os.getpid():
+        parts = f"{_prefix()}.parts"
+        os.makedirs(parts, exist_ok=True)
+        _state.update(pid=os.getpid(), file=open(os.path.join(parts, f"{os.getpid()}.jsonl"), "a", encoding="utf-8"))
+        _local.__dict__.clear()
+    return _state["file"]
+
+
+def _stack():
+    if _state["pid"] != os.getpid():
+        _part_file()
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+class Span:
+    """One timed stage; set `rows` (and any extra `args`) inside the with-block."""
+
+    def __init__(self, name, category, rows=None, **args):
+        self.name = name
+        self.category = category
+        self.rows = rows
+        self.args = args
+        self._peak = 0
+
+    def __enter__(self):
+        stack = _stack()
+        self.parent = stack[-1] if stack else None
+        self.depth = len(stack)
+        if _memory_enabled():
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            current, peak = tracemalloc.get_traced_memory()
+            if self.parent is not None:
+                self.parent._peak = max(self.parent._peak, peak)
+            tracemalloc.reset_peak()
+            self._start_alloc = self._peak = current
+        stack.append(self)
+        self.ts = time.time()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        peak_alloc = None
+        if _memory_enabled() and tracemalloc.is_tracing():
+            self._peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+            peak_alloc = (self._peak - self._start_alloc) / MB
+            if self.parent is not None:
+                self.parent._peak = max(self.parent._peak, self._peak)
+            tracemalloc.reset_peak()
+        _stack().pop()
+        record = {
+            "name": self.name, "category": self.category, "ts": self.ts, "wall_s": wall, "cpu_s": cpu,
+            "peak_alloc_mb": peak_alloc, "rss_mb": _rss_mb(), "rows": self.rows,
+            "parent": self.parent.name if self.parent is not None else None, "depth": self.depth,
+            "pid": os.getpid(), "process": multiprocessing.current_process().name, "tid": threading.get_ident(),
+            "error": exc_type.__name__ if exc_type else None, "args": self.args,
+        }
+        f = _part_file()
+        f.write(json.dumps(record, default=str) + "\n")
+        f.flush()
+        return False
+
+
+class _NullSpan:
+    """Stand-in when tracing is off: attribute writes are accepted and dropped."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL = _NullSpan()
+
+
+def span(name, category="stage", rows=None, **args):
+    """Context manager timing one stage (a no-op unless tracing is enabled)."""
+    if not is_enabled():
+        return _NULL
+    return Span(name, category, rows, **args)
+
+
+def count_rows(result):
+    """Row count of a frame / array result, else None."""
+    if isinstance(result, (pd.DataFrame, pd.Series, np.ndarray)):
+        return len(result)
+    return None
+
+
+def traced(func=None, *, name=None, category="stage", rows=count_rows):
+    """Decorator: runs the function inside a span; `rows(result)` gives its row count."""
+    if func is None:
+        return functools.partial(traced, name=name, category=category, rows=rows)
+    label = name or func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not is_enabled():
+            return func(*args, **kwargs)
+        with Span(label, category) as s:
+            result = func(*args, **kwargs)
+            s.rows = rows(result) if rows is not None else None
+        return result
+
+    return wrapper
+
+
+def _read_parts(prefix):
+    records = []
+    parts = f"{prefix}.parts"
+    if not os.path.isdir(parts):
+        return records
+    for name in sorted(os.listdir(parts)):
+        with open(os.path.join(parts, name), encoding="utf-8") as f:
+            records += [json.loads(line) for line in f if line.strip()]
+    return sorted(records, key=lambda r: r["ts"])
+
+
+def chrome_trace(records):
+    """Chrome trace-event JSON (complete events, microseconds) for the span records."""
+    events = []
+    for pid, process in {(r["pid"], r["process"]) for r in records}:
+        events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": process}})
+    for r in records:
+        args = {k: r[k] for k in ["cpu_s", "peak_alloc_mb", "rss_mb", "rows", "error"] if r[k] is not None}
+        events.append({
+            "name": r["name"], "cat": r["category"], "ph": "X", "ts": r["ts"] * 1e6, "dur": r["wall_s"] * 1e6,
+            "pid": r["pid"], "tid": r["tid"] % 2**31, "args": {**args, **r["args"]},
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def summarize(records, top=15):
+    """Spans grouped by name: calls, total / max wall, CPU, peak allocation and rows."""
+    if not records:
+        return pd.DataFrame()
+    frame = pd.DataFrame(records)
+    summary = frame.groupby(["category", "name"], sort=False).agg(
+        calls=("wall_s", "size"), wall_s=("wall_s", "sum"), max_wall_s=("wall_s", "max"), cpu_s=("cpu_s", "sum"),
+        peak_alloc_mb=("peak_alloc_mb", "max"), rows=("rows", "max"),
+    ).reset_index()
+    return summary.sort_values("wall_s", ascending=False).head(top).reset_index(drop=True)
+
+
+def write_trace(prefix=None, top=15):
+    """Merges every process's spans into <prefix>.json and <prefix>.trace.json (root process only)."""
+    prefix = prefix or _prefix()
+    if prefix is None or os.environ.get("IPL_TRACE_ROOT", str(os.getpid())) != str(os.getpid()):
+        return None
+    if _state["file"] is not None and _state["pid"] == os.getpid():
+        _state["file"].close()
+        _state.update(pid=None, file=None)
+    records = _read_parts(prefix)
+    if not records:
+        return None
+    os.makedirs(os.path.dirname(prefix) or ".", exist_ok=True)
+    with open(f"{prefix}.json", "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=1, default=str)
+    with open(f"{prefix}.trace.json", "w", encoding="utf-8") as f:
+        json.dump(chrome_trace(records), f, default=str)
+    shutil.rmtree(f"{prefix}.parts", ignore_errors=True)
+
+    print(f"\n🔎 Trace: {len(records)} spans -> {prefix}.json, {prefix}.trace.json")
+    with pd.option_context("display.float_format", "{:.3f}".format, "display.width", 160):
+        print(summarize(records, top).to_string(index=False))
+    return prefix
+
+
+# Enabled from the environment: the first process to see IPL_TRACE owns the final write
+if is_enabled() and "IPL_TRACE_ROOT" not in os.environ:
+    enable(_prefix())
@@ -0,0 +1,325 @@
+"""
+Ball-by-ball win probability from a precomputed state table.
+
+The model is fitted offline from every historical delivery and stored as a
+dense float32 array indexed by
+
+    (innings, balls remaining, wickets in hand, runs, venue bucket)
+
+where runs is the score so far in the first innings and the runs still
+needed in the chase. Each cell holds the batting side's win probability: a
+per-innings logistic fit evaluated on the whole grid, blended with the
+empirical win rate of the deliveries that actually passed through the cell
+(PRIOR_WEIGHT pseudo-observations of the fit). Finished states are exact
+(target reached, all out, overs used up), and the end of the first innings
+is chained to the start of the chase so both innings share one scale.
+Venue buckets are tertiles of the venue's average first-innings total.
+
+Scoring a delivery is one fancy-indexing lookup, so a whole deliveries table
+(the full history or all of a team's matches) is scored in a single pass, and
+win probability added (WPA) is credited to the batter (+) and bowler (-).
+Score both innings of a team's matches to credit its bowlers too
+(MI_Fact_Deliveries.csv holds MI's batting only).
+The table is rebuilt only when the dataset version changes and stored under
+.ipl_cache/winprob.
+
+Usage:
+    from ipl_store import load_deliveries
+    from ipl_winprob import SOURCE_COLS, load_win_model, player_wpa
+
+    model = load_win_model()
+    df = load_deliveries(columns=SOURCE_COLS, filters=[[("batting_team", "==", "Mumbai Indians")],
+                                                       [("bowling_team", "==", "Mumbai Indians")]])
+    scored = model.score(df)                   # wp_before, wp_after, wpa per ball
+    player_wpa(scored, "Mumbai Indians").head(10)
+
+    python ipl_winprob.py [--team "Mumbai Indians"] [--top 15] [--out mi_wpa.csv]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from ipl_features import SEQUENCE_ORDER
+from ipl_matches import load_match_index
+from ipl_store import CACHE_DIR, CSV_PATH, ensure_cache, load_deliveries
+from ipl_trace import traced
+
+TEAM = "Mumbai Indians"
+MAX_BALLS = 120
+MAX_WICKETS = 10
+RUNS_MAX = 300
+VENUE_BUCKETS = 3
+MIN_VENUE_MATCHES = 5
+PRIOR_WEIGHT = 20.0
+SOURCE_COLS = [
+    "match_id", "innings", "over", "ball", "batting_team", "bowling_team", "batter", "bowler",
+    "venue", "valid_ball", "runs_total", "wicket_kind", "runs_target", "overs",
+]
+STATE_COLS = ["state_innings", "balls_remaining", "wickets_in_hand", "runs_state"]
+
+
+def venue_key(venue):
+    """'Wankhede Stadium, Mumbai' -> 'Wankhede Stadium', so renamed spellings share a bucket."""
+    return venue.astype(str).str.split(",").str[0].str.strip()
+
+
+def _segments(df):
+    """Start flags of each (match_id, innings) run in a sorted deliveries frame."""
+    match = df["match_id"].to_numpy()
+    innings = df["innings"].to_numpy()
+    return np.r_[True, (match[1:] != match[:-1]) | (innings[1:] != innings[:-1])] if len(df) else np.array([], bool)
+
+
+def _segment_totals(values, starts):
+    """(before, after): running total of `values` within each segment, excluding / including the row."""
+    after = np.cumsum(values)
+    seg = np.cumsum(starts) - 1
+    offset = (after - values)[starts][seg]
+    return after - values - offset, after - offset
+
+
+def delivery_states(df):
+    """
+    Sorted copy of `df` with the table coordinates before and after each ball.
+
+    Adds state_innings (0 / 1, -1 for super overs), balls_remaining,
+    wickets_in_hand and runs_state (runs scored in innings 1, runs needed in
+    innings 2), each also with an `_after` suffix, and first_innings_total.
+    """
+    df = df.sort_values(SEQUENCE_ORDER, kind="stable").reset_index(drop=True)
+    starts = _segments(df)
+    innings = df["innings"].to_numpy().astype(np.int64)
+    runs = df["runs_total"].fillna(0).to_numpy(np.int64)
+    balls = df["valid_ball"].fillna(0).to_numpy(np.int64)
+    wickets = df["wicket_kind"].notna().to_numpy().astype(np.int64)
+    runs_before, runs_after = _segment_totals(runs, starts)
+    balls_before, balls_after = _segment_totals(balls, starts)
+    wkts_before, wkts_after = _segment_totals(wickets, starts)
+
+    # Scheduled balls (shortened matches carry fewer overs)
+    overs = pd.to_numeric(df["overs"], errors="coerce").fillna(20).to_numpy() if "overs" in df.columns else 20
+    max_balls = np.clip(np.asarray(overs * 6, dtype=np.int64), 1, MAX_BALLS)
+
+    # Target: runs_target when recorded (D/L), else first-innings total + 1
+    first = df.loc[innings == 1].groupby("match_id")["runs_total"].sum()
+    df["first_innings_total"] = first.reindex(df["match_id"]).to_numpy()
+    target = df["first_innings_total"].to_numpy() + 1
+    if "runs_target" in df.columns:
+        recorded = pd.to_numeric(df["runs_target"], errors="coerce").to_numpy(dtype=float)
+        target = np.where(np.isnan(recorded) | (recorded <= 0), target, recorded)
+
+    df["state_innings"] = np.where(innings <= 2, innings - 1, -1)
+    for suffix, r, b, w in [("", runs_before, balls_before, wkts_before), ("_after", runs_after, balls_after, wkts_after)]:
+        df[f"balls_remaining{suffix}"] = np.clip(max_balls - b, 0, MAX_BALLS)
+        df[f"wickets_in_hand{suffix}"] = np.clip(MAX_WICKETS - w, 0, MAX_WICKETS)
+        needed = np.nan_to_num(target - r, nan=RUNS_MAX)
+        df[f"runs_state{suffix}"] = np.clip(np.where(innings == 2, needed, r), 0, RUNS_MAX).astype(np.int64)
+    return df
+
+
+def _design(innings, balls, wickets, runs, bucket):
+    """Logistic features for one innings; all inputs are equal-length arrays."""
+    b = balls / MAX_BALLS
+    w = wickets / MAX_WICKETS
+    r = runs / 100.0
+    cols = [np.ones_like(b), b, w, r, w * b, r * w]
+    if innings == 1:
+        # Required rate drives the chase (capped at 30 an over)
+        cols.append(np.minimum(runs * 6.0 / np.maximum(balls, 1), 30.0) / 10.0)
+    cols += [(bucket == k).astype(float) for k in range(1, VENUE_BUCKETS)]
+    return np.column_stack(cols)
+
+
+def _fit_logistic(X, y, ridge=1e-3, iterations=50):
+    """Newton / IRLS fit of a ridge-penalized logistic regression."""
+    beta = np.zeros(X.shape[1])
+    penalty = ridge * np.eye(X.shape[1])
+    for _ in range(iterations):
+        p = 1.0 / (1.0 + np.exp(-(X @ beta)))
+        hessian = X.T @ (X * (p * (1 - p))[:, None]) + penalty
+        step = np.linalg.solve(hessian, X.T @ (y - p) - penalty @ beta)
+        beta += step
+        if np.abs(step).max() < 1e-8:
+            break
+    return beta
+
+
+def _venue_buckets(states):
+    """{venue_key: bucket}: tertiles of average first-innings totals (sparse venues stay in the middle)."""
+    firsts = states[states["state_innings"] == 0].groupby("match_id").agg(
+        venue=("venue_key", "first"), total=("first_innings_total", "first"))
+    by_venue = firsts.groupby("venue")["total"].agg(["mean", "size"])
+    known = by_venue[by_venue["size"] >= MIN_VENUE_MATCHES]
+    buckets = {venue: VENUE_BUCKETS // 2 for venue in by_venue.index}
+    if len(known) >= VENUE_BUCKETS:
+        edges = np.quantile(known["mean"], np.linspace(0, 1, VENUE_BUCKETS + 1)[1:-1])
+        buckets.update(zip(known.index, np.searchsorted(edges, known["mean"].to_numpy(), side="right").tolist()))
+    return buckets
+
+
+class WinProbModel:
+    """Dense win-probability table with O(1) vectorized lookups."""
+
+    def __init__(self, table, venue_buckets, version=None):
+        self.table = table  # (2, MAX_BALLS + 1, MAX_WICKETS + 1, RUNS_MAX + 1, VENUE_BUCKETS) float32
+        self.venue_buckets = venue_buckets
+        self.version = version
+
+    def bucket(self, venue):
+        """Venue bucket per row (unknown venues fall in the middle bucket)."""
+        return venue_key(venue).map(self.venue_buckets).fillna(VENUE_BUCKETS // 2).to_numpy(np.int64)
+
+    def lookup(self, innings, balls_remaining, wickets_in_hand, runs, bucket):
+        """Batting side's win probability for arrays of table coordinates."""
+        return self.table[
+            np.asarray(innings, dtype=np.int64),
+            np.clip(np.asarray(balls_remaining, dtype=np.int64), 0, MAX_BALLS),
+            np.clip(np.asarray(wickets_in_hand, dtype=np.int64), 0, MAX_WICKETS),
+            np.clip(np.asarray(runs, dtype=np.int64), 0, RUNS_MAX),
+            np.asarray(bucket, dtype=np.int64),
+        ]
+
+    @traced(category="derive")
+    def score(self, df):
+        """
+        Deliveries with wp_before / wp_after (batting side's win probability)
+        and wpa = wp_after - wp_before; super-over balls are left as NaN.
+        """
+        states = delivery_states(df)
+        bucket = self.bucket(states["venue"])
+        regular = states["state_innings"].to_numpy() >= 0
+        inn = np.where(regular, states["state_innings"], 0)
+        for suffix, out in [("", "wp_before"), ("_after", "wp_after")]:
+            wp = self.lookup(inn, states[f"balls_remaining{suffix}"], states[f"wickets_in_hand{suffix}"],
+                             states[f"runs_state{suffix}"], bucket)
+            states[out] = np.where(regular, wp, np.nan)
+        states["wpa"] = states["wp_after"] - states["wp_before"]
+        return states
+
+
+@traced(category="aggregate", rows=None)
+def fit_win_model(df, matches, version=None):
+    """Fits the state table from historical deliveries and the match index (for winners)."""
+    states = delivery_states(df)
+    states["venue_key"] = venue_key(states["venue"])
+    winner = matches.set_index("match_id")["match_won_by"].reindex(states["match_id"]).to_numpy()
+    states["won"] = (states["batting_team"].astype(object).to_numpy() == winner).astype(float)
+    train = states[(states["state_innings"] >= 0) & pd.notna(winner)]
+
+    venue_buckets = _venue_buckets(states)
+    bucket = train["venue_key"].map(venue_buckets).fillna(VENUE_BUCKETS // 2).to_numpy(np.int64)
+    grid_b, grid_w, grid_r, grid_v = np.meshgrid(
+        np.arange(MAX_BALLS + 1), np.arange(MAX_WICKETS + 1), np.arange(RUNS_MAX + 1), np.arange(VENUE_BUCKETS),
+        indexing="ij",
+    )
+    shape = grid_b.shape
+    table = np.empty((2,) + shape, dtype=np.float64)
+    for inn in (0, 1):
+        rows = train["state_innings"].to_numpy() == inn
+        coords = [train[c].to_numpy()[rows] for c in STATE_COLS[1:]] + [bucket[rows]]
+        y = train["won"].to_numpy()[rows]
+        beta = _fit_logistic(_design(inn, *coords), y) if rows.any() else np.zeros(_design(inn, *[np.zeros(1)] * 4).shape[1])
+        prior = 1.0 / (1.0 + np.exp(-(_design(inn, grid_b.ravel(), grid_w.ravel(), grid_r.ravel(), grid_v.ravel()) @ beta)))
+
+        # Shrink the observed cell win rates towards the fit
+        wins, seen = np.zeros(shape), np.zeros(shape)
+        np.add.at(wins, tuple(coords), y)
+        np.add.at(seen, tuple(coords), 1.0)
+        table[inn] = (wins + PRIOR_WEIGHT * prior.reshape(shape)) / (seen + PRIOR_WEIGHT)
+
+    # Finished chases are certain: target reached, all out / out of balls (one run short = tie)
+    chase = table[1]
+    chase[:, :, 0, :] = 1.0
+    chase[:, 0, 1:, :] = 0.0
+    chase[0, :, 1:, :] = 0.0
+    chase[0, :, 1, :] = chase[:, 0, 1, :] = 0.5
+    # End of the first innings = start of the chase for target runs + 1
+    start = chase[MAX_BALLS, MAX_WICKETS]  # (runs needed, bucket)
+    final = 1.0 - start[np.minimum(np.arange(RUNS_MAX + 1) + 1, RUNS_MAX)]
+    table[0][0, :, :, :] = final
+    table[0][:, 0, :, :] = final
+    return WinProbModel(table.astype(np.float32), venue_buckets, version)
+
+
+def player_wpa(scored, team=TEAM):
+    """Win probability added per player of `team`: + as batter, - of the batting side's gain as bowler."""
+    bat = scored[scored["batting_team"] == team].groupby("batter", observed=True).agg(
+        balls_faced=("valid_ball", "sum"), wpa_batting=("wpa", "sum"))
+    bowl = scored[scored["bowling_team"] == team].groupby("bowler", observed=True).agg(
+        balls_bowled=("valid_ball", "sum"), wpa_bowling=("wpa", lambda s: -s.sum()))
+    bat.index, bowl.index = bat.index.astype(str), bowl.index.astype(str)
+    players = bat.join(bowl, how="outer").fillna(0).rename_axis("player")
+    players["wpa"] = players["wpa_batting"] + players["wpa_bowling"]
+    return players.sort_values("wpa", ascending=False).reset_index()
+
+
+def _model_paths(cache_dir):
+    model_dir = os.path.join(cache_dir, "winprob")
+    return model_dir, os.path.join(model_dir, "table.npz"), os.path.join(model_dir, "manifest.json")
+
+
+def build_and_save(csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """Fits the table from the columnar cache and stores it next to it."""
+    manifest = ensure_cache(csv_path, cache_dir)
+    df = load_deliveries(columns=[c for c in SOURCE_COLS if c in manifest["columns"]],
+                         csv_path=csv_path, cache_dir=cache_dir)
+    model = fit_win_model(df, load_match_index(csv_path, cache_dir).frame, manifest["sha256"])
+
+    model_dir, data_path, manifest_path = _model_paths(cache_dir)
+    os.makedirs(model_dir, exist_ok=True)
+    np.savez_compressed(data_path, table=model.table)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"sha256": manifest["sha256"], "venue_buckets": model.venue_buckets}, f)
+    print(f"✓ Win-probability table: {model.table.shape} cells, {model.table.nbytes / 1e6:.1f} MB")
+    return model
+
+
+def load_win_model(csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """Loads the state table, refitting it if the dataset changed."""
+    version = ensure_cache(csv_path, cache_dir)["sha256"]
+    _, data_path, manifest_path = _model_paths(cache_dir)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("sha256") == version:
+            with np.load(data_path) as data:
+                return WinProbModel(data["table"], manifest["venue_buckets"], version)
+    return build_and_save(csv_path, cache_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--team", default=TEAM)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--out", default=None, help="write the team's WPA table as CSV")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.csv):
+        print(f"❌ Error: {args.csv} not found.")
+        return 1
+    model = load_win_model(csv_path=args.csv)
+    df = load_deliveries(columns=SOURCE_COLS, csv_path=args.csv)
+
+    start = time.perf_counter()
+    scored = model.score(df)
+    seconds = time.perf_counter() - start
+    print(f"Scored {len(scored)} deliveries in {seconds:.3f}s")
+
+    wpa = player_wpa(scored, args.team)
+    print(f"\n📈 {args.team}: win probability added (top {args.top})")
+    with pd.option_context("display.float_format", "{:.3f}".format, "display.width", 160):
+        print(wpa.head(args.top).to_string(index=False))
+    if args.out:
+        wpa.to_csv(args.out, index=False)
+        print(f"✓ Saved {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
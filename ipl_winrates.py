@@ -0,0 +1,157 @@
+"""
+Conditional win rates over toss, decision, venue, season and batting order.
+
+The cube's match table is expanded once into a dense count tensor with one
+axis per dimension (team, toss_won, toss_decision, venue, season_year,
+batting_order) holding matches played and matches won. Any conditional
+win rate - "after winning the toss, per venue", "chasing, per season when
+the toss was lost", ... - is then an index selection on some axes plus a
+sum over the others; no groupby or per-group lambda is involved.
+
+Every rate comes with a Wilson score interval (well behaved for the small
+samples a single venue or season gives, unlike the normal approximation),
+and `min_matches` drops cells with too few matches to say anything.
+
+Usage:
+    from ipl_winrates import load_win_rates
+
+    win_rates = load_win_rates()
+    win_rates.rates(["toss_won", "toss_decision"], where={"team": "Mumbai Indians"})
+    win_rates.contrast("venue", "toss_won", True, False, labels=("toss_won", "toss_lost"),
+                       where={"team": "Mumbai Indians"}, min_matches=5)
+"""
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from ipl_cube import load_cube
+from ipl_store import CACHE_DIR, CSV_PATH
+from ipl_trace import traced
+
+TENSOR_DIMS = ["team", "toss_won", "toss_decision", "venue", "season_year", "batting_order"]
+ALPHA = 0.05
+
+
+def wilson_interval(wins, matches, alpha=ALPHA):
+    """Wilson score interval for wins / matches, in percent (NaN where matches == 0)."""
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    n = np.asarray(matches, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = np.asarray(wins, dtype=float) / n
+        center = (p + z * z / (2 * n)) / (1 + z * z / n)
+        half = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return (center - half) * 100, (center + half) * 100
+
+
+class WinRateTensor:
+    """Dense (matches, wins) tensor over TENSOR_DIMS with conditional-rate queries."""
+
+    # Memoization fingerprint: dataset version + the source of these modules (see ipl_memo)
+    code_modules = ("ipl_winrates", "ipl_cube")
+
+    def __init__(self, levels, matches, wins, version=None):
+        self.levels = levels    # {dimension: pd.Index of its values, in axis order}
+        self.matches = matches
+        self.wins = wins
+        # Dataset hash of the cube it was expanded from (memoization fingerprint)
+        self.version = version
+
+    @property
+    def dims(self):
+        return list(self.levels)
+
+    @classmethod
+    def from_frame(cls, frame, dims=TENSOR_DIMS, version=None):
+        """Expands a table with `dims` + matches + wins columns (e.g. cube.matches)."""
+        codes, levels = [], {}
+        for dim in dims:
+            code, values = pd.factorize(frame[dim], sort=True, use_na_sentinel=False)
+            codes.append(code)
+            levels[dim] = pd.Index(values, name=dim)
+        shape = tuple(len(v) for v in levels.values())
+        flat = np.ravel_multi_index(codes, shape)
+        size = int(np.prod(shape))
+        matches = np.bincount(flat, weights=frame["matches"], minlength=size).astype(np.int64).reshape(shape)
+        wins = np.bincount(flat, weights=frame["wins"], minlength=size).astype(np.int64).reshape(shape)
+        return cls(levels, matches, wins, version)
+
+    def _select(self, dim, value):
+        """Positions on `dim`'s axis matching a value, list or callable(Series) -> mask (as in cube.rollup)."""
+        values = self.levels[dim].to_series()
+        if callable(value):
+            cond = value(values)
+        elif isinstance(value, (list, tuple, set, range)):
+            cond = values.isin(list(value))
+        else:
+            cond = values == value
+        return np.flatnonzero(np.asarray(cond.fillna(False) if hasattr(cond, "fillna") else cond, dtype=bool))
+
+    def _slice(self, by, where=None):
+        """(levels per `by` dim, matches, wins) with `where` applied and other axes summed out."""
+        unknown = [d for d in list(by) + list(where or {}) if d not in self.levels]
+        if unknown:
+            raise KeyError(f"Unknown dimension(s) {unknown}; available: {self.dims}")
+        matches, wins = self.matches, self.wins
+        levels = dict(self.levels)
+        for dim, value in (where or {}).items():
+            axis = self.dims.index(dim)
+            keep = self._select(dim, value)
+            matches, wins = matches.take(keep, axis=axis), wins.take(keep, axis=axis)
+            levels[dim] = levels[dim][keep]
+        summed = tuple(i for i, d in enumerate(self.dims) if d not in by)
+        kept = [d for d in self.dims if d in by]
+        order = [kept.index(d) for d in by]
+        matches = matches.sum(axis=summed).transpose(order)
+        wins = wins.sum(axis=summed).transpose(order)
+        return [levels[d] for d in by], matches, wins
+
+    @traced(category="aggregate")
+    def rates(self, by, where=None, min_matches=1, alpha=ALPHA):
+        """
+        Matches, wins, win % and its Wilson interval per combination of `by`.
+
+        where:       {dimension: value | list | callable(Series) -> mask}
+        min_matches: cells with fewer matches are dropped
+        """
+        by = list(by)
+        levels, matches, wins = self._slice(by, where)
+        index = pd.MultiIndex.from_product(levels) if by else pd.RangeIndex(1)
+        result = pd.DataFrame({"matches": matches.ravel(), "wins": wins.ravel()}, index=index)
+        result = result[result["matches"] >= max(min_matches, 1)].reset_index() if by else result
+        result["win_pct"] = result["wins"] / result["matches"].where(result["matches"] > 0) * 100
+        result["win_pct_lo"], result["win_pct_hi"] = wilson_interval(result["wins"], result["matches"], alpha)
+        return result
+
+    @traced(category="aggregate")
+    def contrast(self, by, dim, a, b, labels=None, where=None, min_matches=1, alpha=ALPHA):
+        """
+        Win % when `dim` == a vs `dim` == b, side by side per combination of
+        `by`, with Wilson intervals and the difference (a - b).
+        min_matches applies to the combined matches of both sides.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        labels = labels or (str(a), str(b))
+        where = {**(where or {}), dim: [a, b]}
+        levels, matches, wins = self._slice(by + [dim], where)
+        pos = {value: i for i, value in enumerate(levels[-1])}
+        index = pd.MultiIndex.from_product(levels[:-1]) if by else pd.RangeIndex(1)
+        result = pd.DataFrame({"matches": matches.sum(axis=-1).ravel()}, index=index)
+        for value, label in zip((a, b), labels):
+            m = matches[..., pos[value]].ravel() if value in pos else np.zeros(len(result), dtype=np.int64)
+            w = wins[..., pos[value]].ravel() if value in pos else np.zeros(len(result), dtype=np.int64)
+            result[f"matches_{label}"] = m
+            result[f"wins_{label}"] = w
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result[f"win_pct_{label}"] = np.where(m > 0, w / m * 100, np.nan)
+            result[f"win_pct_{label}_lo"], result[f"win_pct_{label}_hi"] = wilson_interval(w, m, alpha)
+        result["diff"] = result[f"win_pct_{labels[0]}"] - result[f"win_pct_{labels[1]}"]
+        result = result[result["matches"] >= max(min_matches, 1)]
+        return result.reset_index() if by else result
+
+
+@traced(category="load", rows=None)
+def load_win_rates(csv_path=CSV_PATH, cache_dir=CACHE_DIR):
+    """Win-rate tensor expanded from the (cached) cube's match table."""
+    cube = load_cube(csv_path, cache_dir)
+    return WinRateTensor.from_frame(cube.matches, version=cube.version)
@@ -1,9 +1,43 @@
+"""
+Champion DNA Analytics - headless batch report (Mumbai Indians by default).
+
+Computes the four analyses (core metrics, phase, strategy & fortress, heroes)
+from the OLAP cube and renders each figure in its own worker process, since
+matplotlib/seaborn rendering is the slow, CPU-bound step.
+
+Each Champion vs Other Years bar carries a 95% match-level bootstrap interval
+(ipl_bootstrap) and each panel title the p-value of the difference; the
+interval table is also saved as bootstrap_ci.csv.
+
+--all-teams runs every franchise in one pass: the cube is loaded once and
+handed to each worker, and the teams are partitioned across the pool (one
+team's four analyses + figures per task, written to <out-dir>/<team>/).
+
+Usage:
+    python mi_champion_analytics.py [--only heroes,phase] [--formats png,svg]
+                                    [--out-dir reports] [--workers 4] [--resamples 10000]
+    python mi_champion_analytics.py --team "Chennai Super Kings" [--titles 2009,2011]
+    python mi_champion_analytics.py --all-teams [--workers 8]
+    python mi_champion_analytics.py --trace traces/report   # stage trace (see ipl_trace)
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use("Agg")  # Non-interactive backend: no display needed on report servers
 
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-import os
+from ipl_bootstrap import RESAMPLES, bootstrap_periods, load_match_totals, period_interval
+from ipl_cube import load_cube
+from ipl_memo import memo_stats, memoize
+from ipl_teams import home_ground, team_slug, title_seasons
+from ipl_trace import enable as enable_trace, span
 
 # --- Configuration ---
 sns.set_theme(style="whitegrid", context="talk")
@@ -14,203 +48,388 @@ plt.rcParams["axes.titleweight"] = "bold"
 # Brand Colors
 MI_BLUE = "#004BA0"
 MI_GOLD = "#D1AB3E"
-MI_PALETTE = [MI_BLUE, "#A9A9A9"] 
-
-# --- Data Loading & Prep ---
-print("--- MI Champion DNA Analytics ---")
-if not os.path.exists("IPL.csv"):
-    print("❌ Error: IPL.csv not found.")
-    exit()
-
-print("Loading Data...")
-df = pd.read_csv("IPL.csv", low_memory=False)
-
-# Helper: Clean Season Year
-def clean_season(s):
-    s = str(s)
-    if "/" in s:
-        return int(s.split("/")[0])
-    try:
-        return int(s)
-    except ValueError:
-        return 0
-
-df["season_year"] = df["season"].apply(clean_season)
-
-# Define Champion Years
-CHAMPION_YEARS = [2013, 2015, 2017, 2019, 2020]
-df["is_champion_year"] = df["season_year"].isin(CHAMPION_YEARS)
-df["period"] = df["is_champion_year"].map({True: "Champion Years", False: "Other Years"})
+MI_PALETTE = [MI_BLUE, "#A9A9A9"]
 
-# Pre-calculate
-df["is_wicket"] = df["wicket_kind"].notna().astype(int)
-df["is_dot"] = (df["runs_total"] == 0).astype(int)
+TEAM = "Mumbai Indians"
+CHAMPION_YEARS = [2013, 2015, 2017, 2019, 2020]
+OUTPUT_FORMATS = ["png", "svg"]
+# Analyses whose Champion vs Other bars get bootstrap intervals
+CI_ANALYSES = ["core", "phase", "strategy"]
+
+
+@memoize(ignore=["workers"])
+def champion_intervals(totals, team=TEAM, champion_years=CHAMPION_YEARS, resamples=RESAMPLES, workers=None):
+    return bootstrap_periods(totals, team, champion_years, resamples=resamples, workers=workers)
+
+
+def add_ci(ax, ci, metric, container=None):
+    """Draws the bootstrap interval of `metric` on each bar (or on one hue's bar container)."""
+    if ci is None:
+        return
+    periods = [label.get_text() for label in ax.get_xticklabels()]
+    bars = ax.containers[container] if container is not None else [bar for c in ax.containers for bar in c]
+    for bar in bars:
+        x = bar.get_x() + bar.get_width() / 2
+        _, lo, hi = period_interval(ci, metric, periods[int(round(x))])
+        height = bar.get_height()
+        if np.isnan(lo) or np.isnan(height):
+            continue
+        ax.errorbar(x, height, yerr=[[max(height - lo, 0)], [max(hi - height, 0)]],
+                    fmt="none", ecolor="black", elinewidth=1.5, capsize=8)
+
+
+def p_label(ci, metric):
+    if ci is None:
+        return ""
+    p = ci.set_index("metric").loc[metric, "p_value"]
+    return "" if np.isnan(p) else f" (p={p:.3f})"
 
 # ==========================================
 # 1. Statistical Baseline (Batting & Bowling)
 # ==========================================
-print("\n[1/4] Generating Core Metrics Analysis...")
-
-# Batting
-mi_bat = df[df["batting_team"] == "Mumbai Indians"].copy()
-bat_metrics = mi_bat.groupby("period").agg(
-    runs=("runs_batter", "sum"),
-    wickets=("is_wicket", "sum"),
-    balls=("valid_ball", "sum")
-).reset_index()
-bat_metrics["avg"] = bat_metrics["runs"] / bat_metrics["wickets"]
-bat_metrics["sr"] = (bat_metrics["runs"] / bat_metrics["balls"]) * 100
-
-# Bowling
-mi_bowling = df[df["bowling_team"] == "Mumbai Indians"].copy()
-bowl_metrics = mi_bowling.groupby("period").agg(
-    runs_conceded=("runs_total", "sum"),
-    wickets=("bowler_wicket", "sum"),
-    balls=("valid_ball", "sum")
-).reset_index()
-bowl_metrics["avg"] = bowl_metrics["runs_conceded"] / bowl_metrics["wickets"]
-bowl_metrics["econ"] = (bowl_metrics["runs_conceded"] / bowl_metrics["balls"]) * 6
-
-# Plot 1
-fig1, ax = plt.subplots(2, 2, figsize=(16, 10))
-fig1.suptitle("Core Metrics: Champions vs Others", fontsize=24)
-
-sns.barplot(data=bat_metrics, x="period", y="avg", ax=ax[0,0], palette=MI_PALETTE)
-ax[0,0].set_title("Batting Avg")
-ax[0,0].bar_label(ax[0,0].containers[0], fmt="%.2f")
-
-sns.barplot(data=bat_metrics, x="period", y="sr", ax=ax[0,1], palette=MI_PALETTE)
-ax[0,1].set_title("Batting Strike Rate")
-ax[0,1].bar_label(ax[0,1].containers[0], fmt="%.1f")
-
-sns.barplot(data=bowl_metrics, x="period", y="avg", ax=ax[1,0], palette=MI_PALETTE)
-ax[1,0].set_title("Bowling Avg (Lower is Better)")
-ax[1,0].bar_label(ax[1,0].containers[0], fmt="%.2f")
-
-sns.barplot(data=bowl_metrics, x="period", y="econ", ax=ax[1,1], palette=MI_PALETTE)
-ax[1,1].set_title("Bowling Economy (Lower is Better)")
-ax[1,1].bar_label(ax[1,1].containers[0], fmt="%.2f")
-
-plt.tight_layout()
-plt.show(block=False) # Show non-blocking so script continues, or rely on end block
+@memoize
+def core_metrics(cube, team=TEAM, champion_years=CHAMPION_YEARS):
+    # Batting: avg = runs_batter / wickets, sr = runs_batter / balls * 100
+    bat_metrics = cube.rollup(["period"], where={"batting_team": team}, champion_years=champion_years)
+    bat_metrics = bat_metrics.rename(columns={"runs_batter": "runs", "batting_avg": "avg", "strike_rate": "sr"})
+
+    # Bowling: avg = runs_total / bowler_wickets, econ = runs_total / balls * 6
+    bowl_metrics = cube.rollup(["period"], where={"bowling_team": team}, champion_years=champion_years)
+    bowl_metrics = bowl_metrics.rename(columns={"runs_total": "runs_conceded", "bowling_avg": "avg", "economy": "econ"})
+    return {"bat_metrics": bat_metrics, "bowl_metrics": bowl_metrics}
+
+
+def plot_core_metrics(bat_metrics, bowl_metrics, ci=None):
+    fig1, ax = plt.subplots(2, 2, figsize=(16, 10))
+    fig1.suptitle("Core Metrics: Champions vs Others", fontsize=24)
+
+    sns.barplot(data=bat_metrics, x="period", y="avg", ax=ax[0,0], palette=MI_PALETTE)
+    ax[0,0].set_title("Batting Avg" + p_label(ci, "batting_avg"))
+    ax[0,0].bar_label(ax[0,0].containers[0], fmt="%.2f")
+    add_ci(ax[0,0], ci, "batting_avg")
+
+    sns.barplot(data=bat_metrics, x="period", y="sr", ax=ax[0,1], palette=MI_PALETTE)
+    ax[0,1].set_title("Batting Strike Rate" + p_label(ci, "strike_rate"))
+    ax[0,1].bar_label(ax[0,1].containers[0], fmt="%.1f")
+    add_ci(ax[0,1], ci, "strike_rate")
+
+    sns.barplot(data=bowl_metrics, x="period", y="avg", ax=ax[1,0], palette=MI_PALETTE)
+    ax[1,0].set_title("Bowling Avg (Lower is Better)" + p_label(ci, "bowling_avg"))
+    ax[1,0].bar_label(ax[1,0].containers[0], fmt="%.2f")
+    add_ci(ax[1,0], ci, "bowling_avg")
+
+    sns.barplot(data=bowl_metrics, x="period", y="econ", ax=ax[1,1], palette=MI_PALETTE)
+    ax[1,1].set_title("Bowling Economy (Lower is Better)" + p_label(ci, "economy"))
+    ax[1,1].bar_label(ax[1,1].containers[0], fmt="%.2f")
+    add_ci(ax[1,1], ci, "economy")
+
+    plt.tight_layout()
+    return fig1
 
 # ==========================================
 # 2. Phase Analysis
 # ==========================================
-print("[2/4] Generating Phase Analysis...")
-def get_phase(over):
-    if over < 6: return "Powerplay"
-    elif over >= 15: return "Death"
-    else: return "Middle"
-
-mi_bat["phase"] = mi_bat["over"].apply(get_phase)
-mi_bowling["phase"] = mi_bowling["over"].apply(get_phase)
-
-pp_bat = mi_bat[mi_bat["phase"] == "Powerplay"].groupby("period").agg(
-    runs=("runs_total", "sum"),
-    overs=("valid_ball", lambda x: x.count()/6)
-).reset_index()
-pp_bat["rpo"] = pp_bat["runs"] / pp_bat["overs"]
-
-death_bowl = mi_bowling[mi_bowling["phase"] == "Death"].groupby("period").agg(
-    runs=("runs_total", "sum"),
-    overs=("valid_ball", lambda x: x.count()/6)
-).reset_index()
-death_bowl["econ"] = death_bowl["runs"] / death_bowl["overs"]
-
-# Plot 2
-fig2, ax = plt.subplots(1, 2, figsize=(16, 6))
-fig2.suptitle("Phase Dominance", fontsize=22)
-
-sns.barplot(data=pp_bat, x="period", y="rpo", ax=ax[0], palette=MI_PALETTE)
-ax[0].set_title("Powerplay Batting (Runs per Over)")
-ax[0].bar_label(ax[0].containers[0], fmt="%.2f")
-
-sns.barplot(data=death_bowl, x="period", y="econ", ax=ax[1], palette=MI_PALETTE)
-ax[1].set_title("Death Bowling Economy (Lower is Better)")
-ax[1].bar_label(ax[1].containers[0], fmt="%.2f")
-
-plt.tight_layout()
-plt.show(block=False)
+@memoize
+def phase_metrics(cube, team=TEAM, champion_years=CHAMPION_YEARS):
+    # Runs per over on all deliveries (extras included)
+    pp_bat = cube.rollup(["period"], where={"batting_team": team, "phase": "Powerplay"}, champion_years=champion_years)
+
+    death_bowl = cube.rollup(["period"], where={"bowling_team": team, "phase": "Death"}, champion_years=champion_years)
+    death_bowl["econ"] = death_bowl["rpo"]
+    return {"pp_bat": pp_bat, "death_bowl": death_bowl}
+
+
+def plot_phase(pp_bat, death_bowl, ci=None):
+    fig2, ax = plt.subplots(1, 2, figsize=(16, 6))
+    fig2.suptitle("Phase Dominance", fontsize=22)
+
+    sns.barplot(data=pp_bat, x="period", y="rpo", ax=ax[0], palette=MI_PALETTE)
+    ax[0].set_title("Powerplay Batting (Runs per Over)" + p_label(ci, "powerplay_rpo"))
+    ax[0].bar_label(ax[0].containers[0], fmt="%.2f")
+    add_ci(ax[0], ci, "powerplay_rpo")
+
+    sns.barplot(data=death_bowl, x="period", y="econ", ax=ax[1], palette=MI_PALETTE)
+    ax[1].set_title("Death Bowling Economy (Lower is Better)" + p_label(ci, "death_economy"))
+    ax[1].bar_label(ax[1].containers[0], fmt="%.2f")
+    add_ci(ax[1], ci, "death_economy")
+
+    plt.tight_layout()
+    return fig2
 
 # ==========================================
 # 3. Strategy & Fortress
 # ==========================================
-print("[3/4] Generating Strategy & Fortress Analysis...")
-match_data = df[["match_id", "season_year", "venue", "toss_winner", "toss_decision", "match_won_by"]].drop_duplicates()
-match_data["is_champion_year"] = match_data["season_year"].isin(CHAMPION_YEARS)
-match_data["period"] = match_data["is_champion_year"].map({True: "Champion Years", False: "Other Years"})
-match_data["mi_win"] = (match_data["match_won_by"] == "Mumbai Indians").astype(int)
-
-mi_innings = df[(df["batting_team"] == "Mumbai Indians")].groupby(["match_id"])["innings"].min().reset_index()
-match_data = pd.merge(match_data, mi_innings, on="match_id", how="left")
-match_data["strategy"] = match_data["innings"].map({1: "Defending", 2: "Chasing"})
-mi_matches_strat = match_data.dropna(subset=["strategy"])
-
-strat_stats = mi_matches_strat.groupby(["period", "strategy"]).agg(
-    played=("match_id", "count"),
-    won=("mi_win", "sum")
-).reset_index()
-strat_stats["win_pct"] = (strat_stats["won"] / strat_stats["played"]) * 100
-
-# Wankhede Stats
-wankhede = match_data[
-    (match_data["venue"].str.contains("Wankhede", case=False, na=False)) & 
-    ((df["batting_team"] == "Mumbai Indians") | (df["bowling_team"] == "Mumbai Indians"))
-].drop_duplicates(subset=["match_id"])
-# Note: Above filter for MI involvement is technically loose because we filtered DF earlier, 
-# but strictly speaking match_data is from full DF. 
-# Let's trust the logic that we only care about if MI played.
-# Actually, let's re-verify MI played in these matches.
-# 'match_data' currently contains ALL matches.
-# Need to filter match_data for matches where MI played.
-
-mi_involved_ids = df[(df["batting_team"] == "Mumbai Indians") | (df["bowling_team"] == "Mumbai Indians")]["match_id"].unique()
-wankhede = wankhede[wankhede["match_id"].isin(mi_involved_ids)]
-
-home_stats = wankhede.groupby("period").agg(
-    played=("match_id", "count"),
-    won=("mi_win", "sum")
-).reset_index()
-home_stats["win_pct"] = (home_stats["won"] / home_stats["played"]) * 100
-
-
-fig3, ax = plt.subplots(1, 2, figsize=(16, 6))
-fig3.suptitle("Strategy & Home Advantage", fontsize=22)
-
-sns.barplot(data=strat_stats, x="period", y="win_pct", hue="strategy", ax=ax[0], palette="viridis")
-ax[0].set_title("Win %: Chasing vs Defending")
-ax[0].set_ylim(0, 100)
-
-sns.barplot(data=home_stats, x="period", y="win_pct", ax=ax[1], palette=MI_PALETTE)
-ax[1].set_title("Fortress Wankhede Win %")
-ax[1].bar_label(ax[1].containers[0], fmt="%.1f%%")
-ax[1].set_ylim(0, 100)
-
-plt.tight_layout()
-plt.show(block=False)
+@memoize
+def strategy_metrics(cube, team=TEAM, champion_years=CHAMPION_YEARS):
+    # Match cube: batting_order 1 = set the target (Defending), 2 = Chasing
+    strat_stats = cube.rollup(
+        ["period", "batting_order"], table="matches",
+        where={"team": team, "batting_order": [1, 2]}, champion_years=champion_years,
+    )
+    strat_stats["strategy"] = strat_stats["batting_order"].map({1: "Defending", 2: "Chasing"})
+
+    # Home ground stats (every match at the venue: HOME_GROUNDS, e.g. Wankhede for MI)
+    home = home_ground(cube, team)
+    home_stats = cube.rollup(
+        ["period"], table="matches", champion_years=champion_years,
+        where={"team": team, "venue": lambda v: v.str.contains(home, case=False, regex=False, na=False)},
+    )
+    return {"strat_stats": strat_stats, "home_stats": home_stats, "home": home}
+
+
+def plot_strategy(strat_stats, home_stats, home, ci=None):
+    fig3, ax = plt.subplots(1, 2, figsize=(16, 6))
+    fig3.suptitle("Strategy & Home Advantage", fontsize=22)
+
+    sns.barplot(data=strat_stats, x="period", y="win_pct", hue="strategy", hue_order=["Defending", "Chasing"],
+                ax=ax[0], palette="viridis")
+    ax[0].set_title("Win %: Chasing vs Defending")
+    add_ci(ax[0], ci, "defending_win_pct", container=0)
+    add_ci(ax[0], ci, "chasing_win_pct", container=1)
+    ax[0].set_ylim(0, 100)
+
+    sns.barplot(data=home_stats, x="period", y="win_pct", ax=ax[1], palette=MI_PALETTE)
+    ax[1].set_title(f"Fortress {home} Win %")
+    ax[1].bar_label(ax[1].containers[0], fmt="%.1f%%")
+    ax[1].set_ylim(0, 100)
+
+    plt.tight_layout()
+    return fig3
 
 # ==========================================
 # 4. Heroes
 # ==========================================
-print("[4/4] Identifying Champion Heroes...")
-champ_bat = mi_bat[mi_bat["is_champion_year"] == True]
-champ_bowl = mi_bowling[mi_bowling["is_champion_year"] == True]
-
-top_batters = champ_bat.groupby("batter")["runs_batter"].sum().nlargest(5).reset_index()
-top_bowlers = champ_bowl.groupby("bowler")["bowler_wicket"].sum().nlargest(5).reset_index()
-
-fig4, ax = plt.subplots(1, 2, figsize=(18, 7))
-fig4.suptitle("Heroes of the 5 Titles", fontsize=24)
-
-sns.barplot(data=top_batters, x="runs_batter", y="batter", ax=ax[0], palette="Blues_r")
-ax[0].set_title("Most Runs")
-ax[0].bar_label(ax[0].containers[0])
-
-sns.barplot(data=top_bowlers, x="bowler_wicket", y="bowler", ax=ax[1], palette="Oranges_r")
-ax[1].set_title("Most Wickets")
-ax[1].bar_label(ax[1].containers[0])
-
-plt.tight_layout()
-print("\n✅ Analysis Complete. Displaying charts...")
-plt.show() # Block here to keep windows open
+@memoize
+def hero_metrics(cube, team=TEAM, champion_years=CHAMPION_YEARS):
+    top_batters = (
+        cube.rollup(["batter"], where={"batting_team": team, "season_year": champion_years})
+        .nlargest(5, "runs_batter")[["batter", "runs_batter"]]
+    )
+    top_bowlers = (
+        cube.rollup(["bowler"], where={"bowling_team": team, "season_year": champion_years})
+        .rename(columns={"bowler_wickets": "bowler_wicket"})
+        .nlargest(5, "bowler_wicket")[["bowler", "bowler_wicket"]]
+    )
+    return {"top_batters": top_batters, "top_bowlers": top_bowlers, "titles": len(champion_years)}
+
+
+def plot_heroes(top_batters, top_bowlers, titles):
+    fig4, ax = plt.subplots(1, 2, figsize=(18, 7))
+    fig4.suptitle(f"Heroes of the {titles} Titles", fontsize=24)
+
+    sns.barplot(data=top_batters, x="runs_batter", y="batter", ax=ax[0], palette="Blues_r")
+    ax[0].set_title("Most Runs")
+    ax[0].bar_label(ax[0].containers[0])
+
+    sns.barplot(data=top_bowlers, x="bowler_wicket", y="bowler", ax=ax[1], palette="Oranges_r")
+    ax[1].set_title("Most Wickets")
+    ax[1].bar_label(ax[1].containers[0])
+
+    plt.tight_layout()
+    return fig4
+
+
+# name -> (title, compute(cube) -> dict of frames, plot(**frames) -> Figure, output file stem)
+ANALYSES = {
+    "core": ("Core Metrics", core_metrics, plot_core_metrics, "1_core_metrics"),
+    "phase": ("Phase Analysis", phase_metrics, plot_phase, "2_phase_analysis"),
+    "strategy": ("Strategy & Fortress", strategy_metrics, plot_strategy, "3_strategy_fortress"),
+    "heroes": ("Champion Heroes", hero_metrics, plot_heroes, "4_champion_heroes"),
+}
+
+
+def render_figure(name, frames, out_dir, formats):
+    """Worker: draws one analysis and saves it in every format. Returns (paths, seconds)."""
+    start = time.perf_counter()
+    _, _, plot, stem = ANALYSES[name]
+    with span(f"plot:{name}", "plot"):
+        fig = plot(**frames)
+    paths = []
+    for fmt in formats:
+        path = os.path.join(out_dir, f"{stem}.{fmt}")
+        with span(f"save:{stem}.{fmt}", "export"):
+            fig.savefig(path, format=fmt, bbox_inches="tight")
+        paths.append(path)
+    plt.close(fig)
+    return paths, time.perf_counter() - start
+
+
+# --- League-wide mode: one team per task, cube shared by every worker ---
+_CUBE = None
+_TOTALS = None
+
+
+def _init_team_worker(cube, totals):
+    global _CUBE, _TOTALS
+    _CUBE, _TOTALS = cube, totals
+
+
+def run_team(team, champion_years, only, out_dir, formats, resamples):
+    """Worker: computes and renders the selected analyses for one team."""
+    team_dir = os.path.join(out_dir, team_slug(team))
+    os.makedirs(team_dir, exist_ok=True)
+    timings, paths = {}, []
+    before = memo_stats().set_index("function")
+    # Heroes are the players of the title seasons: nothing to draw for a team without one
+    only = [name for name in only if name != "heroes" or champion_years]
+    ci = None
+    if resamples and champion_years and set(only) & set(CI_ANALYSES):
+        t = time.perf_counter()
+        # Already one process per team: resample in this worker
+        with span(f"bootstrap:{team}", "aggregate"):
+            ci = champion_intervals(_TOTALS, team=team, champion_years=champion_years, resamples=resamples, workers=1)
+        ci.to_csv(os.path.join(team_dir, "bootstrap_ci.csv"), index=False)
+        timings["bootstrap"] = time.perf_counter() - t
+    for name in only:
+        _, compute, _, _ = ANALYSES[name]
+        t = time.perf_counter()
+        with span(f"compute:{name}", "aggregate", team=team):
+            frames = compute(_CUBE, team=team, champion_years=champion_years)
+        if name in CI_ANALYSES:
+            frames = {**frames, "ci": ci}
+        timings[f"compute:{name}"] = time.perf_counter() - t
+        saved, timings[f"render:{name}"] = render_figure(name, frames, team_dir, formats)
+        paths += saved
+    # Counters are per process: report only this task's share
+    stats = memo_stats().set_index("function").sub(before, fill_value=0).astype(int)
+    return paths, timings, stats.reset_index()
+
+
+def run_all_teams(cube, totals, titles, args):
+    teams = sorted(cube.matches["team"].dropna().astype(str).unique())
+    print(f"Running {len(teams)} teams x {len(args.only)} analyses on {args.workers or os.cpu_count()} workers...")
+    per_team, cache = {}, []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_team_worker, initargs=(cube, totals)) as pool:
+        jobs = {
+            team: pool.submit(run_team, team, titles.get(team, []), args.only, args.out_dir, args.formats,
+                              args.resamples)
+            for team in teams
+        }
+        for team, job in jobs.items():
+            paths, timings, stats = job.result()
+            per_team[team] = timings
+            cache.append(stats)
+            print(f"✓ {team}: {len(paths)} file(s) in {os.path.dirname(paths[0]) if paths else args.out_dir}")
+
+    stages = pd.DataFrame(per_team).T.fillna(0)
+    stages["total"] = stages.sum(axis=1)
+    cache = pd.concat(cache).groupby("function", sort=False).sum().reset_index()
+    return stages, cache
+
+
+def parse_list(value, choices, flag):
+    items = [v.strip() for v in value.split(",") if v.strip()]
+    unknown = [v for v in items if v not in choices]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"{flag}: unknown {', '.join(unknown)} (choose from {', '.join(choices)})")
+    return items
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default="IPL.csv")
+    parser.add_argument("--team", default=TEAM)
+    parser.add_argument("--titles", type=lambda v: [int(y) for y in v.split(",") if y.strip()], default=None,
+                        help="comma-separated title seasons (default: from the data / known winners)")
+    parser.add_argument("--all-teams", action="store_true", help="report every franchise in one pass")
+    parser.add_argument("--only", type=lambda v: parse_list(v, list(ANALYSES), "--only"), default=list(ANALYSES),
+                        help=f"comma-separated subset of: {','.join(ANALYSES)}")
+    parser.add_argument("--formats", type=lambda v: parse_list(v, OUTPUT_FORMATS, "--formats"), default=["png"],
+                        help="comma-separated output formats: png,svg")
+    parser.add_argument("--out-dir", default="reports")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per figure, or one per core with --all-teams)")
+    parser.add_argument("--resamples", type=int, default=RESAMPLES,
+                        help="bootstrap resamples for the interval bars (0 = point estimates only)")
+    parser.add_argument("--trace", nargs="?", const="ipl_trace", default=None,
+                        help="write a stage trace to <prefix>.json / <prefix>.trace.json (or set IPL_TRACE)")
+    args = parser.parse_args(argv)
+    if args.trace:
+        enable_trace(args.trace)
+
+    print(f"--- {'League' if args.all_teams else args.team} Champion DNA Analytics ---")
+    if not os.path.exists(args.csv):
+        print(f"❌ Error: {args.csv} not found.")
+        return 1
+
+    timings = {}
+    start = time.perf_counter()
+    print("Loading Data...")
+    # Pre-aggregated cube (rebuilt only when IPL.csv changes); every metric below is a rollup
+    cube = load_cube(csv_path=args.csv)
+    totals = load_match_totals(csv_path=args.csv)
+    titles = title_seasons(csv_path=args.csv)
+    timings["load"] = time.perf_counter() - start
+    teams = sorted(cube.matches["team"].dropna().astype(str).unique())
+    if not args.all_teams and args.team not in teams:
+        print(f"❌ Error: unknown team {args.team!r}. Teams in {args.csv}: {', '.join(teams)}")
+        return 1
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    if args.all_teams:
+        stages, cache = run_all_teams(cube, totals, titles, args)
+        timings["teams (wall)"] = time.perf_counter() - start - timings["load"]
+        timings["total"] = time.perf_counter() - start
+        print("\n⏱ Per-team stage timings (s)")
+        with pd.option_context("display.float_format", "{:.3f}".format, "display.width", 160):
+            print(stages.to_string())
+        print(f"  sum of team work {stages['total'].sum():.3f}s")
+    else:
+        champion_years = args.titles if args.titles is not None else titles.get(args.team, [])
+        print(f"Title seasons for {args.team}: {champion_years or 'none'}")
+        if not champion_years and "heroes" in args.only:
+            # Heroes are the players of the title seasons (same guard as run_team)
+            print(f"⚠️ Skipping heroes: {args.team} has no title seasons (pass --titles to pick some).")
+            args.only = [name for name in args.only if name != "heroes"]
+            if not args.only:
+                return 0
+        ci = None
+        if args.resamples and champion_years and set(args.only) & set(CI_ANALYSES):
+            print(f"Bootstrapping {args.resamples} match resamples...")
+            t = time.perf_counter()
+            with span("bootstrap", "aggregate"):
+                ci = champion_intervals(totals, team=args.team, champion_years=champion_years,
+                                        resamples=args.resamples, workers=args.workers)
+            timings["bootstrap"] = time.perf_counter() - t
+            path = os.path.join(args.out_dir, "bootstrap_ci.csv")
+            ci.to_csv(path, index=False)
+            print(f"✓ Saved {path}")
+            with pd.option_context("display.float_format", "{:.3f}".format, "display.width", 160):
+                print(ci[["metric", "champion", "champion_lo", "champion_hi",
+                          "other", "other_lo", "other_hi", "diff", "p_value"]].to_string(index=False))
+        frames = {}
+        for i, name in enumerate(args.only, 1):
+            title, compute, _, _ = ANALYSES[name]
+            print(f"[{i}/{len(args.only)}] Computing {title}...")
+            t = time.perf_counter()
+            with span(f"compute:{name}", "aggregate"):
+                frames[name] = compute(cube, team=args.team, champion_years=champion_years)
+            if name in CI_ANALYSES:
+                frames[name] = {**frames[name], "ci": ci}
+            timings[f"compute:{name}"] = time.perf_counter() - t
+
+        print(f"Rendering {len(args.only)} figure(s) as {', '.join(args.formats)}...")
+        t = time.perf_counter()
+        workers = args.workers or len(args.only)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = {name: pool.submit(render_figure, name, frames[name], args.out_dir, args.formats) for name in args.only}
+            for name, job in jobs.items():
+                paths, seconds = job.result()
+                timings[f"render:{name}"] = seconds
+                for path in paths:
+                    print(f"✓ Saved {path}")
+        timings["render (wall)"] = time.perf_counter() - t
+        timings["total"] = time.perf_counter() - start
+        cache = memo_stats()
+
+    print("\n⏱ Stage timings")
+    for stage, seconds in timings.items():
+        print(f"  {stage:<20} {seconds:8.3f}s")
+    print("\n🗄 Result cache")
+    print(cache.to_string(index=False))
+    print("\n✅ Analysis Complete.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
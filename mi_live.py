@@ -0,0 +1,462 @@
+"""
+Live match-day mode: MI aggregates updated ball by ball while a match is on.
+
+Delivery events in the IPL.csv schema arrive from a tailed CSV file (the
+feed appends one row per ball) or from a local TCP socket (a header line,
+then one CSV row per ball). Each event updates running totals held in plain
+dicts: score, phase run rates for both sides, bowler and batter figures,
+the current and best partnerships, the live win probability (one lookup in
+the ipl_winprob table) and the champion-DNA metrics next to their Champion
+Years / Other Years baselines from the cube. An update touches a fixed
+number of counters, so its cost does not grow with the balls already seen.
+
+After every event (or every --every events) a JSON snapshot is written
+atomically to <snapshot-dir>/snapshot.json and appended to snapshots.jsonl.
+Per-event latency is measured from receipt to published snapshot (and from
+the writer's sent_at stamp, when the feed carries one) and reported as
+percentiles over the last LATENCY_WINDOW events.
+
+A historical match can be replayed at accelerated speed to exercise the
+whole path: `replay` writes its balls to a file or socket with the real
+inter-ball gap divided by --speed; without a target it tails its own
+replay file in-process and prints the latency report.
+
+Usage:
+    python mi_live.py follow --file live_feed.csv [--snapshot-dir live] [--idle-timeout 600]
+    python mi_live.py follow --port 5555
+    python mi_live.py replay --match-id 1082591 --speed 120 [--to-file live_feed.csv | --to-port 5555]
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from ipl_cube import PERIOD_LABELS, load_cube
+from ipl_features import SEQUENCE_ORDER, phase_from_over
+from ipl_store import CSV_PATH, load_deliveries
+from ipl_teams import title_seasons
+
+TEAM = "Mumbai Indians"
+SNAPSHOT_DIR = "live"
+SECONDS_PER_BALL = 30.0  # Typical real gap between deliveries, divided by --speed on replay
+LATENCY_WINDOW = 1000
+PHASE_BY_OVER = list(phase_from_over(np.arange(20)).astype(str))
+DNA_METRICS = ["batting_avg", "strike_rate", "economy", "powerplay_rpo", "death_economy"]
+
+
+def _int(value, default=0):
+    if value is None or value == "" or value != value:
+        return default
+    return int(float(value))
+
+
+def _ratio(num, den, scale=1.0):
+    return round(num / den * scale, 2) if den else None
+
+
+def champion_baselines(cube, team=TEAM, champion_years=()):
+    """{metric: {period: value}} for DNA_METRICS from the cube (computed once per session)."""
+    if cube is None or not champion_years:
+        return {}
+    queries = {
+        "batting_avg": ({"batting_team": team}, "batting_avg"),
+        "strike_rate": ({"batting_team": team}, "strike_rate"),
+        "economy": ({"bowling_team": team}, "economy"),
+        "powerplay_rpo": ({"batting_team": team, "phase": "Powerplay"}, "rpo"),
+        "death_economy": ({"bowling_team": team, "phase": "Death"}, "rpo"),
+    }
+    baselines = {}
+    for metric, (where, column) in queries.items():
+        rolled = cube.rollup(["period"], where=where, champion_years=champion_years).set_index("period")[column]
+        baselines[metric] = {period: round(float(rolled.get(period, np.nan)), 2) for period in PERIOD_LABELS}
+    return baselines
+
+
+class LiveMatch:
+    """Running aggregates of one match from `team`'s point of view; update() is O(1) per ball."""
+
+    def __init__(self, match_id, team=TEAM, baselines=None, win_model=None):
+        self.match_id = match_id
+        self.team = team
+        self.baselines = baselines or {}
+        self.win_model = win_model
+        self.events = 0
+        self.venue = None
+        self.venue_bucket = None
+        self.last = None
+        self.innings = {}       # innings -> {"batting_team", "runs", "balls", "wickets", "target", "max_balls"}
+        self.sides = {side: {"runs_batter": 0, "runs_total": 0, "balls": 0, "wickets": 0} for side in ("batting", "bowling")}
+        self.phases = {}        # (side, phase) -> [runs_total, deliveries]
+        self.bowlers = {}       # bowler -> [runs_total, balls, wickets]
+        self.batters = {}       # batter -> [runs, balls]
+        self.partnership = None
+        self.best_partnership = None
+
+    def update(self, event):
+        self.events += 1
+        innings = _int(event.get("innings"), 1)
+        over = _int(event.get("over"))
+        runs_batter, runs_total = _int(event.get("runs_batter")), _int(event.get("runs_total"))
+        valid = _int(event.get("valid_ball"), 1)
+        wicket = bool(event.get("wicket_kind"))
+        batting_team = event.get("batting_team")
+        if self.venue is None:
+            self.venue = event.get("venue")
+            if self.win_model is not None:
+                self.venue_bucket = int(self.win_model.bucket(pd.Series([self.venue]))[0])
+
+        state = self.innings.get(innings)
+        if state is None:
+            first = self.innings.get(1)
+            target = _int(event.get("runs_target"), 0) or (first["runs"] + 1 if innings == 2 and first else None)
+            state = self.innings[innings] = {
+                "batting_team": batting_team, "runs": 0, "balls": 0, "wickets": 0,
+                "target": target, "max_balls": min(_int(event.get("overs"), 20) * 6, 120),
+            }
+            self.partnership = None
+        state["runs"] += runs_total
+        state["balls"] += valid
+        state["wickets"] += wicket
+        self.last = f"{over}.{_int(event.get('ball'))}"
+
+        side = "batting" if batting_team == self.team else "bowling" if event.get("bowling_team") == self.team else None
+        if side is not None and innings <= 2:
+            totals = self.sides[side]
+            totals["runs_batter"] += runs_batter
+            totals["runs_total"] += runs_total
+            totals["balls"] += valid
+            totals["wickets"] += wicket
+            phase = self.phases.setdefault((side, PHASE_BY_OVER[min(over, 19)]), [0, 0])
+            phase[0] += runs_total
+            phase[1] += 1
+
+        bowler = self.bowlers.setdefault(event.get("bowler"), [0, 0, 0])
+        bowler[0] += runs_total
+        bowler[1] += valid
+        bowler[2] += _int(event.get("bowler_wicket"))
+        batter = self.batters.setdefault(event.get("batter"), [0, 0])
+        batter[0] += runs_batter
+        batter[1] += _int(event.get("balls_faced"), valid)
+
+        if self.partnership is None:
+            pair = sorted([event.get("batter") or "", event.get("non_striker") or ""])
+            self.partnership = {"innings": innings, "batting_team": batting_team, "batters": pair, "runs": 0, "balls": 0}
+        self.partnership["runs"] += runs_total
+        self.partnership["balls"] += valid
+        if self.best_partnership is None or self.partnership["runs"] > self.best_partnership["runs"]:
+            self.best_partnership = dict(self.partnership)
+        if wicket:
+            self.partnership = None  # Next ball starts a new stand
+
+    def win_probability(self):
+        """`team`'s live win probability from the state table (None outside innings 1-2)."""
+        if self.win_model is None or not self.innings:
+            return None
+        innings = max(self.innings)
+        state = self.innings[innings]
+        if innings > 2:
+            return None
+        runs = state["runs"] if innings == 1 else (state["target"] or 0) - state["runs"]
+        wp = float(self.win_model.lookup(
+            innings - 1, state["max_balls"] - state["balls"], 10 - state["wickets"], runs, self.venue_bucket))
+        return round(wp if state["batting_team"] == self.team else 1.0 - wp, 3)
+
+    def dna(self):
+        """Live champion-DNA metrics next to the team's Champion / Other Years baselines."""
+        bat, bowl = self.sides["batting"], self.sides["bowling"]
+        pp = self.phases.get(("batting", "Powerplay"), [0, 0])
+        death = self.phases.get(("bowling", "Death"), [0, 0])
+        live = {
+            "batting_avg": _ratio(bat["runs_batter"], bat["wickets"]),
+            "strike_rate": _ratio(bat["runs_batter"], bat["balls"], 100),
+            "economy": _ratio(bowl["runs_total"], bowl["balls"], 6),
+            "powerplay_rpo": _ratio(pp[0], pp[1], 6),
+            "death_economy": _ratio(death[0], death[1], 6),
+        }
+        return {metric: {"live": live[metric], **self.baselines.get(metric, {})} for metric in DNA_METRICS}
+
+    def score(self):
+        """Current innings as '145/3 (16.2)'."""
+        state = self.innings[max(self.innings)] if self.innings else {"runs": 0, "wickets": 0, "balls": 0}
+        return f"{state['runs']}/{state['wickets']} ({state['balls'] // 6}.{state['balls'] % 6})"
+
+    def snapshot(self):
+        innings = max(self.innings) if self.innings else None
+        state = self.innings.get(innings, {})
+        return {
+            "match_id": self.match_id,
+            "events": self.events,
+            "innings": innings,
+            "ball": self.last,
+            "batting_team": state.get("batting_team"),
+            "score": self.score(),
+            "target": state.get("target"),
+            "team": self.team,
+            "win_probability": self.win_probability(),
+            "phase_run_rates": {
+                side: {phase: _ratio(runs, balls, 6) for (s, phase), (runs, balls) in self.phases.items() if s == side}
+                for side in ("batting", "bowling")
+            },
+            "bowlers": {
+                name: {"overs": f"{balls // 6}.{balls % 6}", "runs": runs, "wickets": wickets, "economy": _ratio(runs, balls, 6)}
+                for name, (runs, balls, wickets) in self.bowlers.items()
+            },
+            "batters": {name: {"runs": runs, "balls": balls, "strike_rate": _ratio(runs, balls, 100)}
+                        for name, (runs, balls) in self.batters.items()},
+            "partnership": self.partnership,
+            "best_partnership": self.best_partnership,
+            "champion_dna": self.dna(),
+        }
+
+
+class SnapshotPublisher:
+    """Atomically replaces snapshot.json and appends to snapshots.jsonl."""
+
+    def __init__(self, out_dir=SNAPSHOT_DIR):
+        os.makedirs(out_dir, exist_ok=True)
+        self.path = os.path.join(out_dir, "snapshot.json")
+        self.log = open(os.path.join(out_dir, "snapshots.jsonl"), "a", encoding="utf-8")
+
+    def publish(self, snapshot):
+        text = json.dumps(snapshot)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, self.path)
+        self.log.write(text + "\n")
+        self.log.flush()
+
+    def close(self):
+        self.log.close()
+
+
+class LatencyTracker:
+    """Per-event latencies (ms) over a fixed window, so reporting stays O(1) per event."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.process = deque(maxlen=window)
+        self.end_to_end = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, process_ms, end_to_end_ms=None):
+        self.count += 1
+        self.process.append(process_ms)
+        if end_to_end_ms is not None:
+            self.end_to_end.append(end_to_end_ms)
+
+    def summary(self):
+        out = {"events": self.count}
+        for name, values in [("process_ms", self.process), ("end_to_end_ms", self.end_to_end)]:
+            if values:
+                p50, p95, p99 = np.percentile(list(values), [50, 95, 99])
+                out[name] = {"p50": round(p50, 3), "p95": round(p95, 3), "p99": round(p99, 3), "max": round(max(values), 3)}
+        return out
+
+
+# --- Event sources: yield (event dict, receipt time) ---
+def _parse(header, line):
+    values = next(csv.reader([line]))
+    return dict(zip(header, values))
+
+
+def tail_file(path, poll_interval=0.05, idle_timeout=None):
+    """Follows a growing CSV file (header first), yielding each complete new row."""
+    waited = time.monotonic()
+    while not os.path.exists(path):
+        if idle_timeout is not None and time.monotonic() - waited > idle_timeout:
+            return
+        time.sleep(poll_interval)
+    with open(path, encoding="utf-8", newline="") as f:
+        header, pending, idle_since = None, "", time.monotonic()
+        while True:
+            chunk = f.readline()
+            if not chunk:
+                if idle_timeout is not None and time.monotonic() - idle_since > idle_timeout:
+                    return
+                time.sleep(poll_interval)
+                continue
+            pending += chunk
+            if not pending.endswith("\n"):
+                continue  # Writer is mid-line: wait for the rest
+            line, pending, idle_since = pending.rstrip("\r\n"), "", time.monotonic()
+            if not line:
+                continue
+            if header is None:
+                header = next(csv.reader([line]))
+                continue
+            yield _parse(header, line), time.perf_counter()
+
+
+def listen_socket(port, host="127.0.0.1", idle_timeout=None):
+    """Accepts feed connections on a local TCP port (header line, then CSV rows) one after another."""
+    with socket.create_server((host, port)) as server:
+        server.settimeout(idle_timeout)
+        print(f"Listening on {host}:{port}...")
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                return
+            with conn, conn.makefile("r", encoding="utf-8", newline="") as stream:
+                header = None
+                for line in stream:
+                    line = line.rstrip("\r\n")
+                    if not line:
+                        continue
+                    if header is None:
+                        header = next(csv.reader([line]))
+                        continue
+                    yield _parse(header, line), time.perf_counter()
+
+
+def follow(events, team=TEAM, snapshot_dir=SNAPSHOT_DIR, every=1, baselines=None, win_model=None, quiet=False):
+    """Consumes events, keeps one LiveMatch per match_id and publishes snapshots; returns the LatencyTracker."""
+    publisher = SnapshotPublisher(snapshot_dir)
+    latency = LatencyTracker()
+    match = None
+    try:
+        for event, received in events:
+            match_id = event.get("match_id")
+            if match is None or match.match_id != match_id:
+                if match is not None:
+                    publisher.publish({**match.snapshot(), "final": True, "latency": latency.summary()})
+                match = LiveMatch(match_id, team, baselines, win_model)
+            match.update(event)
+            if match.events % every == 0:
+                publisher.publish({**match.snapshot(), "latency": latency.summary()})
+            done = time.perf_counter()
+            sent_at = event.get("sent_at")
+            latency.add((done - received) * 1000, (time.time() - float(sent_at)) * 1000 if sent_at else None)
+            if not quiet and match.events % 6 == 0:
+                wp = match.win_probability()
+                print(f"  inn {max(match.innings)} {match.last:>5}  {match.score():<14}"
+                      f"{'' if wp is None else f'{team} win {wp:.0%}'}")
+        if match is not None:
+            publisher.publish({**match.snapshot(), "final": True, "latency": latency.summary()})
+    finally:
+        publisher.close()
+    return latency
+
+
+# --- Replay ---
+def match_rows(match_id, csv_path=CSV_PATH):
+    """A historical match's deliveries in ball order, in the IPL.csv schema."""
+    df = load_deliveries(filters=[("match_id", "==", int(match_id))], csv_path=csv_path)
+    if df.empty:
+        raise ValueError(f"match_id {match_id} not found in {csv_path}")
+    return df.drop(columns=["season_year"], errors="ignore").sort_values(SEQUENCE_ORDER, kind="stable")
+
+
+def replay(rows, write, speed=60.0):
+    """Writes a header and one CSV line per ball via write(text), spaced SECONDS_PER_BALL / speed apart."""
+    gap = SECONDS_PER_BALL / speed if speed else 0.0
+    columns = list(rows.columns) + ["sent_at"]
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow(columns)
+    write(buffer.getvalue())
+    for values in rows.itertuples(index=False):
+        if gap:
+            time.sleep(gap)
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerow(["" if pd.isna(v) else v for v in values] + [f"{time.time():.6f}"])
+        write(buffer.getvalue())
+
+
+def _file_writer(path):
+    f = open(path, "w", encoding="utf-8", newline="")
+
+    def write(text):
+        f.write(text)
+        f.flush()
+    return f, write
+
+
+def _session(csv_path, team, use_history):
+    """Champion baselines and win model from the historical dataset (skipped when it is missing)."""
+    if not use_history or not os.path.exists(csv_path):
+        return {}, None
+    from ipl_winprob import load_win_model
+
+    champion_years = title_seasons(csv_path=csv_path).get(team, [])
+    return champion_baselines(load_cube(csv_path=csv_path), team, champion_years), load_win_model(csv_path=csv_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=CSV_PATH, help="historical dataset (baselines, win model, replays)")
+    parser.add_argument("--team", default=TEAM)
+    parser.add_argument("--snapshot-dir", default=SNAPSHOT_DIR)
+    parser.add_argument("--every", type=int, default=1, help="publish a snapshot every N events")
+    parser.add_argument("--no-history", action="store_true", help="skip champion baselines and win probability")
+    parser.add_argument("--quiet", action="store_true")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_follow = sub.add_parser("follow", help="consume a live feed")
+    source = p_follow.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file", help="CSV file the feed appends to")
+    source.add_argument("--port", type=int, help="local TCP port to listen on")
+    p_follow.add_argument("--idle-timeout", type=float, default=None, help="stop after N seconds without events")
+
+    p_replay = sub.add_parser("replay", help="replay a historical match")
+    p_replay.add_argument("--match-id", required=True)
+    p_replay.add_argument("--speed", type=float, default=60.0, help="time compression (0 = no delay)")
+    target = p_replay.add_mutually_exclusive_group()
+    target.add_argument("--to-file", help="append the balls to this file (for a separate `follow`)")
+    target.add_argument("--to-port", type=int, help="send the balls to a `follow --port` listener")
+    args = parser.parse_args(argv)
+
+    if args.command == "follow":
+        baselines, win_model = _session(args.csv, args.team, not args.no_history)
+        events = tail_file(args.file, idle_timeout=args.idle_timeout) if args.file else \
+            listen_socket(args.port, idle_timeout=args.idle_timeout)
+        latency = follow(events, args.team, args.snapshot_dir, args.every, baselines, win_model, args.quiet)
+    else:
+        if not os.path.exists(args.csv):
+            print(f"❌ Error: {args.csv} not found.")
+            return 1
+        rows = match_rows(args.match_id, args.csv)
+        print(f"Replaying match {args.match_id}: {len(rows)} balls at {args.speed:g}x")
+        if args.to_port:
+            with socket.create_connection(("127.0.0.1", args.to_port)) as conn:
+                replay(rows, lambda text: conn.sendall(text.encode("utf-8")), args.speed)
+            return 0
+        if args.to_file:
+            f, write = _file_writer(args.to_file)
+            with f:
+                replay(rows, write, args.speed)
+            return 0
+
+        # Self-contained replay: write the feed in a thread and tail it here
+        baselines, win_model = _session(args.csv, args.team, not args.no_history)
+        os.makedirs(args.snapshot_dir, exist_ok=True)
+        feed = os.path.join(args.snapshot_dir, f"replay_{args.match_id}.csv")
+        f, write = _file_writer(feed)
+        writer = threading.Thread(target=replay, args=(rows, write, args.speed), daemon=True)
+        writer.start()
+        gap = SECONDS_PER_BALL / args.speed if args.speed else 0.0
+        events = tail_file(feed, poll_interval=min(0.05, gap / 4 or 0.01), idle_timeout=max(2.0, 5 * gap))
+        latency = follow(events, args.team, args.snapshot_dir, args.every, baselines, win_model, args.quiet)
+        writer.join()
+        f.close()
+
+    summary = latency.summary()
+    print(f"\n✓ Snapshots in {os.path.join(args.snapshot_dir, 'snapshot.json')} ({summary['events']} events)")
+    print("⏱ Per-event latency (ms)")
+    for name in ["process_ms", "end_to_end_ms"]:
+        if name in summary:
+            stats = summary[name]
+            print(f"  {name:<14} p50 {stats['p50']:8.3f}  p95 {stats['p95']:8.3f}  p99 {stats['p99']:8.3f}  max {stats['max']:8.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
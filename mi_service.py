@@ -0,0 +1,383 @@
+"""
+Warm in-memory query service for the champion metrics.
+
+Every one-off question used to start a Python process, import
+pandas/matplotlib/seaborn and re-read the dataset before running a single
+rollup. This service loads the OLAP cube, the per-match bootstrap totals and
+the title seasons once, keeps them in memory, and answers JSON queries over
+HTTP (asyncio, standard library only).
+
+Queries run on a process pool whose workers receive the warm frames when
+they start, so a slow query (e.g. a 10,000-resample bootstrap) never blocks
+the event loop or other clients. Identical concurrent queries share one
+computation, and results are kept in a small LRU keyed by the query (the
+data cannot change while the service runs; restart it after IPL.csv does).
+
+Endpoints (GET, JSON):
+    /health                     status, dataset version, request/cache counters
+    /teams                      franchises and their title seasons
+    /core, /phase, /strategy    Champion vs Other Years metrics
+                                ?team=&titles=2013,2015&ci=1&resamples=2000
+    /heroes                     top run scorers / wicket takers of the title seasons
+    /venues                     win % by venue     ?team=&seasons=2019,2020&min_matches=3
+    /batters, /bowlers          batter / bowler dimensions
+                                ?team=&seasons=&min_balls=120&top=20
+
+Usage:
+    python mi_service.py [--csv IPL.csv] [--port 8765] [--workers 4]
+    curl "http://127.0.0.1:8765/venues?team=Chennai+Super+Kings&min_matches=5"
+    python bench_service.py --clients 32 --requests 2000   # load test
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from ipl_bootstrap import RESAMPLES, load_match_totals
+from ipl_cube import load_cube
+from ipl_store import CSV_PATH
+from ipl_teams import title_seasons
+from ipl_trace import enable as enable_trace, span
+from mi_champion_analytics import ANALYSES, CI_ANALYSES, TEAM, champion_intervals
+
+HOST = "127.0.0.1"
+PORT = 8765
+RESULT_CACHE_SIZE = 512
+MAX_LINE_BYTES = 8192
+
+
+def _years(value):
+    return tuple(sorted({int(y) for y in value.split(",") if y.strip()}))
+
+
+def _flag(value):
+    if value.lower() not in ("0", "1", "true", "false", "yes", "no"):
+        raise ValueError(value)
+    return value.lower() in ("1", "true", "yes")
+
+
+# Query parameters: name -> (parser, default)
+PARAMS = {
+    "team": (str, TEAM),
+    "titles": (_years, None),     # champion seasons (default: the team's titles)
+    "seasons": (_years, None),    # season_year filter (default: all)
+    "ci": (_flag, False),
+    "resamples": (int, RESAMPLES),
+    "min_balls": (int, 120),
+    "min_matches": (int, 3),
+    "top": (int, 0),              # 0 = every row
+}
+
+
+# --- Queries (run in the worker processes) ---
+_CUBE = None
+_TOTALS = None
+_TITLES = None
+
+
+def _init_worker(cube, totals, titles):
+    global _CUBE, _TOTALS, _TITLES
+    _CUBE, _TOTALS, _TITLES = cube, totals, titles
+
+
+def _champion_years(params):
+    titles = params["titles"]
+    return list(titles) if titles is not None else _TITLES.get(params["team"], [])
+
+
+def _season_filter(where, params):
+    if params["seasons"] is not None:
+        where["season_year"] = list(params["seasons"])
+    return where
+
+
+def _top(frame, params):
+    return frame.head(params["top"]) if params["top"] > 0 else frame
+
+
+def champion_query(name, params):
+    """One of the report's analyses, plus its bootstrap intervals when ci=1."""
+    champion_years = _champion_years(params)
+    result = dict(ANALYSES[name][1](_CUBE, team=params["team"], champion_years=champion_years))
+    result["champion_years"] = champion_years
+    if params.get("ci") and name in CI_ANALYSES and champion_years:
+        # Already one query per worker: resample in this process
+        result["ci"] = champion_intervals(_TOTALS, team=params["team"], champion_years=champion_years,
+                                          resamples=params["resamples"], workers=1)
+    return result
+
+
+def venue_query(params):
+    where = _season_filter({"team": params["team"]}, params)
+    venues = _CUBE.rollup(["venue"], table="matches", where=where)
+    venues = venues[venues["matches"] >= params["min_matches"]]
+    return {"venues": venues.sort_values(["win_pct", "matches"], ascending=False)}
+
+
+def batter_query(params):
+    batters = _CUBE.rollup(["batter"], where=_season_filter({"batting_team": params["team"]}, params))
+    batters = batters[batters["balls"] >= params["min_balls"]].sort_values("runs_batter", ascending=False)
+    cols = ["batter", "runs_batter", "balls", "wickets", "batting_avg", "strike_rate",
+            "fours", "sixes", "dot_pct", "boundary_pct"]
+    return {"batters": _top(batters[cols], params)}
+
+
+def bowler_query(params):
+    bowlers = _CUBE.rollup(["bowler"], where=_season_filter({"bowling_team": params["team"]}, params))
+    bowlers = bowlers[bowlers["balls"] >= params["min_balls"]].sort_values("bowler_wickets", ascending=False)
+    cols = ["bowler", "balls", "runs_total", "bowler_wickets", "economy", "bowling_avg", "dot_pct"]
+    return {"bowlers": _top(bowlers[cols], params)}
+
+
+# endpoint -> (function(params) -> dict, accepted parameters)
+CHAMPION_PARAMS = ["team", "titles", "ci", "resamples"]
+QUERIES = {
+    "core": (lambda p: champion_query("core", p), CHAMPION_PARAMS),
+    "phase": (lambda p: champion_query("phase", p), CHAMPION_PARAMS),
+    "strategy": (lambda p: champion_query("strategy", p), CHAMPION_PARAMS),
+    "heroes": (lambda p: champion_query("heroes", p), ["team", "titles"]),
+    "venues": (venue_query, ["team", "seasons", "min_matches"]),
+    "batters": (batter_query, ["team", "seasons", "min_balls", "top"]),
+    "bowlers": (bowler_query, ["team", "seasons", "min_balls", "top"]),
+}
+
+
+def _jsonable(value):
+    if isinstance(value, pd.DataFrame):
+        frame = value.astype(object).where(value.notna(), None)
+        return [{k: _jsonable(v) for k, v in row.items()} for row in frame.to_dict("records")]
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def run_query(name, params):
+    """Worker entry point: runs one query and returns the encoded JSON body."""
+    with span(f"query:{name}", "stage", **params):
+        result = QUERIES[name][0](params)
+    return json.dumps(_jsonable(result)).encode("utf-8")
+
+
+# --- Service ---
+def parse_params(name, query):
+    """Validated, hashable parameters for an endpoint (ValueError on bad input)."""
+    accepted = QUERIES[name][1]
+    raw = dict(parse_qsl(query, keep_blank_values=True))
+    unknown = sorted(set(raw) - set(accepted))
+    if unknown:
+        raise ValueError(f"Unknown parameter(s) for /{name}: {', '.join(unknown)} (accepted: {', '.join(accepted)})")
+    params = {}
+    for key in accepted:
+        parse, default = PARAMS[key]
+        try:
+            params[key] = parse(raw[key]) if raw.get(key, "") != "" else default
+        except ValueError:
+            raise ValueError(f"Bad value for '{key}': {raw[key]!r}")
+    return params
+
+
+class QueryService:
+    """Routes requests, coalesces identical queries and caches their results."""
+
+    def __init__(self, cube, totals, titles, workers=None, cache_size=RESULT_CACHE_SIZE):
+        self.version = cube.version
+        self.titles = titles
+        self.teams = sorted(cube.matches["team"].dropna().astype(str).unique())
+        self.workers = workers or os.cpu_count()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                        initargs=(cube, totals, titles))
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.inflight = {}
+        self.started = time.time()
+        self.counters = {"requests": 0, "queries": 0, "cache_hits": 0, "coalesced": 0, "errors": 0}
+
+    async def warm_up(self):
+        """Starts every worker up front so the first clients do not pay for it."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, os.getpid) for _ in range(self.workers)))
+
+    async def query(self, name, params):
+        key = (name, tuple(sorted(params.items())))
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.counters["cache_hits"] += 1
+            return self.cache[key]
+        if key in self.inflight:
+            self.counters["coalesced"] += 1
+            return await asyncio.shield(self.inflight[key])
+
+        self.counters["queries"] += 1
+        future = asyncio.get_running_loop().run_in_executor(self.pool, run_query, name, params)
+        self.inflight[key] = future
+        try:
+            body = await future
+        finally:
+            del self.inflight[key]
+        self.cache[key] = body
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return body
+
+    def health(self):
+        return {
+            "status": "ok", "version": self.version, "workers": self.workers,
+            "uptime_s": round(time.time() - self.started, 1), "cached_results": len(self.cache), **self.counters,
+        }
+
+    async def respond(self, method, target):
+        """(status, JSON body) for one request."""
+        if method != "GET":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Only GET is supported."}
+        url = urlsplit(target)
+        name = url.path.strip("/")
+        if name == "health":
+            return HTTPStatus.OK, self.health()
+        if name == "teams":
+            return HTTPStatus.OK, {"teams": [{"team": t, "titles": self.titles.get(t, [])} for t in self.teams]}
+        if name == "":
+            return HTTPStatus.OK, {"endpoints": ["/health", "/teams"] + [f"/{q}" for q in QUERIES]}
+        if name not in QUERIES:
+            return HTTPStatus.NOT_FOUND, {"error": f"Unknown endpoint /{name}."}
+        try:
+            params = parse_params(name, url.query)
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        if params["team"] not in self.teams:
+            return HTTPStatus.BAD_REQUEST, {"error": f"Unknown team {params['team']!r} (see /teams)."}
+        try:
+            return HTTPStatus.OK, await self.query(name, params)
+        except Exception as e:  # Worker failure: report it, keep serving
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+
+    async def handle(self, reader, writer):
+        """One client connection; HTTP/1.1 keep-alive until the client closes it."""
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except (ValueError, asyncio.LimitOverrunError, asyncio.IncompleteReadError):
+                    writer.write(_response(HTTPStatus.BAD_REQUEST, {"error": "Malformed request."}, False))
+                    break
+                if request is None:
+                    break
+                method, target, version, headers = request
+                self.counters["requests"] += 1
+                status, body = await self.respond(method, target)
+                if status >= 400:
+                    self.counters["errors"] += 1
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+                writer.write(_response(status, body, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+async def _read_request(reader):
+    """(method, target, version, headers), or None when the client closed the connection."""
+    line = await reader.readline()
+    if not line:
+        return None
+    method, target, version = line.decode("latin-1").split()
+    headers = {}
+    while True:
+        header = await reader.readline()
+        if header in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = header.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0) or 0)
+    if length:
+        await reader.readexactly(length)
+    return method, target, version, headers
+
+
+def _response(status, body, keep_alive):
+    payload = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + payload
+
+
+async def serve(csv_path=CSV_PATH, host=HOST, port=PORT, workers=None, cache_size=RESULT_CACHE_SIZE):
+    print("Loading data...")
+    start = time.perf_counter()
+    with span("service:load", "load"):
+        cube = load_cube(csv_path=csv_path)
+        totals = load_match_totals(csv_path=csv_path)
+        titles = title_seasons(csv_path=csv_path)
+    service = QueryService(cube, totals, titles, workers, cache_size)
+    await service.warm_up()
+    server = await asyncio.start_server(service.handle, host, port, limit=MAX_LINE_BYTES)
+    print(f"✓ Ready in {time.perf_counter() - start:.2f}s: {len(service.teams)} teams, "
+          f"{service.workers} worker(s), http://{host}:{server.sockets[0].getsockname()[1]}/")
+    # SIGTERM (e.g. from a supervisor) stops the server cleanly, so the workers are shut down too
+    loop = asyncio.get_running_loop()
+    serving = asyncio.ensure_future(server.serve_forever())
+    if hasattr(signal, "SIGTERM"):
+        try:
+            loop.add_signal_handler(signal.SIGTERM, serving.cancel)
+        except NotImplementedError:  # Windows event loops
+            pass
+    try:
+        async with server:
+            await serving
+    except asyncio.CancelledError:
+        print("Stopped.")
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=None, help="query worker processes (default: one per core)")
+    parser.add_argument("--cache-size", type=int, default=RESULT_CACHE_SIZE, help="query results kept in memory")
+    parser.add_argument("--trace", nargs="?", const="ipl_trace", default=None,
+                        help="write a query trace to <prefix>.json / <prefix>.trace.json on shutdown")
+    args = parser.parse_args(argv)
+    if args.trace:
+        enable_trace(args.trace)
+
+    if not os.path.exists(args.csv):
+        print(f"❌ Error: {args.csv} not found.")
+        return 1
+    try:
+        asyncio.run(serve(args.csv, args.host, args.port, args.workers, args.cache_size))
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Slim, integer-keyed fact export for the MI Power BI dashboard.
+
+MI_Fact_Deliveries.csv repeats every match-level field (event, toss, result,
+venue, city, player of the match, ...) and the player names as strings on
+each delivery, which makes both the export and the dashboard import slow.
+export_slim() rewrites it as a normalized set of files:
+
+- MI_Fact_Slim.csv               one row per delivery: integer surrogate keys
+                                 (match_id_key, season_id, venue_id, batter_id,
+                                 opp_bowler_id, ...) and numeric measures only
+- MI_Dim_Match_Details.csv       MI_Dim_Matches plus every match-level
+                                 attribute, keyed by match_id_key
+- MI_Dim_Opposition_Players.csv  opposition bowlers and fielders (MI_Dim_Bowlers
+                                 only holds MI bowlers, who never bowl on MI's
+                                 batting deliveries, so there is no bowler_id)
+- MI_Dim_Codes.csv               (field, code, label) for the remaining
+                                 categorical columns: extra_type, wicket_kind, ...
+
+Keys of the two new lookups are appended to the previous export and never
+renumbered, like the other surrogate keys. The run reports file size and
+load time against the wide fact file.
+
+Usage:
+    from mi_slim_fact import export_slim
+
+    report = export_slim(tables)        # tables as returned by update_star_schema()
+
+    python mi_slim_fact.py [--out-dir .]
+    python mi_star_schema.py --slim
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from ipl_store import CATEGORY_COLS
+from ipl_trace import traced
+from mi_star_schema import FACT_FILE, save_csv_safe
+from mi_warehouse import DIMENSIONS, FACT_CHUNK_ROWS, fact_keys
+
+SLIM_FACT_FILE = "MI_Fact_Slim.csv"
+MATCH_DETAILS_FILE = "MI_Dim_Match_Details.csv"
+OPPOSITION_FILE = "MI_Dim_Opposition_Players.csv"
+CODES_FILE = "MI_Dim_Codes.csv"
+
+# Constant within a match: moved to the match dimension
+MATCH_ATTRS = [
+    "date", "match_type", "event_name", "bowling_team", "player_of_match", "match_won_by",
+    "win_outcome", "toss_winner", "toss_decision", "venue", "city", "day", "month", "year",
+    "season", "season_year", "gender", "team_type", "superover_winner", "result_type",
+    "method", "balls_per_over", "overs", "event_match_no", "stage", "match_number",
+]
+# Dropped outright: replaced by keys, always the team itself, derivable from two keys,
+# or always empty (bowler_id: MI bowlers never bowl to MI; opp_bowler_id keys the bowler)
+DROP_COLS = ["match_id", "batting_team", "partners", "bowler_id"]
+# MI batters -> MI_Dim_Batters.batter_id
+BATTER_KEYS = {
+    "batter": "batter_id", "non_striker": "non_striker_id", "player_out": "player_out_id",
+    "new_batter": "new_batter_id", "next_batter": "next_batter_id", "review_batter": "review_batter_id",
+}
+# Opposition players -> MI_Dim_Opposition_Players.opp_player_id
+OPPOSITION_KEYS = {"bowler": "opp_bowler_id", "fielders": "fielder_id"}
+BOOL_COLS = ["runs_not_boundary", "umpires_call", "striker_out"]
+KEY_COLS = ["match_id_key", "season_id", "venue_id", "batter_id"]
+
+
+def _extend(lookup, labels, key, label):
+    """Appends unseen labels with the next keys; existing keys never change."""
+    new = pd.Index(labels.dropna().astype(str).unique()).difference(lookup[label].astype(str))
+    start = int(lookup[key].max()) + 1 if len(lookup) else 1
+    added = pd.DataFrame({key: np.arange(start, start + len(new)), label: new.to_numpy()})
+    return pd.concat([lookup, added], ignore_index=True)
+
+
+def _map(values, lookup, key, label):
+    labels = values.astype(str).where(values.notna())
+    return labels.map(lookup.set_index(label)[key]).astype("Int64")
+
+
+def _numeric(values, name):
+    """Numeric measure; integral floats (gaps from NaN) are written as integers."""
+    if name in BOOL_COLS:
+        return values.map({True: 1, False: 0, "True": 1, "False": 0}).astype("Int8")
+    try:
+        values = pd.to_numeric(values)
+    except (TypeError, ValueError):
+        raise ValueError(f"Fact column '{name}' is not numeric; add it to the slim export's key or code columns.")
+    if pd.api.types.is_float_dtype(values) and (values.dropna() % 1 == 0).all():
+        return values.astype("Int64")
+    return values
+
+
+def _load_lookups(out_dir):
+    opposition = pd.DataFrame({"opp_player_id": pd.Series(dtype=int), "player": pd.Series(dtype=str)})
+    codes = pd.DataFrame({"field": pd.Series(dtype=str), "code": pd.Series(dtype=int), "label": pd.Series(dtype=str)})
+    path = os.path.join(out_dir, OPPOSITION_FILE)
+    if os.path.exists(path):
+        opposition = pd.read_csv(path, dtype={"player": str})
+    path = os.path.join(out_dir, CODES_FILE)
+    if os.path.exists(path):
+        codes = pd.read_csv(path, dtype={"field": str, "label": str})
+    return {"opposition": opposition, "codes": {f: g[["code", "label"]] for f, g in codes.groupby("field")}}
+
+
+def slim_rows(chunk, dims, lookups, code_cols):
+    """Integer keys and numeric measures for a chunk of wide fact rows (extends `lookups`)."""
+    chunk = fact_keys(chunk, dims)
+    match_keys = dims["dim_matches"].set_index("match_id")["match_id_key"]
+    slim = pd.DataFrame({"match_id_key": chunk["match_id"].map(match_keys).astype("Int64")}, index=chunk.index)
+    for col in KEY_COLS[1:]:
+        slim[col] = chunk[col]
+
+    batters = dims["dim_batters"][["batter_id", "batter"]]
+    for col, key in BATTER_KEYS.items():
+        if col in chunk.columns and key not in slim.columns:
+            slim[key] = _map(chunk[col], batters, "batter_id", "batter")
+    for col, key in OPPOSITION_KEYS.items():
+        if col in chunk.columns:
+            lookups["opposition"] = _extend(lookups["opposition"], chunk[col], "opp_player_id", "player")
+            slim[key] = _map(chunk[col], lookups["opposition"], "opp_player_id", "player")
+
+    skip = set(MATCH_ATTRS + DROP_COLS + list(BATTER_KEYS) + list(OPPOSITION_KEYS) + list(slim.columns))
+    for col in chunk.columns:
+        if col in skip:
+            continue
+        if col in code_cols:
+            empty = pd.DataFrame({"code": pd.Series(dtype=int), "label": pd.Series(dtype=str)})
+            lookups["codes"][col] = _extend(lookups["codes"].get(col, empty), chunk[col], "code", "label")
+            slim[f"{col}_code"] = _map(chunk[col], lookups["codes"][col], "code", "label")
+        else:
+            slim[col] = _numeric(chunk[col], col)
+    return slim
+
+
+def match_details(match_dim, firsts):
+    """The match dimension with every match-level attribute and its season/venue keys."""
+    extra = [c for c in ["season_id", "venue_id"] + MATCH_ATTRS if c in firsts.columns and c not in match_dim.columns]
+    details = match_dim.merge(firsts[["match_id"] + extra], on="match_id", how="left")
+    details = details.rename(columns={"bowling_team": "opponent"})
+    for col in ["season_id", "venue_id"]:
+        details[col] = details[col].astype("Int64")
+    return details
+
+
+def _load_seconds(paths, repeat=3):
+    """Best-of-`repeat` time to read the files with pandas (as the dashboard import would)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            pd.read_csv(path, low_memory=False)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def size_report(wide_paths, slim_paths, repeat=3):
+    """File size, fact-table width and load time of the wide vs slim exports (fact file first)."""
+    rows = []
+    for label, paths in [("wide", wide_paths), ("slim", slim_paths)]:
+        rows.append({
+            "export": label, "files": len(paths), "fact_columns": len(pd.read_csv(paths[0], nrows=0).columns),
+            "size_mb": sum(os.path.getsize(p) for p in paths) / 1e6, "load_s": _load_seconds(paths, repeat),
+        })
+    report = pd.DataFrame(rows).set_index("export")
+    report.loc["reduction"] = 1 - report.loc["slim"] / report.loc["wide"]
+    return report
+
+
+@traced(category="export", rows=None)
+def export_slim(tables, fact_path=FACT_FILE, out_dir=".", chunk_rows=FACT_CHUNK_ROWS, repeat=3):
+    """
+    Writes the slim fact table and its match / lookup dimensions next to the
+    wide exports and returns the size / load-time report.
+
+    tables: {CSV name: DataFrame} as returned by update_star_schema(); the
+    wide fact table is streamed from `fact_path` in chunks.
+    """
+    out = lambda name: os.path.join(out_dir, name)
+    dims = {table: tables[name] for name, (table, _, _) in DIMENSIONS.items()}
+    lookups = _load_lookups(out_dir)
+    header = pd.read_csv(fact_path, nrows=0).columns
+    code_cols = [c for c in CATEGORY_COLS + ["phase"] if c in header and c not in MATCH_ATTRS + list(BATTER_KEYS) + list(OPPOSITION_KEYS) + DROP_COLS]
+
+    tmp_path = f"{out(SLIM_FACT_FILE)}.{os.getpid()}.tmp"
+    firsts = []
+    rows = unmapped = 0
+    try:
+        for i, chunk in enumerate(pd.read_csv(fact_path, chunksize=chunk_rows, dtype={c: str for c in code_cols}, low_memory=False)):
+            slim = slim_rows(chunk, dims, lookups, code_cols)
+            slim.to_csv(tmp_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+            keyed = chunk.assign(season_id=slim["season_id"], venue_id=slim["venue_id"])
+            firsts.append(keyed.drop_duplicates("match_id"))
+            rows += len(slim)
+            unmapped += int((chunk["batter"].notna() & slim["batter_id"].isna()).sum())
+        os.replace(tmp_path, out(SLIM_FACT_FILE))
+    except PermissionError:
+        print(f"❌ ERROR: Could not save '{out(SLIM_FACT_FILE)}'. Close it in Excel/Power BI and re-run.")
+        raise
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    print(f"✓ Saved: {out(SLIM_FACT_FILE)} ({rows} deliveries)")
+    if unmapped:
+        print(f"⚠️ {unmapped} deliveries have a batter missing from MI_Dim_Batters (batter_id left empty).")
+
+    firsts = pd.concat(firsts, ignore_index=True).drop_duplicates("match_id") if firsts else pd.DataFrame({"match_id": []})
+    save_csv_safe(match_details(dims["dim_matches"], firsts), out(MATCH_DETAILS_FILE))
+    save_csv_safe(lookups["opposition"], out(OPPOSITION_FILE))
+    codes = [g.assign(field=f)[["field", "code", "label"]] for f, g in lookups["codes"].items()]
+    save_csv_safe(pd.concat(codes, ignore_index=True) if codes else pd.DataFrame(columns=["field", "code", "label"]), out(CODES_FILE))
+
+    report = size_report(
+        [fact_path], [out(n) for n in [SLIM_FACT_FILE, MATCH_DETAILS_FILE, OPPOSITION_FILE, CODES_FILE]], repeat)
+    wide, slim = report.loc["wide"], report.loc["slim"]
+    print(f"\nSlim export vs {os.path.basename(fact_path)}:")
+    print(f"  size: {wide['size_mb']:.2f} MB -> {slim['size_mb']:.2f} MB ({report.loc['reduction', 'size_mb']:.0%} smaller)")
+    print(f"  load: {wide['load_s']:.3f}s -> {slim['load_s']:.3f}s ({report.loc['reduction', 'load_s']:.0%} faster)")
+    print(f"  fact columns: {wide['fact_columns']:.0f} -> {slim['fact_columns']:.0f} "
+          f"(match attributes and labels in {slim['files'] - 1:.0f} dimension files)")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write the slim, integer-keyed MI fact export.")
+    parser.add_argument("--out-dir", default=".", help="directory holding the exported CSVs")
+    parser.add_argument("--repeat", type=int, default=3, help="load-time measurements (best is reported)")
+    args = parser.parse_args(argv)
+
+    names = list(DIMENSIONS)
+    missing = [n for n in names + [FACT_FILE] if not os.path.exists(os.path.join(args.out_dir, n))]
+    if missing:
+        print(f"❌ Error: {', '.join(missing)} not found. Run data_preparation.ipynb first.")
+        return 1
+    tables = {n: pd.read_csv(os.path.join(args.out_dir, n), low_memory=False) for n in names}
+    export_slim(tables, os.path.join(args.out_dir, FACT_FILE), args.out_dir, repeat=args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
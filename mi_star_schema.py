@@ -0,0 +1,606 @@
+"""
+Incremental star-schema build for the MI Power BI dashboard.
+
+data_preparation.ipynb used to rebuild the fact, dimension and summary CSVs
+from the whole history on every refresh. This module keeps a small state
+directory next to the exports instead:
+
+- manifest.json      processed match_ids, fact file size and columns
+- sums_<name>.csv    mergeable partial sums per batter/bowler/season/venue/phase
+                     (counts of distinct matches add up because every run only
+                     sees matches that were never processed before)
+- dim_<name>.csv     match/season/venue dimensions with their surrogate keys
+
+Each refresh appends only new matches' deliveries to MI_Fact_Deliveries.csv,
+merges their partial sums, and re-derives the (small) dimension and summary
+tables. Surrogate keys (batter_id, bowler_id, match_id_key, season_id,
+venue_id) are assigned once and never renumbered.
+
+For workers that cannot hold the whole CSV, stream_star_schema() reads it in
+chunks instead: columns are projected and rows filtered to the team while
+parsing, completed matches are fed through the same steps batch by batch
+(the partial sums merge exactly as across refreshes), and the chunk size is
+derived from a peak-RSS budget.
+
+Usage:
+    from mi_star_schema import update_star_schema
+
+    tables = update_star_schema(df, "Mumbai Indians")
+
+    python mi_star_schema.py --stream --memory-mb 512 [--csv IPL.csv] [--team "Mumbai Indians"]
+    python mi_star_schema.py --warehouse          # also refresh MI_Warehouse.sqlite (see mi_warehouse)
+    python mi_star_schema.py --slim               # also write the integer-keyed fact export (see mi_slim_fact)
+    python mi_star_schema.py --trace [prefix]     # stage timings / memory (see ipl_trace)
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from ipl_features import PHASE_SCHEMES, derive_features, season_year_from
+from ipl_store import apply_schema
+from ipl_trace import enable as enable_trace, span, traced
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STATE_DIR = "mi_prep_state"
+FACT_FILE = "MI_Fact_Deliveries.csv"
+
+FACT_COLS = [
+    "match_id", "date", "match_type", "event_name", "innings", "batting_team",
+    "bowling_team", "over", "ball", "ball_no", "batter", "bat_pos", "runs_batter",
+    "balls_faced", "bowler", "valid_ball", "runs_extras", "runs_total",
+    "runs_bowler", "runs_not_boundary", "extra_type", "non_striker",
+    "non_striker_pos", "wicket_kind", "player_out", "fielders", "runs_target",
+    "review_batter", "team_reviewed", "review_decision", "umpire",
+    "umpires_call", "player_of_match", "match_won_by", "win_outcome",
+    "toss_winner", "toss_decision", "venue", "city", "day", "month", "year",
+    "season", "gender", "team_type", "superover_winner", "result_type",
+    "method", "balls_per_over", "overs", "event_match_no", "stage",
+    "match_number", "team_runs", "team_balls", "team_wicket", "new_batter",
+    "batter_runs", "batter_balls", "bowler_wicket", "batting_partners",
+    "next_batter", "striker_out"
+]
+
+# Partial sums: (source frame, key column, {output: (input column, agg)}).
+# "nunique" on match_id is additive because batches never share a match.
+SUM_SPECS = {
+    "batter": ("batting", "batter", {
+        "runs": ("runs_batter", "sum"),
+        "balls": ("balls_faced", "sum"),
+        "innings": ("match_id", "nunique"),
+        "boundaries": ("is_boundary", "sum"),
+        "dots": ("is_dot", "sum"),
+    }),
+    "bowler": ("bowling", "bowler", {
+        "runs_conceded": ("runs_total", "sum"),
+        "balls_bowled": ("valid_ball", "sum"),
+        "wickets": ("bowler_wicket", "sum"),
+        "matches": ("match_id", "nunique"),
+    }),
+    "season": ("batting", "season", {
+        "runs_scored": ("runs_total", "sum"),
+        "balls_faced": ("valid_ball", "sum"),
+        "matches": ("match_id", "nunique"),
+        "boundaries": ("is_boundary", "sum"),
+        "wickets": ("is_wicket", "sum"),
+    }),
+    "venue": ("batting", "venue", {
+        "runs": ("runs_total", "sum"),
+        "balls": ("valid_ball", "sum"),
+        "matches": ("match_id", "nunique"),
+    }),
+    "phase": ("batting", "phase", {
+        "runs": ("runs_total", "sum"),
+        "balls": ("valid_ball", "sum"),
+    }),
+}
+# Surrogate key column carried in the partial-sum tables
+SUM_KEYS = {"batter": "batter_id", "bowler": "bowler_id"}
+
+MATCH_GROUP_COLS = ["match_id", "season", "match_number", "venue", "city", "date"]
+MATCH_FIRST_COLS = ["match_type", "toss_winner", "match_won_by", "result_type"]
+
+
+def save_csv_safe(df, filename):
+    """Attempts to save a CSV and catches PermissionError if the file is open."""
+    try:
+        with span(f"save:{os.path.basename(filename)}", "export", rows=len(df)):
+            df.to_csv(filename, index=False)
+        print(f"✓ Saved: {filename}")
+    except PermissionError:
+        print(f"❌ ERROR: Could not save '{filename}'.")
+        print("   DETAILS: The file is currently open in another program (Excel/Power BI).")
+        print("   ACTION: Please close the file and try running this cell again.")
+
+
+def clean_seasons(df):
+    """Convert '2007/08' to '2008' to avoid plotting errors (in place)."""
+    if "season" in df.columns:
+        if "season_year" not in df.columns:
+            # From the raw label first: "2007/08" -> 2007 like the cube (the cleaned "2008" would give 2008)
+            df["season_year"] = season_year_from(df["season"])
+        df["season"] = df["season"].astype(str).replace("2007/08", "2008")
+    return df
+
+
+# --- State ---
+def load_state(state_dir=STATE_DIR, full=False):
+    """Loads the incremental build state; `full=True` starts from scratch."""
+    state = {
+        "processed_matches": set(),
+        "fact_bytes": 0,
+        "fact_columns": None,
+        "sums": {},
+        "dims": {},
+        "new_match_ids": [],
+    }
+    manifest_path = os.path.join(state_dir, "manifest.json")
+    if full or not os.path.exists(manifest_path):
+        return state
+
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    state["processed_matches"] = set(manifest["processed_matches"])
+    state["fact_bytes"] = manifest["fact_bytes"]
+    state["fact_columns"] = manifest["fact_columns"]
+    for name in SUM_SPECS:
+        path = os.path.join(state_dir, f"sums_{name}.csv")
+        if os.path.exists(path):
+            state["sums"][name] = pd.read_csv(path, low_memory=False)
+    for name in ["matches", "seasons", "venues"]:
+        path = os.path.join(state_dir, f"dim_{name}.csv")
+        if os.path.exists(path):
+            state["dims"][name] = pd.read_csv(path, low_memory=False)
+    if "seasons" in state["dims"]:
+        state["dims"]["seasons"]["season"] = state["dims"]["seasons"]["season"].astype(str)
+    return state
+
+
+def save_state(state, state_dir=STATE_DIR):
+    """Persists partial sums, key tables and the manifest (manifest last)."""
+    os.makedirs(state_dir, exist_ok=True)
+    for name, table in state["sums"].items():
+        table.to_csv(os.path.join(state_dir, f"sums_{name}.csv"), index=False)
+    for name, table in state["dims"].items():
+        table.to_csv(os.path.join(state_dir, f"dim_{name}.csv"), index=False)
+    manifest = {
+        "processed_matches": sorted(int(m) for m in state["processed_matches"]),
+        "fact_bytes": state["fact_bytes"],
+        "fact_columns": state["fact_columns"],
+    }
+    tmp_path = os.path.join(state_dir, "manifest.json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, os.path.join(state_dir, "manifest.json"))
+
+
+# --- Step 1: New Deliveries ---
+@traced(category="derive", rows=lambda frames: len(frames[2]))
+def select_new_deliveries(df, team, state, match_index=None):
+    """
+    Splits unseen matches into (batting, bowling, all) frames for `team`.
+
+    With a match index (and the full, unfiltered deliveries frame) the team's
+    new matches come from the index and are sliced by row offsets instead of
+    scanning every delivery.
+    """
+    if match_index is not None:
+        state["new_match_ids"] = match_index.match_ids(team, exclude=state["processed_matches"])
+        mi_all = match_index.take(df, state["new_match_ids"]).copy()
+        return mi_all[mi_all["batting_team"] == team].copy(), mi_all[mi_all["bowling_team"] == team].copy(), mi_all
+
+    is_new = ~df["match_id"].isin(state["processed_matches"])
+    batting = df["batting_team"] == team
+    bowling = df["bowling_team"] == team
+    mi_all = df[is_new & (batting | bowling)].copy()
+    state["new_match_ids"] = sorted(mi_all["match_id"].unique().tolist())
+    return df[is_new & batting].copy(), df[is_new & bowling].copy(), mi_all
+
+
+# --- Step 2: Fact Table ---
+@traced(category="derive")
+def fact_rows(mi_batting):
+    """Projects batting deliveries to the fact columns plus derived features."""
+    existing_cols = [c for c in FACT_COLS if c in mi_batting.columns]
+    fact = mi_batting[existing_cols].copy()
+    derive_features(fact, phase_scheme="prep")
+    if "season_year" in mi_batting.columns:
+        # Keep the season_year of the raw label (clean_seasons has rewritten "2007/08" -> "2008")
+        fact["season_year"] = mi_batting["season_year"].to_numpy()
+    return fact
+
+
+@traced(category="export", rows=None)
+def append_fact(fact, state, path=FACT_FILE):
+    """
+    Appends new fact rows to the CSV export.
+
+    The file is first truncated to the size recorded in the last saved state,
+    so rows from an interrupted run are never duplicated.
+    """
+    if state["fact_columns"] is None or not os.path.exists(path):
+        state["fact_columns"] = list(fact.columns)
+        state["fact_bytes"] = 0
+    elif list(fact.columns) != state["fact_columns"]:
+        raise ValueError(
+            f"Fact columns changed since the last build; rebuild {path} with full=True."
+        )
+
+    try:
+        if state["fact_bytes"] == 0:
+            fact.to_csv(path, index=False)
+        else:
+            with open(path, "r+b") as f:
+                f.truncate(state["fact_bytes"])
+            fact.to_csv(path, mode="a", header=False, index=False)
+    except PermissionError:
+        print(f"❌ ERROR: Could not save '{path}'. Close it in Excel/Power BI and re-run.")
+        raise
+    state["fact_bytes"] = os.path.getsize(path)
+    print(f"✓ Appended {len(fact)} deliveries to {path}")
+
+
+# --- Step 3: Partial Sums ---
+@traced(category="aggregate", rows=None)
+def accumulate(state, fact, mi_bowling):
+    """Merges the new batch's partial sums into the running state."""
+    sources = {"batting": fact, "bowling": mi_bowling}
+    for name, (source, key, aggs) in SUM_SPECS.items():
+        frame = sources[source]
+        if key not in frame.columns:
+            continue
+        batch = frame.groupby(key, observed=True).agg(**aggs).reset_index()
+        batch[key] = batch[key].astype(str)
+        old = state["sums"].get(name)
+        if old is None or old.empty:
+            merged = batch
+        else:
+            old = old.copy()
+            old[key] = old[key].astype(str)
+            value_cols = list(aggs)
+            merged = (
+                pd.concat([old[[key] + value_cols], batch], ignore_index=True)
+                .groupby(key)[value_cols].sum()
+                .reset_index()
+            )
+            if name in SUM_KEYS:
+                merged = merged.merge(old[[key, SUM_KEYS[name]]], on=key, how="left")
+        if name in SUM_KEYS and SUM_KEYS[name] not in merged.columns:
+            merged[SUM_KEYS[name]] = np.nan
+        state["sums"][name] = merged
+    return state
+
+
+def _assign_keys(table, key_col, eligible):
+    """Gives eligible rows without a key the next ids, in current row order."""
+    missing = eligible & table[key_col].isna()
+    start = int(table[key_col].max()) + 1 if table[key_col].notna().any() else 1
+    table.loc[missing, key_col] = np.arange(start, start + missing.sum())
+    table[key_col] = table[key_col].astype("Int64")
+    return table
+
+
+# --- Step 4: Dimensions ---
+@traced(category="aggregate")
+def batter_dimension(state):
+    sums = state["sums"]["batter"].sort_values("batter").reset_index(drop=True)
+    sums = _assign_keys(sums, "batter_id", sums["balls"] > 0)
+    state["sums"]["batter"] = sums
+
+    batter_dim = sums[sums["balls"] > 0].copy()
+    batter_dim["strike_rate"] = batter_dim["runs"] * 100 / batter_dim["balls"]
+    batter_dim["boundary_pct"] = batter_dim["boundaries"] * 100 / batter_dim["balls"]
+    batter_cols = ["batter_id", "batter", "runs", "balls", "strike_rate", "boundary_pct", "innings", "boundaries", "dots"]
+    return batter_dim[batter_cols].reset_index(drop=True)
+
+
+@traced(category="aggregate")
+def bowler_dimension(state):
+    sums = state["sums"]["bowler"].sort_values("bowler").reset_index(drop=True)
+    sums = _assign_keys(sums, "bowler_id", sums["balls_bowled"] >= 120)
+    state["sums"]["bowler"] = sums
+
+    bowler_dim = sums[sums["balls_bowled"] >= 120].copy()
+    bowler_dim["overs"] = bowler_dim["balls_bowled"] / 6
+    bowler_dim["economy"] = bowler_dim["runs_conceded"] / bowler_dim["overs"]
+    bowler_dim["strike_rate"] = bowler_dim["balls_bowled"] / bowler_dim["wickets"].replace(0, np.nan)
+    bowler_cols = ["bowler_id", "bowler", "wickets", "economy", "strike_rate", "overs", "runs_conceded", "matches"]
+    return bowler_dim[bowler_cols].reset_index(drop=True)
+
+
+@traced(category="aggregate")
+def match_dimension(state, mi_all):
+    """Appends one row per new match; existing match_id_key values never change."""
+    group_cols = [c for c in MATCH_GROUP_COLS if c in mi_all.columns]
+    first_cols = [c for c in MATCH_FIRST_COLS if c in mi_all.columns]
+    new = (
+        mi_all.groupby(group_cols, observed=True)
+        .agg(**{c: (c, "first") for c in first_cols})
+        .reset_index()
+        .sort_values("match_id", kind="stable")
+        .reset_index(drop=True)
+    )
+    old = state["dims"].get("matches")
+    start = int(old["match_id_key"].max()) + 1 if old is not None and len(old) else 1
+    new.insert(0, "match_id_key", np.arange(start, start + len(new)))
+    match_dim = new if old is None else pd.concat([old, new], ignore_index=True)
+    state["dims"]["matches"] = match_dim
+    return match_dim
+
+
+@traced(category="aggregate")
+def season_dimension(state, mi_all):
+    seasons = mi_all["season"].astype(str).drop_duplicates().sort_values()
+    old = state["dims"].get("seasons", pd.DataFrame({"season_id": [], "season": []}))
+    new = seasons[~seasons.isin(old["season"])]
+    start = int(old["season_id"].max()) + 1 if len(old) else 1
+    added = pd.DataFrame({"season_id": np.arange(start, start + len(new)), "season": new.to_numpy()})
+    season_dim = pd.concat([old, added], ignore_index=True)
+    season_dim["season_id"] = season_dim["season_id"].astype(int)
+    state["dims"]["seasons"] = season_dim
+    return season_dim
+
+
+@traced(category="aggregate")
+def venue_dimension(state, mi_all):
+    venue_cols = [c for c in ["venue", "city"] if c in mi_all.columns]
+    # Keys in order of first appearance by match_id, whatever the input row order (CSV, cache or stream)
+    ordered = mi_all.sort_values("match_id", kind="stable")[venue_cols]
+    pairs = ordered.astype(str).where(ordered.notna()).drop_duplicates()
+    old = state["dims"].get("venues")
+    if old is not None and len(old):
+        known = old[venue_cols].astype(str).where(old[venue_cols].notna())
+        pairs = pairs.merge(known, on=venue_cols, how="left", indicator=True)
+        pairs = pairs[pairs["_merge"] == "left_only"].drop(columns="_merge")
+        start = int(old["venue_id"].max()) + 1
+    else:
+        start = 1
+    pairs.insert(0, "venue_id", np.arange(start, start + len(pairs)))
+    venue_dim = pairs if old is None else pd.concat([old, pairs], ignore_index=True)
+    state["dims"]["venues"] = venue_dim.reset_index(drop=True)
+    return state["dims"]["venues"]
+
+
+# --- Step 5: Summaries ---
+@traced(category="aggregate")
+def season_summary(state):
+    season_batting = state["sums"]["season"].sort_values("season").reset_index(drop=True)
+    season_batting["run_rate"] = season_batting["runs_scored"] * 6 / season_batting["balls_faced"]
+    return season_batting
+
+
+@traced(category="aggregate")
+def venue_summary(state):
+    venue_stats = state["sums"]["venue"].sort_values("venue").reset_index(drop=True)
+    venue_stats["run_rate"] = venue_stats["runs"] * 6 / venue_stats["balls"]
+    return venue_stats[venue_stats["matches"] >= 3]
+
+
+@traced(category="aggregate")
+def phase_summary(state):
+    order = PHASE_SCHEMES["prep"]["labels"]
+    phase_stats = state["sums"]["phase"].copy()
+    phase_stats["phase"] = pd.Categorical(phase_stats["phase"], categories=order, ordered=True)
+    phase_stats = phase_stats.sort_values("phase").reset_index(drop=True)
+    phase_stats["run_rate"] = phase_stats["runs"] * 6 / phase_stats["balls"]
+    return phase_stats
+
+
+def mark_processed(state):
+    state["processed_matches"].update(int(m) for m in state["new_match_ids"])
+    state["new_match_ids"] = []
+
+
+@traced(category="stage", rows=None)
+def update_star_schema(df, team="Mumbai Indians", out_dir=".", state_dir=STATE_DIR, full=False, match_index=None):
+    """
+    Runs every step for the matches in `df` that were not processed yet and
+    writes the fact, dimension and summary CSVs. Returns the tables by name.
+    Pass the match index together with the full deliveries frame to slice the
+    new matches by row offsets.
+    """
+    state = load_state(state_dir, full=full)
+    clean_seasons(df)
+    mi_batting, mi_bowling, mi_all = select_new_deliveries(df, team, state, match_index)
+    print(f"{len(state['new_match_ids'])} new matches ({len(mi_all)} deliveries) for {team}.")
+
+    out = lambda name: os.path.join(out_dir, name)
+    fact = fact_rows(mi_batting)
+    append_fact(fact, state, out(FACT_FILE))
+    accumulate(state, fact, mi_bowling)
+    match_dimension(state, mi_all)
+    season_dimension(state, mi_all)
+    venue_dimension(state, mi_all)
+
+    tables = {
+        "MI_Dim_Batters.csv": batter_dimension(state),
+        "MI_Dim_Bowlers.csv": bowler_dimension(state),
+        "MI_Dim_Matches.csv": state["dims"]["matches"],
+        "MI_Dim_Seasons.csv": state["dims"]["seasons"],
+        "MI_Dim_Venues.csv": state["dims"]["venues"],
+        "MI_Summary_Season_Batting.csv": season_summary(state),
+        "MI_Summary_Venue_Stats.csv": venue_summary(state),
+        "MI_Summary_Phase_Stats.csv": phase_summary(state),
+    }
+    for name, table in tables.items():
+        save_csv_safe(table, out(name))
+
+    mark_processed(state)
+    save_state(state, state_dir)
+    return tables
+
+
+# --- Streaming Mode ---
+STREAM_COLS = ["match_id", "batting_team", "bowling_team"]
+MEMORY_BUDGET_MB = 512
+
+
+def _rss_mb():
+    """Current resident set size in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        return _peak_rss_mb()
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _chunk_rows(csv_path, usecols, memory_mb):
+    """Rows per chunk so one parsed chunk uses about a quarter of the free budget."""
+    sample = pd.read_csv(csv_path, usecols=usecols, nrows=2000, low_memory=False)
+    bytes_per_row = max(sample.memory_usage(deep=True).sum() / max(len(sample), 1), 1)
+    headroom = memory_mb - _rss_mb()
+    if headroom <= 0:
+        raise ValueError(f"Memory budget of {memory_mb} MB is below the current RSS ({_rss_mb():.0f} MB).")
+    return max(1000, int(headroom * 2**20 * 0.25 / bytes_per_row))
+
+
+def _process_batch(batch, team, state, fact_path):
+    """Runs the fact/partial-sum/dimension steps for one batch of complete matches."""
+    seen = batch["match_id"].isin(state["processed_matches"])
+    if seen.any() and state.get("streamed", set()) & set(batch.loc[seen, "match_id"]):
+        raise ValueError("Input is not grouped by match_id; use the cached (sorted) build instead.")
+    batch = batch[~seen]
+    if batch.empty:
+        return 0
+    apply_schema(batch)
+    clean_seasons(batch)
+    mi_batting, mi_bowling, mi_all = select_new_deliveries(batch, team, state)
+    fact = fact_rows(mi_batting)
+    append_fact(fact, state, fact_path)
+    accumulate(state, fact, mi_bowling)
+    match_dimension(state, mi_all)
+    season_dimension(state, mi_all)
+    venue_dimension(state, mi_all)
+    state.setdefault("streamed", set()).update(int(m) for m in state["new_match_ids"])
+    mark_processed(state)
+    return len(mi_all)
+
+
+@traced(category="stage", rows=None)
+def stream_star_schema(
+    csv_path="IPL.csv", team="Mumbai Indians", out_dir=".", state_dir=STATE_DIR, full=False,
+    memory_mb=MEMORY_BUDGET_MB, chunk_rows=None,
+):
+    """
+    Bounded-memory build: reads the CSV in chunks and feeds completed matches
+    of `team` through the incremental steps. Matches must be contiguous in the
+    file (a match cut by a chunk boundary is carried into the next batch).
+    Returns (tables, stats) with rows/s throughput and peak RSS.
+    """
+    start = time.perf_counter()
+    header = pd.read_csv(csv_path, nrows=0).columns
+    usecols = [c for c in dict.fromkeys(STREAM_COLS + FACT_COLS) if c in header]
+    chunk_rows = chunk_rows or _chunk_rows(csv_path, usecols, memory_mb)
+    print(f"Streaming {csv_path} in chunks of {chunk_rows} rows (budget {memory_mb} MB)...")
+
+    state = load_state(state_dir, full=full)
+    out = lambda name: os.path.join(out_dir, name)
+    rows = kept = chunks = 0
+    carry = None
+    for chunk in pd.read_csv(csv_path, usecols=usecols, chunksize=chunk_rows, low_memory=False):
+        rows += len(chunk)
+        chunks += 1
+        last_match = chunk["match_id"].iloc[-1]
+        chunk = chunk[(chunk["batting_team"] == team) | (chunk["bowling_team"] == team)]
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        # The last match may continue in the next chunk: hold it back
+        tail = (chunk["match_id"] == last_match).to_numpy()
+        carry = chunk[tail]
+        kept += _process_batch(chunk[~tail], team, state, out(FACT_FILE))
+    if carry is not None:
+        kept += _process_batch(carry, team, state, out(FACT_FILE))
+
+    if "batter" not in state["sums"]:
+        print(f"⚠️ No deliveries for {team} in {csv_path}.")
+        return {}, {}
+    tables = {
+        "MI_Dim_Batters.csv": batter_dimension(state),
+        "MI_Dim_Bowlers.csv": bowler_dimension(state),
+        "MI_Dim_Matches.csv": state["dims"]["matches"],
+        "MI_Dim_Seasons.csv": state["dims"]["seasons"],
+        "MI_Dim_Venues.csv": state["dims"]["venues"],
+        "MI_Summary_Season_Batting.csv": season_summary(state),
+        "MI_Summary_Venue_Stats.csv": venue_summary(state),
+        "MI_Summary_Phase_Stats.csv": phase_summary(state),
+    }
+    for name, table in tables.items():
+        save_csv_safe(table, out(name))
+    state.pop("streamed", None)
+    save_state(state, state_dir)
+
+    seconds = time.perf_counter() - start
+    stats = {
+        "rows": rows, "team_rows": kept, "chunks": chunks, "chunk_rows": chunk_rows,
+        "seconds": seconds, "rows_per_s": rows / seconds if seconds else float("inf"),
+        "peak_rss_mb": _peak_rss_mb(), "budget_mb": memory_mb,
+    }
+    print(
+        f"✓ Streamed {rows} rows ({kept} for {team}) in {seconds:.2f}s: "
+        f"{stats['rows_per_s']:,.0f} rows/s, peak RSS {stats['peak_rss_mb']:.0f} MB / {memory_mb} MB"
+    )
+    if stats["peak_rss_mb"] > memory_mb:
+        print("⚠️ Peak RSS exceeded the budget; lower --chunk-rows or raise --memory-mb.")
+    return tables, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the MI star schema (incremental).")
+    parser.add_argument("--csv", default="IPL.csv")
+    parser.add_argument("--team", default="Mumbai Indians")
+    parser.add_argument("--out-dir", default=".")
+    parser.add_argument("--state-dir", default=STATE_DIR)
+    parser.add_argument("--full", action="store_true", help="rebuild every table from scratch")
+    parser.add_argument("--stream", action="store_true", help="chunked, bounded-memory build")
+    parser.add_argument("--memory-mb", type=int, default=MEMORY_BUDGET_MB)
+    parser.add_argument("--chunk-rows", type=int, default=None, help="override the budget-derived chunk size")
+    parser.add_argument("--warehouse", nargs="?", const="MI_Warehouse.sqlite", default=None,
+                        help="also load the schema into one SQLite file (default name: MI_Warehouse.sqlite)")
+    parser.add_argument("--slim", action="store_true",
+                        help="also write the slim, integer-keyed fact export and report its size/load time")
+    parser.add_argument("--trace", nargs="?", const="ipl_trace", default=None,
+                        help="write a stage trace to <prefix>.json / <prefix>.trace.json (see ipl_trace)")
+    args = parser.parse_args(argv)
+    if args.trace:
+        enable_trace(args.trace)
+
+    if args.stream:
+        tables, _ = stream_star_schema(
+            args.csv, args.team, args.out_dir, args.state_dir, args.full, args.memory_mb, args.chunk_rows)
+    else:
+        from ipl_matches import load_match_index
+        from ipl_store import load_deliveries
+
+        df = load_deliveries(csv_path=args.csv)
+        tables = update_star_schema(
+            df, args.team, args.out_dir, args.state_dir, args.full, load_match_index(csv_path=args.csv))
+
+    if args.warehouse:
+        from mi_warehouse import export_warehouse
+
+        export_warehouse(tables, os.path.join(args.out_dir, FACT_FILE), os.path.join(args.out_dir, args.warehouse))
+    if args.slim:
+        from mi_slim_fact import export_slim
+
+        export_slim(tables, os.path.join(args.out_dir, FACT_FILE), args.out_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+Single-file SQLite warehouse for the MI star schema.
+
+data_preparation.ipynb exports ten CSVs that every analysis notebook parses
+again (and patches, e.g. re-merging toss_decision into the match dimension).
+export_warehouse() bulk-loads the same fact, dimension and summary tables
+into one SQLite file with declared column types, primary keys, foreign keys
+from the fact table to its dimensions, and indexes on match_id, batter,
+bowler, season and venue. The fact table holds MI's batting deliveries, so
+its bowlers are always opposition players and have no key in dim_bowlers
+(MI bowlers only); filter them on the indexed `bowler` name instead.
+Notebooks can then push filters and aggregations down as SQL and only pull
+the result into pandas.
+
+The file is built next to the target and swapped in atomically, so readers
+never see a half-written warehouse. Only the standard library's sqlite3 is
+needed.
+
+Usage:
+    from mi_warehouse import query
+
+    top = query(
+        "SELECT batter, SUM(runs_batter) AS runs FROM fact_deliveries "
+        "WHERE season_id = ? GROUP BY batter ORDER BY runs DESC LIMIT 10", (5,)
+    )
+
+    python mi_warehouse.py [--out-dir .] [--db MI_Warehouse.sqlite]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+from ipl_store import INT16_COLS, INT8_COLS
+from ipl_trace import traced
+from mi_star_schema import FACT_FILE
+
+WAREHOUSE_FILE = "MI_Warehouse.sqlite"
+FACT_CHUNK_ROWS = 100_000
+
+# CSV export -> table, primary key, {column: SQL type} for the declared columns
+DIMENSIONS = {
+    "MI_Dim_Batters.csv": ("dim_batters", "batter_id", {"batter_id": "INTEGER", "batter": "TEXT NOT NULL UNIQUE"}),
+    "MI_Dim_Bowlers.csv": ("dim_bowlers", "bowler_id", {"bowler_id": "INTEGER", "bowler": "TEXT NOT NULL UNIQUE"}),
+    "MI_Dim_Matches.csv": ("dim_matches", "match_id_key", {"match_id_key": "INTEGER", "match_id": "INTEGER NOT NULL UNIQUE"}),
+    "MI_Dim_Seasons.csv": ("dim_seasons", "season_id", {"season_id": "INTEGER", "season": "TEXT NOT NULL UNIQUE"}),
+    "MI_Dim_Venues.csv": ("dim_venues", "venue_id", {"venue_id": "INTEGER"}),
+}
+SUMMARIES = {
+    "MI_Summary_Season_Batting.csv": ("summary_season_batting", "season"),
+    "MI_Summary_Venue_Stats.csv": ("summary_venue_stats", "venue"),
+    "MI_Summary_Phase_Stats.csv": ("summary_phase_stats", "phase"),
+}
+# Fact foreign keys: column -> (dimension table, referenced column)
+FACT_KEYS = {
+    "match_id": ("dim_matches", "match_id"),
+    "batter_id": ("dim_batters", "batter_id"),
+    "season_id": ("dim_seasons", "season_id"),
+    "venue_id": ("dim_venues", "venue_id"),
+}
+FACT_INDEXES = ["match_id", "batter", "bowler", "season", "venue", "batter_id", "season_id", "venue_id"]
+# Match attributes the CSV dimension lacks (notebooks used to re-merge them from the fact table)
+MATCH_EXTRA_COLS = ["toss_decision", "win_outcome"]
+
+
+def _sql_type(name, values):
+    dtype = values.dtype
+    if values.isna().all():
+        return "TEXT"  # e.g. result_type / method, empty in most seasons
+    if name in INT8_COLS or name in INT16_COLS or pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+
+def _create_table(conn, table, frame, primary_key=None, declared=None, foreign_keys=None):
+    declared = declared or {}
+    cols = []
+    for name, values in frame.items():
+        sql_type = declared.get(name) or _sql_type(name, values)
+        cols.append(f'"{name}" {sql_type}{" PRIMARY KEY" if name == primary_key else ""}')
+    for name, (ref_table, ref_col) in (foreign_keys or {}).items():
+        cols.append(f'FOREIGN KEY ("{name}") REFERENCES {ref_table} ("{ref_col}")')
+    conn.execute(f"CREATE TABLE {table} (\n    " + ",\n    ".join(cols) + "\n)")
+
+
+def _rows(frame):
+    """Plain Python rows for executemany (NaN -> NULL, NumPy scalars -> int/float)."""
+    values = frame.astype(object).where(frame.notna(), None)
+    return [tuple(v.item() if isinstance(v, np.generic) else v for v in row) for row in values.itertuples(index=False)]
+
+
+def _insert(conn, table, frame):
+    placeholders = ", ".join("?" for _ in frame.columns)
+    names = ", ".join(f'"{c}"' for c in frame.columns)
+    conn.executemany(f"INSERT INTO {table} ({names}) VALUES ({placeholders})", _rows(frame))
+
+
+def fact_keys(chunk, dims):
+    """Adds the surrogate foreign keys to a chunk of fact rows."""
+    batters = dims["dim_batters"].set_index("batter")["batter_id"]
+    seasons = dims["dim_seasons"].assign(season=lambda d: d["season"].astype(str)).set_index("season")["season_id"]
+    venue_cols = [c for c in ["venue", "city"] if c in dims["dim_venues"].columns and c in chunk.columns]
+    venues = dims["dim_venues"].astype({c: str for c in venue_cols}).set_index(venue_cols)["venue_id"]
+
+    chunk = chunk.copy()
+    chunk["batter_id"] = chunk["batter"].map(batters).astype("Int64")
+    chunk["season_id"] = chunk["season"].astype(str).map(seasons).astype("Int64")
+    keys = pd.MultiIndex.from_frame(chunk[venue_cols].astype(str)) if len(venue_cols) > 1 else chunk[venue_cols[0]].astype(str)
+    chunk["venue_id"] = pd.Series(venues.reindex(keys).to_numpy(), index=chunk.index).astype("Int64")
+    return chunk
+
+
+@traced(category="export", rows=None)
+def export_warehouse(tables, fact_path=FACT_FILE, path=WAREHOUSE_FILE, chunk_rows=FACT_CHUNK_ROWS):
+    """
+    Loads the star schema into one SQLite file and returns its path.
+
+    tables: {CSV name: DataFrame} as returned by update_star_schema(); the
+    fact table is streamed from `fact_path` in chunks.
+    """
+    start = time.perf_counter()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+
+        dims = {}
+        first_fact = pd.read_csv(fact_path, nrows=1000, low_memory=False)
+        for name, (table, key, declared) in DIMENSIONS.items():
+            frame = tables[name].copy()
+            if table == "dim_matches":
+                extra = [c for c in MATCH_EXTRA_COLS if c not in frame.columns and c in first_fact.columns]
+                if extra:
+                    firsts = pd.read_csv(fact_path, usecols=["match_id"] + extra, low_memory=False)
+                    frame = frame.merge(firsts.groupby("match_id").first().reset_index(), on="match_id", how="left")
+            if table == "dim_seasons":
+                frame["season"] = frame["season"].astype(str)
+            dims[table] = frame
+            _create_table(conn, table, frame, key, declared)
+            _insert(conn, table, frame)
+
+        for name, (table, key) in SUMMARIES.items():
+            frame = tables[name].copy()
+            frame[key] = frame[key].astype(str)
+            _create_table(conn, table, frame, key, {key: "TEXT"})
+            _insert(conn, table, frame)
+
+        rows = 0
+        for i, chunk in enumerate(pd.read_csv(fact_path, chunksize=chunk_rows, low_memory=False)):
+            chunk = fact_keys(chunk, dims)
+            if i == 0:
+                chunk.insert(0, "delivery_id", np.arange(1, len(chunk) + 1))
+                # Keys declared up front: a key that is all-NA in the first chunk would otherwise be TEXT
+                declared = {"season": "TEXT", **{col: "INTEGER" for col in FACT_KEYS}}
+                _create_table(conn, "fact_deliveries", chunk, "delivery_id", declared, FACT_KEYS)
+            else:
+                chunk.insert(0, "delivery_id", np.arange(rows + 1, rows + len(chunk) + 1))
+            _insert(conn, "fact_deliveries", chunk)
+            rows += len(chunk)
+
+        # Indexes after the bulk load (one sort each instead of per-row maintenance)
+        for col in FACT_INDEXES:
+            conn.execute(f'CREATE INDEX idx_fact_{col} ON fact_deliveries ("{col}")')
+        conn.execute('CREATE INDEX idx_dim_matches_season ON dim_matches ("season")')
+        conn.execute('CREATE INDEX idx_dim_matches_venue ON dim_matches ("venue")')
+        conn.commit()
+
+        violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+        if violations:
+            raise ValueError(f"{len(violations)} fact rows reference missing dimension keys (first: {violations[0]})")
+        conn.execute("ANALYZE")
+        conn.commit()
+    except BaseException:
+        conn.close()
+        # Never leave a half-built warehouse behind
+        os.remove(tmp_path)
+        raise
+    conn.close()
+    os.replace(tmp_path, path)
+    print(f"✓ Saved: {path} ({rows} deliveries, {len(dims) + len(SUMMARIES) + 1} tables, "
+          f"{os.path.getsize(path) / 1e6:.1f} MB, {time.perf_counter() - start:.2f}s)")
+    return path
+
+
+def connect(path=WAREHOUSE_FILE):
+    """Read-only connection with foreign keys enforced."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found; run data_preparation.ipynb (or mi_warehouse.py) first.")
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+
+@traced(category="load")
+def query(sql, params=(), path=WAREHOUSE_FILE):
+    """Runs a SQL query against the warehouse and returns the result as a DataFrame."""
+    # closing(): sqlite3's own context manager only commits, it never closes the connection
+    with closing(connect(path)) as conn:
+        return pd.read_sql_query(sql, conn, params=params)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load the MI star-schema CSVs into one SQLite warehouse.")
+    parser.add_argument("--out-dir", default=".", help="directory holding the exported CSVs")
+    parser.add_argument("--db", default=WAREHOUSE_FILE)
+    args = parser.parse_args(argv)
+
+    names = list(DIMENSIONS) + list(SUMMARIES)
+    missing = [n for n in names + [FACT_FILE] if not os.path.exists(os.path.join(args.out_dir, n))]
+    if missing:
+        print(f"❌ Error: {', '.join(missing)} not found. Run data_preparation.ipynb first.")
+        return 1
+    tables = {n: pd.read_csv(os.path.join(args.out_dir, n), low_memory=False) for n in names}
+    export_warehouse(tables, os.path.join(args.out_dir, FACT_FILE), os.path.join(args.out_dir, args.db))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Headless pipeline runner for the analysis notebooks.
+
+data_preparation.ipynb runs first; once it has written the prepared tables
+they are exported to the memory-mapped Arrow store (ipl_prepared), and the
+analysis notebooks then run concurrently, one worker process each, reading
+the shared store instead of re-parsing the CSVs. Every code cell is timed;
+the run prints per-notebook wall time and the slowest cells, and can write
+the full timing log as JSON.
+
+Cells are executed in a plain namespace with the Agg backend (figures are
+drawn but not displayed), so notebooks must not rely on IPython magics.
+
+Usage:
+    python run_notebooks.py [--workers 4] [--only mi_elite_analytics,mi_champion_analysis]
+                            [--skip-prep] [--log notebook_timings.json] [--top 10] [--trace traces/nb]
+"""
+import argparse
+import json
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import matplotlib
+matplotlib.use("Agg")  # Headless: plt.show() becomes a no-op
+
+import pandas as pd
+
+from ipl_prepared import PREPARED_TABLES, refresh_prepared
+from ipl_trace import enable as enable_trace, span
+
+PREP = "data_preparation.ipynb"
+# notebook -> notebooks that must finish first
+PIPELINE = {
+    PREP: [],
+    "mi_advanced_analytics.ipynb": [PREP],
+    "mi_deep_dive_analytics.ipynb": [PREP],
+    "mi_elite_analytics.ipynb": [PREP],
+    "mi_champion_analysis.ipynb": [PREP],
+}
+
+
+def run_notebook(path):
+    """Worker: executes a notebook's code cells in order and times each one."""
+    import matplotlib.pyplot as plt
+
+    with open(path, encoding="utf-8") as f:
+        cells = json.load(f)["cells"]
+    namespace = {"__name__": "__main__"}
+    result = {"notebook": path, "cells": [], "error": None}
+    start = time.perf_counter()
+    for i, cell in enumerate(cells):
+        if cell["cell_type"] != "code":
+            continue
+        source = "".join(cell["source"])
+        t = time.perf_counter()
+        try:
+            # Library loads / groupbys / renders inside the cell nest under this span
+            with span(f"{path}[{i}]", "cell"):
+                exec(compile(source, f"{path}[{i}]", "exec"), namespace)
+        except Exception:
+            result["error"] = f"cell {i}:\n{traceback.format_exc()}"
+        finally:
+            plt.close("all")
+            first_line = next((line for line in source.splitlines() if line.strip()), "")
+            result["cells"].append({"cell": i, "seconds": time.perf_counter() - t, "source": first_line[:60]})
+        if result["error"]:
+            break
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def run_pipeline(notebooks, workers=None):
+    """Runs `notebooks` respecting PIPELINE dependencies; returns results by notebook."""
+    pending = {nb: [d for d in PIPELINE.get(nb, []) if d in notebooks] for nb in notebooks}
+    results, failed = {}, set()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running = {}
+        while pending or running:
+            # Skip notebooks whose prerequisites failed
+            for nb in [nb for nb, deps in pending.items() if failed & set(deps)]:
+                print(f"⏭ Skipping {nb} ({', '.join(failed & set(pending[nb]))} failed)")
+                failed.add(nb)
+                del pending[nb]
+            for nb in [nb for nb, deps in pending.items() if all(d in results for d in deps)]:
+                print(f"▶ {nb}")
+                running[pool.submit(run_notebook, nb)] = nb
+                del pending[nb]
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                nb = running.pop(future)
+                result = future.result()
+                results[nb] = result
+                if result["error"]:
+                    failed.add(nb)
+                    print(f"❌ {nb} failed at {result['error']}")
+                    continue
+                print(f"✓ {nb} ({result['seconds']:.2f}s)")
+                if nb == PREP:
+                    # Map the freshly written tables once, before the readers start
+                    rebuilt = refresh_prepared(PREPARED_TABLES)
+                    if rebuilt:
+                        print(f"✓ Exported {', '.join(rebuilt)} to the memory-mapped store")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", default=None, help="comma-separated notebooks (with or without .ipynb)")
+    parser.add_argument("--skip-prep", action="store_true", help="reuse the existing prepared tables")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--log", default=None, help="write per-notebook / per-cell timings as JSON")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest cells to print")
+    parser.add_argument("--trace", nargs="?", const="ipl_trace", default=None,
+                        help="write a stage trace to <prefix>.json / <prefix>.trace.json (see ipl_trace)")
+    args = parser.parse_args(argv)
+    if args.trace:
+        enable_trace(args.trace)
+
+    notebooks = list(PIPELINE)
+    if args.only:
+        wanted = {n if n.endswith(".ipynb") else f"{n}.ipynb" for n in args.only.split(",")}
+        unknown = wanted - set(PIPELINE)
+        if unknown:
+            parser.error(f"unknown notebook(s): {', '.join(sorted(unknown))}")
+        notebooks = [nb for nb in notebooks if nb in wanted]
+    if args.skip_prep:
+        notebooks = [nb for nb in notebooks if nb != PREP]
+        refresh_prepared(PREPARED_TABLES)
+
+    start = time.perf_counter()
+    results = run_pipeline(notebooks, args.workers)
+    wall = time.perf_counter() - start
+
+    print("\n⏱ Notebook wall time")
+    for nb, result in results.items():
+        status = "failed" if result["error"] else "ok"
+        print(f"  {nb:<32} {result['seconds']:8.2f}s  {status}")
+    print(f"  {'pipeline (wall)':<32} {wall:8.2f}s")
+
+    cells = pd.DataFrame([{"notebook": nb, **c} for nb, r in results.items() for c in r["cells"]])
+    if not cells.empty:
+        print(f"\n🐢 Slowest {args.top} cells")
+        slowest = cells.sort_values("seconds", ascending=False).head(args.top)
+        with pd.option_context("display.float_format", "{:.3f}".format, "display.width", 160):
+            print(slowest.to_string(index=False))
+
+    if args.log:
+        with open(args.log, "w", encoding="utf-8") as f:
+            json.dump({"wall_seconds": wall, "notebooks": list(results.values())}, f, indent=2)
+        print(f"\n✓ Saved timings to {args.log}")
+    return 1 if any(r["error"] for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())